@@ -23,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from avanamy.db.database import SessionLocal
 from avanamy.services.polling_service import poll_all_active_apis
+from avanamy.services.documentation_service import drain_enhancement_tasks
 
 # Configure logging
 logging.basicConfig(
@@ -64,6 +65,9 @@ async def main():
         sys.exit(1)
     
     finally:
+        # AI doc enhancements for new versions run as background tasks;
+        # asyncio.run would cancel them when main() returns.
+        await drain_enhancement_tasks()
         db.close()
     
     logger.info("Polling complete")
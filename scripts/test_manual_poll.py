@@ -37,6 +37,7 @@ from avanamy.models.api_product import ApiProduct
 from avanamy.models.provider import Provider
 from avanamy.models.code_repository import CodeRepository
 from avanamy.services.polling_service import PollingService
+from avanamy.services.documentation_service import drain_enhancement_tasks
 
 # Test configuration
 SPEC_FILE = Path(__file__).parent / "openmeteo-modified-v2.yml"
@@ -239,6 +240,8 @@ async def test_manual_poll():
             server.kill()
             server.wait()
         
+        # Let AI doc enhancements finish before asyncio.run cancels them.
+        await drain_enhancement_tasks()
         db.close()
 
 
@@ -25,6 +25,7 @@ from avanamy.services.api_spec_service import store_api_spec_file, update_api_sp
 from avanamy.services.documentation_service import regenerate_all_docs_for_spec
 from avanamy.repositories.version_history_repository import VersionHistoryRepository
 from avanamy.db.database import get_db
+from avanamy.utils.json_utils import load_schema
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -51,7 +52,7 @@ def serialize_spec(spec):
 
     if spec.parsed_schema:
         try:
-            data["parsed_schema"] = json.loads(spec.parsed_schema)
+            data["parsed_schema"] = load_schema(spec.parsed_schema)
         except Exception:
             data["parsed_schema"] = None
 
@@ -370,7 +371,7 @@ async def list_api_specs_enriched(
             reverse=True
         )
         
-        logger.info(f"Returning {len(enriched_specs)} enriched specs for tenant {tenant_id}")
+        logger.info("Returning %s enriched specs for tenant %s", len(enriched_specs), tenant_id)
         return enriched_specs
 
 # -----------------------------------------------------------------------------
@@ -119,7 +119,7 @@ def create_code_repository(
                 access_token_encrypted=getattr(request, 'access_token_encrypted', None),
             )
             
-            logger.info(f"Created code repository: {code_repository.id} for tenant {tenant_id}")
+            logger.info("Created code repository: %s for tenant %s", code_repository.id, tenant_id)
             
             return CodeRepositoryResponse(
                 id=str(code_repository.id),
@@ -142,7 +142,7 @@ def create_code_repository(
             )
             
         except Exception as e:
-            logger.exception(f"Failed to create code repository for tenant {tenant_id}")
+            logger.exception("Failed to create code repository for tenant %s", tenant_id)
             raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("", response_model=list[CodeRepositoryResponse])
@@ -265,7 +265,7 @@ def update_code_repository(
         
         code_repository = CodeRepoRepository.update(db, code_repository, **updates)
         
-        logger.info(f"Updated code repository: {code_repository_id}")
+        logger.info("Updated code repository: %s", code_repository_id)
         
         return CodeRepositoryResponse(
             id=str(code_repository.id),
@@ -311,7 +311,7 @@ def delete_code_repository(
         
         CodeRepoRepository.delete(db, code_repository)
         
-        logger.info(f"Deleted code repository: {code_repository_id}")
+        logger.info("Deleted code repository: %s", code_repository_id)
 
 
 @router.post("/{code_repository_id}/connect-github", response_model=CodeRepositoryResponse)
@@ -340,7 +340,7 @@ def connect_github(
             access_token_encrypted=request.access_token_encrypted,
         )
         
-        logger.info(f"Stored GitHub token for code repository: {code_repository_id}")
+        logger.info("Stored GitHub token for code repository: %s", code_repository_id)
         
         return CodeRepositoryResponse(
             id=str(code_repository.id),
@@ -412,14 +412,14 @@ async def trigger_scan(
                     access_token=installation_token
                 )
             except Exception as e:
-                logger.exception(f"Background scan failed: {e}")
+                logger.exception("Background scan failed: %s", e)
         
         background_tasks.add_task(scan_task)
         
         # Update status immediately
         CodeRepoRepository.update(db, code_repository, scan_status="pending")
         
-        logger.info(f"Scan triggered for code repository: {code_repository_id}")
+        logger.info("Scan triggered for code repository: %s", code_repository_id)
         
         return {
             "message": "Scan triggered",
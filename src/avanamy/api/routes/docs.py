@@ -3,19 +3,20 @@
 from __future__ import annotations
 
 import logging
+import os
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import PlainTextResponse, HTMLResponse
 from sqlalchemy.orm import Session
 
 from opentelemetry import trace
-from prometheus_client import Counter, REGISTRY
 
 from avanamy.db.database import SessionLocal
+from avanamy.metrics import safe_counter
 from avanamy.repositories.documentation_artifact_repository import (
     DocumentationArtifactRepository,
 )
-from avanamy.services.s3 import download_bytes
+from avanamy.services.s3 import download_bytes, generate_presigned_get_url
 from avanamy.auth.clerk import get_current_tenant_id
 from avanamy.models.api_spec import ApiSpec
 
@@ -24,15 +25,8 @@ tracer = trace.get_tracer(__name__)
 
 router = APIRouter(prefix="/docs", tags=["Documentation"])
 
-
-# ----------------------------------------------------------
-# Safe Prometheus counter helper
-# ----------------------------------------------------------
-def safe_counter(name, documentation, **kwargs):
-    try:
-        return Counter(name, documentation, **kwargs)
-    except ValueError:
-        return REGISTRY._names_to_collectors[name]
+# Lifetime of presigned docs URLs handed to the browser.
+DOCS_URL_TTL_SECONDS = int(os.getenv("DOCS_URL_TTL_SECONDS", "3600"))
 
 
 markdown_requests = safe_counter(
@@ -158,6 +152,39 @@ def get_docs_html(
             content=download_bytes(artifact.s3_path).decode("utf-8")
         )
 
+# Presigned URL for the generated HTML: the browser loads the page straight
+# from S3 instead of the API downloading and re-sending every byte.
+@router.get("/{spec_id}/html/url")
+def get_docs_html_url(
+    spec_id: UUID,
+    tenant_id: str = Depends(get_current_tenant_id),
+    db: Session = Depends(get_db),
+):
+    html_requests.inc()
+    logger.info("Presigning HTML URL for spec_id=%s", spec_id)
+
+    with tracer.start_as_current_span("api.get_docs_html_url") as span:
+        span.set_attribute("tenant.id", tenant_id)
+        span.set_attribute("api_spec.id", str(spec_id))
+
+        repo = DocumentationArtifactRepository()
+        artifact = repo.get_latest_by_spec_id(
+            db, spec_id, tenant_id, artifact_type="api_html"
+        )
+
+        if not artifact:
+            raise HTTPException(
+                status_code=404,
+                detail="HTML documentation not found",
+            )
+
+        return {
+            "url": generate_presigned_get_url(
+                artifact.s3_path, expires_in=DOCS_URL_TTL_SECONDS
+            ),
+            "expires_in": DOCS_URL_TTL_SECONDS,
+        }
+
 @router.get("/{spec_id}/versions/{version_id}")
 async def get_version_documentation(
     spec_id: UUID,
@@ -170,7 +197,7 @@ async def get_version_documentation(
     
     This allows viewing historical docs for any version, not just the latest.
     """
-    logger.info(f"Fetching {format} docs for spec {spec_id}, version {version_id}")
+    logger.info("Fetching %s docs for spec %s, version %s", format, spec_id, version_id)
     
     with tracer.start_as_current_span("docs.get_version_documentation") as span:
         span.set_attribute("spec.id", str(spec_id))
@@ -218,7 +245,7 @@ async def get_version_documentation(
             markdown_requests.inc()
         
          # Return raw HTML/Markdown for browser viewing
-        logger.info(f"Returning {format} documentation, length: {len(content)} bytes")
+        logger.info("Returning %s documentation, length: %s bytes", format, len(content))
         
         if format == "html":
             return HTMLResponse(content=content)
@@ -235,7 +262,7 @@ async def get_available_documentation_formats(
 ):
     """Check which documentation formats are available for a version."""
     
-    logger.info(f"Checking available docs for spec {spec_id}, version {version_id}")
+    logger.info("Checking available docs for spec %s, version %s", spec_id, version_id)
     
     # ADD THIS: Validate tenant ownership
     spec = db.query(ApiSpec).filter(
@@ -70,7 +70,7 @@ def authorize(
             # Generate installation URL
             install_url = app_service.get_installation_url(state)
             
-            logger.info(f"Generated GitHub App installation URL for tenant: {tenant_id}")
+            logger.info("Generated GitHub App installation URL for tenant: %s", tenant_id)
             
             return GitHubAuthResponse(
                 authorization_url=install_url,
@@ -116,8 +116,11 @@ async def callback(
             encrypted_token = encryption_service.encrypt(access_token)
             
             logger.info(
-                f"GitHub App installation successful: "
-                f"tenant={tenant_id}, user={user_info.get('login')}, installation_id={installation_id}"
+                "GitHub App installation successful: "
+                "tenant=%s, user=%s, installation_id=%s",
+                tenant_id,
+                user_info.get('login'),
+                installation_id,
             )
             
             return GitHubTokenResponse(
@@ -175,7 +178,7 @@ async def list_repositories(
                         "private": repo["private"],
                     })
                 
-                logger.info(f"Listed {len(result)} repositories for installation: {installation_id}")
+                logger.info("Listed %s repositories for installation: %s", len(result), installation_id)
                 
                 return {
                     "repositories": result
@@ -15,6 +15,8 @@ from avanamy.models.api_spec import ApiSpec
 from avanamy.models.api_product import ApiProduct
 from avanamy.models.provider import Provider
 from avanamy.models.version_history import VersionHistory
+from avanamy.utils import json_utils
+from avanamy.utils.json_utils import load_schema
 
 router = APIRouter(
     prefix="/api-specs",
@@ -252,8 +254,7 @@ async def get_version_schema(
 
     # For version 1, get the original spec
     if version_number == 1:
-        import json
-        schema = json.loads(spec.parsed_schema) if spec.parsed_schema else {}
+        schema = load_schema(spec.parsed_schema) if spec.parsed_schema else {}
         return {
             "version": 1,
             "schema": schema,
@@ -262,8 +263,7 @@ async def get_version_schema(
     # For other versions, reconstruct schema by applying diffs
     # For now, we'll just return the current spec's parsed_schema
     # In a production system, you'd store each version's full schema
-    import json
-    schema = json.loads(spec.parsed_schema) if spec.parsed_schema else {}
+    schema = load_schema(spec.parsed_schema) if spec.parsed_schema else {}
     
     return {
         "version": version_number,
@@ -368,7 +368,7 @@ async def get_original_spec_for_version(
         
         # Try to parse as JSON/YAML
         try:
-            spec_data = json.loads(spec_text)
+            spec_data = json_utils.loads(spec_text)
         except json.JSONDecodeError:
             # If not JSON, try YAML
             spec_data = yaml.safe_load(spec_text)
@@ -456,7 +456,7 @@ async def compare_two_versions(
             spec_text = spec_bytes.decode('utf-8')
             
             try:
-                return json.loads(spec_text)
+                return json_utils.loads(spec_text)
             except json.JSONDecodeError:
                 return yaml.safe_load(spec_text)
         except:
@@ -43,11 +43,11 @@ async def get_current_user_id(
                 detail="Invalid token: no user_id found"
             )
         
-        logger.debug(f"Authenticated user: {user_id}")
+        logger.debug("Authenticated user: %s", user_id)
         return user_id
         
     except Exception as e:
-        logger.error(f"Token verification failed: {str(e)}")
+        logger.error("Token verification failed: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
@@ -80,7 +80,7 @@ async def get_current_tenant_id(
                     name=org_name,
                     is_organization=True
                 )
-                logger.debug(f"User {user_id} in org {org_name} (tenant: {tenant.id})")
+                logger.debug("User %s in org %s (tenant: %s)", user_id, org_name, tenant.id)
                 return tenant.id
             
             else:
@@ -94,13 +94,13 @@ async def get_current_tenant_id(
                     name=name,
                     is_organization=False
                 )
-                logger.debug(f"User {user_id} using personal tenant")
+                logger.debug("User %s using personal tenant", user_id)
                 return tenant.id
                 
         except Exception as clerk_error:
             # If Clerk API fails, create a simple personal tenant
-            logger.warning(f"Could not fetch user details from Clerk: {clerk_error}")
-            logger.info(f"Creating personal tenant for user {user_id}")
+            logger.warning("Could not fetch user details from Clerk: %s", clerk_error)
+            logger.info("Creating personal tenant for user %s", user_id)
             
             tenant = get_or_create_tenant(
                 db,
@@ -111,7 +111,7 @@ async def get_current_tenant_id(
             return tenant.id
             
     except Exception as e:
-        logger.error(f"Failed to get tenant for user {user_id}: {e}")
+        logger.error("Failed to get tenant for user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get tenant"
@@ -107,7 +107,7 @@ async def get_user_role(
     # User is not a member - this shouldn't happen normally
     # because tenant_id comes from their JWT, but handle gracefully
     logger.warning(
-        f"User {user_id} accessing tenant {tenant_id} but not a member"
+        "User %s accessing tenant %s but not a member", user_id, tenant_id
     )
     return None
 
@@ -193,7 +193,7 @@ def require_permission(permission: Permission) -> Callable:
             role = member.role if member else None
         
         if not role:
-            logger.warning(f"User {user_id} has no role in tenant {tenant_id}")
+            logger.warning("User %s has no role in tenant %s", user_id, tenant_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have access to this organization"
@@ -201,8 +201,12 @@ def require_permission(permission: Permission) -> Callable:
         
         if not has_permission(role, permission):
             logger.warning(
-                f"Permission denied: user={user_id} role={role} "
-                f"permission={permission.value} tenant={tenant_id}"
+                "Permission denied: user=%s role=%s "
+                "permission=%s tenant=%s",
+                user_id,
+                role,
+                permission.value,
+                tenant_id,
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -254,7 +258,7 @@ def require_role(minimum_role: Role) -> Callable:
             role = member.role if member else None
         
         if not role:
-            logger.warning(f"User {user_id} has no role in tenant {tenant_id}")
+            logger.warning("User %s has no role in tenant %s", user_id, tenant_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have access to this organization"
@@ -262,8 +266,12 @@ def require_role(minimum_role: Role) -> Callable:
         
         if not is_role_at_least(role, minimum_role):
             logger.warning(
-                f"Role check failed: user={user_id} role={role} "
-                f"minimum={minimum_role.value} tenant={tenant_id}"
+                "Role check failed: user=%s role=%s "
+                "minimum=%s tenant=%s",
+                user_id,
+                role,
+                minimum_role.value,
+                tenant_id,
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -312,7 +320,7 @@ def require_any_permission(*permissions: Permission) -> Callable:
             role = member.role if member else None
         
         if not role:
-            logger.warning(f"User {user_id} has no role in tenant {tenant_id}")
+            logger.warning("User %s has no role in tenant %s", user_id, tenant_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have access to this organization"
@@ -321,8 +329,12 @@ def require_any_permission(*permissions: Permission) -> Callable:
         if not any(has_permission(role, p) for p in permissions):
             perm_names = [p.value for p in permissions]
             logger.warning(
-                f"Permission denied: user={user_id} role={role} "
-                f"required_any={perm_names} tenant={tenant_id}"
+                "Permission denied: user=%s role=%s "
+                "required_any=%s tenant=%s",
+                user_id,
+                role,
+                perm_names,
+                tenant_id,
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
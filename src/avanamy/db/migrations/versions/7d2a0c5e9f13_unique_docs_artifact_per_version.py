@@ -0,0 +1,45 @@
+"""unique docs artifact per version
+
+Revision ID: 7d2a0c5e9f13
+Revises: 3c9e1f7a2b64
+Create Date: 2026-10-18 11:24:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a0c5e9f13'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f7a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every regeneration used to insert a fresh row; keep only the newest
+    # api_markdown / api_html row per (spec, type, version).
+    op.execute(sa.text("""
+        DELETE FROM documentation_artifacts a
+        USING documentation_artifacts b
+        WHERE a.api_spec_id = b.api_spec_id
+          AND a.artifact_type = b.artifact_type
+          AND a.version_history_id = b.version_history_id
+          AND a.artifact_type IN ('api_markdown', 'api_html')
+          AND a.id < b.id
+    """))
+    op.create_index(
+        'uq_documentation_artifacts_docs_version',
+        'documentation_artifacts',
+        ['api_spec_id', 'artifact_type', 'version_history_id'],
+        unique=True,
+        postgresql_where=sa.text("artifact_type IN ('api_markdown', 'api_html')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_documentation_artifacts_docs_version', table_name='documentation_artifacts')
@@ -0,0 +1,59 @@
+"""add endpoint_health lookup indexes
+
+Revision ID: 9e4b7c2d1f86
+Revises: b41e8d2c6a57
+Create Date: 2026-10-18 15:42:10.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7c2d1f86'
+down_revision: Union[str, Sequence[str], None] = 'b41e8d2c6a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # endpoint_health gets a row per endpoint per check, so build the indexes
+    # without locking out the health checker. CONCURRENTLY can't run inside
+    # a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_endpoint_health_lookup',
+            'endpoint_health',
+            ['watched_api_id', 'endpoint_path', 'http_method', sa.text('checked_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_endpoint_health_api_checked_at',
+            'endpoint_health',
+            ['watched_api_id', sa.text('checked_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_endpoint_health_api_checked_at',
+            table_name='endpoint_health',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_endpoint_health_lookup',
+            table_name='endpoint_health',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
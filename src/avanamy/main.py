@@ -1,6 +1,7 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File
 from avanamy.api.routes import schemas
 from avanamy.api.routes.api_specs import router as api_specs_router
@@ -21,6 +22,11 @@ from avanamy.api.routes.impact_analysis import router as impact_analysis_router
 from avanamy.api.routes.organizations import router as organizations_router
 from fastapi.middleware.cors import CORSMiddleware
 from avanamy.services.s3 import upload_bytes
+from avanamy.services.github_app_service import close_github_http_client
+from avanamy.services.documentation_service import (
+    ENHANCEMENT_DRAIN_SECONDS,
+    drain_enhancement_tasks,
+)
 from avanamy.logging_config import configure_logging
 from prometheus_fastapi_instrumentator import Instrumentator
 from avanamy.tracing import configure_tracing
@@ -32,7 +38,17 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 configure_logging()
 configure_tracing()
 
-app = FastAPI(debug=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Let in-flight AI doc enhancements finish (bounded) before the loop stops.
+    await drain_enhancement_tasks(ENHANCEMENT_DRAIN_SECONDS)
+    # Drop the pooled GitHub connections on shutdown.
+    await close_github_http_client()
+
+
+app = FastAPI(debug=True, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
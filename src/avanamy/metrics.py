@@ -1,4 +1,17 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, REGISTRY
+
+
+def safe_counter(name: str, documentation: str, **kwargs) -> Counter:
+    """
+    Return the Counter registered as ``name``, creating it on first use.
+    Modules can be imported more than once (pytest, reloads), and
+    prometheus_client raises if the same metric is registered twice.
+    """
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is not None:
+        return existing
+    return Counter(name, documentation, **kwargs)
+
 
 spec_upload_total = Counter(
     "avanamy_spec_upload_total",
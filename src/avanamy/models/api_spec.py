@@ -22,6 +22,8 @@ class ApiSpec(Base, AuditMixin):
     original_file_s3_path = Column(String, nullable=False)
     documentation_html_s3_path = Column(String, nullable=True)
     parsed_schema = Column(Text, nullable=True)
+    # content hash of the inputs the current docs were rendered from
+    last_rendered_schema_hash = Column(String(64), nullable=True)
 
     # Add this relationship
     impact_analyses: Mapped[list[ImpactAnalysisResult]] = relationship(
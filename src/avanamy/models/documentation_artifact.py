@@ -1,11 +1,32 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from avanamy.db.database import Base
 from avanamy.models.base_model import uuid_fk, timestamp_created
 from avanamy.models.mixins import AuditMixin
 
+ARTIFACT_TYPE_API_MARKDOWN = "api_markdown"
+ARTIFACT_TYPE_API_HTML = "api_html"
+
+# Generated docs are upserted per (spec, type, version); other artifact types
+# keep plain inserts.
+_DOCS_ARTIFACT_WHERE = text(
+    f"artifact_type IN ('{ARTIFACT_TYPE_API_MARKDOWN}', '{ARTIFACT_TYPE_API_HTML}')"
+)
+
+
 class DocumentationArtifact(Base, AuditMixin):
     __tablename__ = "documentation_artifacts"
+    __table_args__ = (
+        Index(
+            "uq_documentation_artifacts_docs_version",
+            "api_spec_id",
+            "artifact_type",
+            "version_history_id",
+            unique=True,
+            postgresql_where=_DOCS_ARTIFACT_WHERE,
+            sqlite_where=_DOCS_ARTIFACT_WHERE,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     api_spec_id = uuid_fk("api_specs")
@@ -14,6 +35,8 @@ class DocumentationArtifact(Base, AuditMixin):
     
     artifact_type = Column(String, nullable=False)
     s3_path = Column(String, nullable=False)
+    # BLAKE3-256 (or SHA-256 without blake3) of the rendered inputs
+    content_hash = Column(String(64), nullable=True)
 
     api_spec = relationship("ApiSpec")
     version_history = relationship("VersionHistory", backref="artifacts")
\ No newline at end of file
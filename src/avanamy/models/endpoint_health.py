@@ -4,7 +4,7 @@ EndpointHealth model for tracking endpoint availability and performance.
 Records health check results for each endpoint in a watched API.
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from avanamy.db.database import Base
@@ -34,6 +34,19 @@ class EndpointHealth(Base, AuditMixin):
 
     watched_api = relationship("WatchedAPI", back_populates="endpoint_health_checks")
 
+    __table_args__ = (
+        # Latest check of one endpoint (new-failure detection).
+        Index(
+            "ix_endpoint_health_lookup",
+            watched_api_id,
+            endpoint_path,
+            http_method,
+            checked_at.desc(),
+        ),
+        # Recent checks of a watched API (dashboard).
+        Index("ix_endpoint_health_api_checked_at", watched_api_id, checked_at.desc()),
+    )
+
     def __repr__(self):
         status = "healthy" if self.is_healthy else "unhealthy"
         return f"<EndpointHealth({self.http_method} {self.endpoint_path}: {status})>"
\ No newline at end of file
@@ -1,13 +1,38 @@
 # src/avanamy/repositories/documentation_artifact_repository.py
 
+from functools import lru_cache
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from avanamy.models.documentation_artifact import DocumentationArtifact
+from avanamy.models.documentation_artifact import DocumentationArtifact, _DOCS_ARTIFACT_WHERE
 import logging
 from opentelemetry import trace
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(dialect: str):
+    """
+    The artifact upsert, built once per dialect without bound values. Rows are
+    passed at execute time, so every call reuses one statement (and its
+    compiled form from SQLAlchemy's cache) instead of building a VALUES
+    clause sized to the batch.
+    """
+    stmt = _DIALECT_INSERTS[dialect](DocumentationArtifact)
+    return stmt.on_conflict_do_update(
+        index_elements=["api_spec_id", "artifact_type", "version_history_id"],
+        index_where=_DOCS_ARTIFACT_WHERE,
+        set_={
+            "s3_path": stmt.excluded.s3_path,
+            "content_hash": stmt.excluded.content_hash,
+            "updated_at": func.now(),
+        },
+    )
+
 
 class DocumentationArtifactRepository:
 
@@ -20,6 +45,7 @@ class DocumentationArtifactRepository:
         artifact_type: str,
         s3_path: str,
         version_history_id: int = None,
+        content_hash: str = None,
     ) -> DocumentationArtifact:
 
         artifact = DocumentationArtifact(
@@ -28,6 +54,7 @@ class DocumentationArtifactRepository:
             artifact_type=artifact_type,
             s3_path=s3_path,
             version_history_id=version_history_id,
+            content_hash=content_hash,
         )
 
         with tracer.start_as_current_span("db.create_documentation_artifact"):
@@ -43,6 +70,33 @@ class DocumentationArtifactRepository:
         )
         return artifact
 
+    def bulk_upsert(self, db: Session, rows: list[dict]) -> None:
+        """
+        Insert or update generated-doc artifacts (api_markdown / api_html) in a
+        single INSERT ... ON CONFLICT statement keyed on
+        (api_spec_id, artifact_type, version_history_id).
+
+        Does not commit; the caller commits with the rest of its changes.
+        """
+        if not rows:
+            return
+
+        dialect = db.get_bind().dialect.name
+        if dialect not in _DIALECT_INSERTS:
+            for row in rows:
+                db.add(DocumentationArtifact(**row))
+            return
+
+        with tracer.start_as_current_span("db.upsert_documentation_artifacts") as span:
+            span.set_attribute("rows", len(rows))
+            db.execute(_upsert_statement(dialect), rows)
+
+        logger.info(
+            "Upserted %d documentation artifacts for spec=%s",
+            len(rows),
+            rows[0].get("api_spec_id"),
+        )
+
     @staticmethod
     def get_latest(
         db: Session,
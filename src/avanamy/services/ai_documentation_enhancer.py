@@ -8,6 +8,7 @@ This service takes basic generated docs and enhances them with:
 - Common use cases
 """
 
+import asyncio
 import logging
 import os
 from typing import Dict, Any, Optional
@@ -70,7 +71,7 @@ class AIDocumentationEnhancer:
                 span.set_attribute("api.name", api_title)
                 span.set_attribute("endpoints.count", endpoints_count)
                 
-                logger.info(f"Enhancing docs for {api_title} with {endpoints_count} endpoints")
+                logger.info("Enhancing docs for %s with %s endpoints", api_title, endpoints_count)
                 
                 # Call Claude to enhance
                 enhanced = await self._call_claude_for_enhancement(
@@ -83,7 +84,7 @@ class AIDocumentationEnhancer:
                 return enhanced
                 
             except Exception as e:
-                logger.error(f"AI enhancement failed: {e}", exc_info=True)
+                logger.error("AI enhancement failed: %s", e, exc_info=True)
                 span.set_attribute("enhancement.success", False)
                 # Return basic markdown if enhancement fails
                 return basic_markdown
@@ -104,8 +105,10 @@ class AIDocumentationEnhancer:
         # Build the enhancement prompt
         prompt = self._build_enhancement_prompt(basic_markdown, spec, api_title)
         
-        # Call Claude
-        message = self.client.messages.create(
+        # Call Claude. The client is synchronous, so keep the round-trip off
+        # the event loop.
+        message = await asyncio.to_thread(
+            self.client.messages.create,
             model="claude-sonnet-4-20250514",
             max_tokens=8000,
             temperature=0.3,  # Lower temperature for consistent, factual output
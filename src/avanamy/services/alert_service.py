@@ -12,7 +12,7 @@ import smtplib
 import httpx
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
@@ -154,6 +154,58 @@ class AlertService:
                     http_method=http_method
                 )
 
+    async def send_endpoint_failure_digest(
+        self,
+        watched_api: WatchedAPI,
+        failures: List[Dict[str, Any]]
+    ):
+        """
+        Send one alert per destination for several endpoints that started
+        failing in the same health check, instead of one alert per endpoint.
+        A single failure is sent as a regular endpoint failure alert.
+        
+        Args:
+            watched_api: The WatchedAPI with failing endpoints
+            failures: Dicts with endpoint_path, http_method, status_code and
+                error_message
+        """
+        if not failures:
+            return
+        if len(failures) == 1:
+            await self.send_endpoint_failure_alert(watched_api, **failures[0])
+            return
+        
+        with tracer.start_as_current_span("alert.send_endpoint_failure_digest") as span:
+            span.set_attribute("watched_api.id", str(watched_api.id))
+            span.set_attribute("endpoint.count", len(failures))
+            
+            logger.warning(
+                "Sending endpoint failure digest: %s endpoints failing on %s",
+                len(failures), watched_api.spec_url
+            )
+
+            # Get alert configurations
+            configs = self.db.query(AlertConfiguration).filter(
+                AlertConfiguration.watched_api_id == watched_api.id,
+                AlertConfiguration.enabled == True,
+                AlertConfiguration.alert_on_endpoint_failures == True
+            ).all()
+
+            if not configs:
+                return
+
+            # Prepare payload
+            payload = self._build_endpoint_failure_digest_payload(watched_api, failures)
+
+            # Send alerts
+            for config in configs:
+                await self._send_alert(
+                    config=config,
+                    alert_reason="endpoint_down",
+                    severity="critical",
+                    payload=payload
+                )
+
     async def _send_alert(
         self,
         config: AlertConfiguration,
@@ -247,7 +299,7 @@ class AlertService:
         """Send alert via email."""
         # TODO: Implement with proper SMTP configuration
         # For now, just log
-        logger.info(f"Would send email to {email}: {payload.get('subject')}")
+        logger.info("Would send email to %s: %s", email, payload.get('subject'))
         
         # In production, use something like:
         # msg = MIMEMultipart()
@@ -269,12 +321,12 @@ class AlertService:
             )
             response.raise_for_status()
             
-        logger.info(f"Webhook alert sent to {webhook_url}: status {response.status_code}")
+        logger.info("Webhook alert sent to %s: status %s", webhook_url, response.status_code)
 
     async def _send_slack_alert(self, channel: str, payload: Dict[str, Any]):
         """Send alert to Slack channel."""
         # TODO: Implement Slack webhook integration
-        logger.info(f"Would send Slack alert to {channel}: {payload.get('text')}")
+        logger.info("Would send Slack alert to %s: %s", channel, payload.get('text'))
 
     def _build_breaking_change_payload(
         self,
@@ -331,6 +383,32 @@ class AlertService:
             )
         }
 
+    def _build_endpoint_failure_digest_payload(
+        self,
+        watched_api: WatchedAPI,
+        failures: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build payload for a multi-endpoint failure alert."""
+        return {
+            "type": "endpoint_failure",
+            "severity": "critical",
+            "subject": f"🔴 {len(failures)} Endpoints Down: {watched_api.spec_url}",
+            "text": f"{len(failures)} endpoints of {watched_api.spec_url} are failing",
+            "details": {
+                "api_url": watched_api.spec_url,
+                "endpoints": [
+                    {
+                        "endpoint": f"{f['http_method']} {f['endpoint_path']}",
+                        "status_code": f["status_code"],
+                        "error_message": f["error_message"],
+                    }
+                    for f in failures
+                ],
+                "timestamp": datetime.now().isoformat()
+            },
+            "body": self._format_endpoint_failure_digest_html(watched_api, failures)
+        }
+
     def _format_breaking_change_html(
         self,
         watched_api: WatchedAPI,
@@ -386,4 +464,35 @@ class AlertService:
             <p><small>Detected at {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</small></p>
         </body>
         </html>
-        """
\ No newline at end of file
+        """
+
+    def _format_endpoint_failure_digest_html(
+        self,
+        watched_api: WatchedAPI,
+        failures: List[Dict[str, Any]]
+    ) -> str:
+        """Format multi-endpoint failure alert as HTML."""
+        endpoints_html = "<ul>"
+        for f in failures:
+            error = f" ({f['error_message']})" if f["error_message"] else ""
+            endpoints_html += (
+                f"<li>{f['http_method']} {f['endpoint_path']}: "
+                f"{f['status_code']}{error}</li>"
+            )
+        endpoints_html += "</ul>"
+        
+        return f"""
+        <html>
+        <body>
+            <h2>🔴 Endpoint Failure Alert</h2>
+            <p><strong>API:</strong> {watched_api.spec_url}</p>
+            <p><strong>Failing endpoints:</strong> {len(failures)}</p>
+            
+            {endpoints_html}
+            
+            <p>These endpoints are currently returning errors and may be unavailable.</p>
+            
+            <p><small>Detected at {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</small></p>
+        </body>
+        </html>
+        """
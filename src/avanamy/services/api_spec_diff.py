@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, List
@@ -10,6 +9,7 @@ from typing import Any, List
 from sqlalchemy.orm import Session
 
 from avanamy.repositories.api_spec_repository import ApiSpecRepository
+from avanamy.utils.json_utils import load_schema
 import logging
 from opentelemetry import trace
 
@@ -165,8 +165,8 @@ def diff_specs_by_id(db: Session, base_id: int, compare_id: int) -> List[SpecDif
         if not other:
             raise ValueError(f"Compare spec {compare_id} not found")
 
-        base_schema = json.loads(base.parsed_schema) if base.parsed_schema else {}
-        other_schema = json.loads(other.parsed_schema) if other.parsed_schema else {}
+        base_schema = load_schema(base.parsed_schema) if base.parsed_schema else {}
+        other_schema = load_schema(other.parsed_schema) if other.parsed_schema else {}
 
         diffs = diff_dicts(base_schema, other_schema)
         logger.info("Diffed specs %s vs %s -> %d diffs", base_id, compare_id, len(diffs))
@@ -1,13 +1,13 @@
 # src/avanamy/services/api_spec_parser.py
 
 from __future__ import annotations
-import json
 import yaml
 import xml.etree.ElementTree as ET
 from typing import Any, Dict
 import logging
 from opentelemetry import trace
 
+from avanamy.utils import json_utils
 from avanamy.utils.file_utils import detect_file_type
 from avanamy.metrics import spec_parse_failures_total
 
@@ -30,7 +30,7 @@ def parse_api_spec(filename: str, raw_bytes: bytes) -> Dict[str, Any]:
         try:
             # --- JSON ---
             if ftype == "json":
-                obj = json.loads(text)
+                obj = json_utils.loads(text)
                 if not isinstance(obj, dict):
                     raise ValueError("JSON root must be an object")
                 return obj
@@ -110,7 +110,7 @@ class CodeRepoScannerService:
                             files_scanned += 1
                             
                         except Exception as e:
-                            logger.warning(f"Failed to scan {relative_path}: {e}")
+                            logger.warning("Failed to scan %s: %s", relative_path, e)
                             continue
                 
                 # Store matches in database
@@ -142,8 +142,11 @@ class CodeRepoScannerService:
                 span.set_attribute("scan.endpoints_found", len(all_matches))
                 
                 logger.info(
-                    f"Scan complete: code_repository={code_repository_id} "
-                    f"files={files_scanned} endpoints={len(all_matches)}"
+                    "Scan complete: code_repository=%s "
+                    "files=%s endpoints=%s",
+                    code_repository_id,
+                    files_scanned,
+                    len(all_matches),
                 )
                 
                 return {
@@ -160,7 +163,7 @@ class CodeRepoScannerService:
                 code_repository.last_scan_error = str(e)
                 self.db.commit()
                 
-                logger.exception(f"Scan failed for code_repository {code_repository_id}")
+                logger.exception("Scan failed for code_repository %s", code_repository_id)
                 span.set_attribute("scan.error", str(e))
                 
                 raise
@@ -219,7 +222,7 @@ class CodeRepoScannerService:
             result = list(repos_map.values())
             
             logger.info(
-                f"Found {len(result)} code repositories affected by {endpoint_path}"
+                "Found %s code repositories affected by %s", len(result), endpoint_path
             )
             
             return result
@@ -267,7 +270,7 @@ class CodeRepoScannerService:
                 # Create temporary directory for clone
                 temp_dir = tempfile.mkdtemp(prefix="avanamy_scan_")
                 
-                logger.info(f"Cloning repository: {code_repository.url}")
+                logger.info("Cloning repository: %s", code_repository.url)
                 
                 # Clone repository
                 repo_path, commit_sha = github_service.clone_repository(
@@ -275,7 +278,7 @@ class CodeRepoScannerService:
                     temp_dir
                 )
                 
-                logger.info(f"Repository cloned to {repo_path}, commit: {commit_sha}")
+                logger.info("Repository cloned to %s, commit: %s", repo_path, commit_sha)
                 
                 # Scan the cloned repository
                 result = await self.scan_repository(
@@ -292,7 +295,7 @@ class CodeRepoScannerService:
                 code_repository.last_scan_error = str(e)
                 self.db.commit()
                 
-                logger.exception(f"Scan failed for code_repository {code_repository_id}")
+                logger.exception("Scan failed for code_repository %s", code_repository_id)
                 span.set_attribute("scan.error", str(e))
                 
                 raise
@@ -302,6 +305,6 @@ class CodeRepoScannerService:
                 if temp_dir and os.path.exists(temp_dir):
                     try:
                         shutil.rmtree(temp_dir)
-                        logger.info(f"Cleaned up temporary directory: {temp_dir}")
+                        logger.info("Cleaned up temporary directory: %s", temp_dir)
                     except Exception as e:
-                        logger.warning(f"Failed to clean up temp directory: {e}")
\ No newline at end of file
+                        logger.warning("Failed to clean up temp directory: %s", e)
\ No newline at end of file
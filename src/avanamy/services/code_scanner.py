@@ -328,7 +328,7 @@ class RegexScanner(CodeScanner):
                     if endpoint_match:
                         matches.append(endpoint_match)
         
-        logger.info(f"RegexScanner found {len(matches)} endpoints in {file_path}")
+        logger.info("RegexScanner found %s endpoints in %s", len(matches), file_path)
         return matches
     
     def _extract_endpoint(
@@ -398,7 +398,7 @@ class RegexScanner(CodeScanner):
             )
             
         except Exception as e:
-            logger.warning(f"Failed to extract endpoint from match: {e}")
+            logger.warning("Failed to extract endpoint from match: %s", e)
             return None
     
     def _looks_like_api_endpoint(self, url: str) -> bool:
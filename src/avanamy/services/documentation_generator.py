@@ -1,12 +1,23 @@
 # src/avanamy/services/documentation_generator.py
 
 from __future__ import annotations
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import contextlib
+import hashlib
 import json
 import logging
+import os
+import threading
 
 from opentelemetry import trace
-from prometheus_client import Counter, REGISTRY
+
+from avanamy.metrics import safe_counter
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install avanamy-backend[fast]
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
@@ -17,18 +28,58 @@ tracer = trace.get_tracer(__name__)
 # Prometheus counter (safe to reuse if already registered)
 # ------------------------------------------------------------
 
-def _safe_counter(name: str, documentation: str):
-    try:
-        return Counter(name, documentation)
-    except ValueError:
-        return REGISTRY._names_to_collectors[name]
-
-
-markdown_generation_counter = _safe_counter(
+markdown_generation_counter = safe_counter(
     "avanamy_markdown_gen_total",
     "Number of API docs markdown generations"
 )
 
+# Bound once so the hot path skips the attribute lookup on every call.
+_inc_markdown_generations = markdown_generation_counter.inc
+
+# Specs with fewer paths than this render faster than the span bookkeeping
+# costs, so we don't trace them. Set to 0 to trace every generation.
+_TRACE_MIN_PATHS = int(os.getenv("MARKDOWN_TRACE_MIN_PATHS", "25"))
+
+
+# Shared read-only defaults so lookups don't allocate a throwaway {} / [] per call.
+# Never mutate these.
+_EMPTY: Dict[str, Any] = {}
+_EMPTY_SEQ: tuple = ()
+_DEFAULT_TAGS = ("General",)
+
+# Markdown table cells can't contain raw newlines, tabs or pipes.
+_MD_CELL_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " ", "|": "\\|"})
+
+
+# Rendered Markdown keyed by a hash of the spec content. Rendering is
+# deterministic, so re-renders of an unchanged spec become a dict lookup.
+# DocumentationService keeps its own cache keyed on the stored schema text,
+# which is cheaper to hash; this one is for callers that only have the parsed
+# dict, such as the process-pool renders in regenerate_docs_for_specs.
+# Generation runs in worker threads, hence the lock.
+_MD_CACHE_SIZE = 128
+_md_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_md_cache_lock = threading.Lock()
+
+
+def _spec_cache_key(spec: Dict[str, Any]) -> Optional[bytes]:
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(spec, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(spec, sort_keys=True).encode("utf-8")
+    except (TypeError, ValueError):
+        # Unserializable or mixed-type keys: just don't cache this one.
+        return None
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _generation_span(spec: Dict[str, Any]):
+    paths = spec.get("paths")
+    if paths is not None and len(paths) < _TRACE_MIN_PATHS:
+        return contextlib.nullcontext(trace.INVALID_SPAN)
+    return tracer.start_as_current_span("service.generate_markdown")
+
 
 # ============================================================
 #  MAIN ENTRY POINT
@@ -40,9 +91,19 @@ def generate_markdown_from_normalized_spec(spec: Dict[str, Any]) -> str:
     OpenAPI-like schema.
     """
 
-    markdown_generation_counter.inc()
+    _inc_markdown_generations()
+
+    cache_key = _spec_cache_key(spec)
+    if cache_key is not None:
+        with _md_cache_lock:
+            cached = _md_cache.get(cache_key)
+            if cached is not None:
+                _md_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug("Markdown cache hit")
+            return cached
 
-    with tracer.start_as_current_span("service.generate_markdown") as span:
+    with _generation_span(spec) as span:
         span.set_attribute("has.paths", bool(spec.get("paths")))
         span.set_attribute("has.components", bool(spec.get("components")))
 
@@ -54,12 +115,16 @@ def generate_markdown_from_normalized_spec(spec: Dict[str, Any]) -> str:
                 return _generate_generic_markdown(spec)
 
             lines: List[str] = []
+            toc_lines: List[str] = []
+            endpoint_lines: List[str] = []
+
+            _add_toc_and_endpoint_groups(toc_lines, endpoint_lines, spec)
 
             _add_overview(lines, spec)
-            _add_table_of_contents(lines, spec)
+            lines.extend(toc_lines)
             _add_auth_section(lines, spec)
             _add_models_section(lines, spec)
-            _add_endpoint_groups(lines, spec)
+            lines.extend(endpoint_lines)
             _add_webhooks_section(lines, spec)
 
             result = "\n".join(lines).strip() + "\n"
@@ -67,6 +132,13 @@ def generate_markdown_from_normalized_spec(spec: Dict[str, Any]) -> str:
             span.set_attribute("markdown.length", len(result))
             logger.debug("Markdown generation complete; length=%d", len(result))
 
+            if cache_key is not None:
+                with _md_cache_lock:
+                    _md_cache[cache_key] = result
+                    _md_cache.move_to_end(cache_key)
+                    while len(_md_cache) > _MD_CACHE_SIZE:
+                        _md_cache.popitem(last=False)
+
             return result
 
         except Exception:
@@ -74,42 +146,12 @@ def generate_markdown_from_normalized_spec(spec: Dict[str, Any]) -> str:
             raise
 
 
-# ============================================================
-#  TABLE OF CONTENTS
-# ============================================================
-
-def _add_table_of_contents(lines: List[str], spec: Dict[str, Any]):
-    lines.append("## Table of Contents\n")
-
-    lines.append("- [Overview](#overview)")
-    lines.append("- [Authentication](#authentication)")
-
-    if "components" in spec and spec["components"].get("schemas"):
-        lines.append("- [Models](#models)")
-
-    tag_map = _group_paths_by_tag(spec)
-    for tag in tag_map:
-        anchor = tag.lower().replace(" ", "-")
-        lines.append(f"- [{tag}](#{anchor})")
-
-        for ep in tag_map[tag]:
-            method = ep["method"]
-            path = ep["path"]
-            anchor = f"{method.lower()}-{path.strip('/').replace('/', '-')}"
-            lines.append(f"  - `{method} {path}` → [{path}](#{anchor})")
-
-    if spec.get("webhooks") or spec.get("x-webhooks"):
-        lines.append("- [Webhooks](#webhooks)")
-
-    lines.append("\n---\n")
-
-
 # ============================================================
 #  OVERVIEW
 # ============================================================
 
 def _add_overview(lines: List[str], spec: Dict[str, Any]):
-    info = spec.get("info", {})
+    info = spec.get("info", _EMPTY)
     title = info.get("title", "API Documentation")
     version = info.get("version")
     description = info.get("description")
@@ -120,13 +162,13 @@ def _add_overview(lines: List[str], spec: Dict[str, Any]):
     if description:
         lines.append(f"{description}\n")
 
-    servers = spec.get("servers", [])
+    servers = spec.get("servers", _EMPTY_SEQ)
     if servers:
         lines.append("## Base URLs\n")
         lines.append("| Environment | URL |")
         lines.append("|------------|-----|")
         for s in servers:
-            desc = s.get("description", "Default")
+            desc = (s.get("description") or "Default").translate(_MD_CELL_TABLE).strip()
             url = s.get("url", "")
             lines.append(f"| {desc} | `{url}` |")
         lines.append("")
@@ -137,7 +179,7 @@ def _add_overview(lines: List[str], spec: Dict[str, Any]):
 # ============================================================
 
 def _add_auth_section(lines: List[str], spec: Dict[str, Any]):
-    components = spec.get("components", {})
+    components = spec.get("components", _EMPTY)
     schemes = components.get("securitySchemes") or components.get("securityschemes")
 
     lines.append("## Authentication\n")
@@ -168,8 +210,8 @@ def _add_auth_section(lines: List[str], spec: Dict[str, Any]):
 # ============================================================
 
 def _add_models_section(lines: List[str], spec: Dict[str, Any]):
-    components = spec.get("components", {})
-    schemas = components.get("schemas", {})
+    components = spec.get("components", _EMPTY)
+    schemas = components.get("schemas", _EMPTY)
 
     if not schemas:
         return
@@ -183,8 +225,8 @@ def _add_models_section(lines: List[str], spec: Dict[str, Any]):
         if desc:
             lines.append(desc + "\n")
 
-        props = model.get("properties", {})
-        required = set(model.get("required", []))
+        props = model.get("properties", _EMPTY)
+        required = set(model.get("required", _EMPTY_SEQ))
 
         if props:
             lines.append("| Field | Type | Required | Description |")
@@ -192,7 +234,7 @@ def _add_models_section(lines: List[str], spec: Dict[str, Any]):
             for field_name, field in props.items():
                 ftype = field.get("type", field.get("format", "object"))
                 is_req = "yes" if field_name in required else "no"
-                fdesc = field.get("description", "").replace("\n", " ")
+                fdesc = (field.get("description") or "").translate(_MD_CELL_TABLE).strip()
                 lines.append(
                     f"| `{field_name}` | `{ftype}` | {is_req} | {fdesc} |"
                 )
@@ -207,14 +249,17 @@ def _add_models_section(lines: List[str], spec: Dict[str, Any]):
 # ============================================================
 
 def _group_paths_by_tag(spec: Dict[str, Any]):
-    paths = spec.get("paths", {})
+    paths = spec.get("paths", _EMPTY)
     tag_map = {}
 
     for path, ops in paths.items():
         for method, op in ops.items():
-            if not isinstance(op, dict):
+            # Normalized specs almost always hold dict operations; path-level
+            # keys like "parameters" or "summary" fall through here.
+            try:
+                tags = op.get("tags", _DEFAULT_TAGS)
+            except AttributeError:
                 continue
-            tags = op.get("tags", ["General"])
             for tag in tags:
                 tag_map.setdefault(tag, []).append({
                     "path": path,
@@ -224,25 +269,47 @@ def _group_paths_by_tag(spec: Dict[str, Any]):
     return tag_map
 
 
-def _add_endpoint_groups(lines: List[str], spec: Dict[str, Any]):
-    tag_map = _group_paths_by_tag(spec)
+def _add_toc_and_endpoint_groups(
+    toc: List[str], endpoints_out: List[str], spec: Dict[str, Any]
+):
+    """
+    Build the table of contents and the per-tag endpoint sections in a
+    single pass over the tag map. The caller splices them into place.
+    """
+    toc.append("## Table of Contents\n")
 
-    for tag, endpoints in tag_map.items():
-        lines.append(f"## {tag}\n")
+    toc.append("- [Overview](#overview)")
+    toc.append("- [Authentication](#authentication)")
 
-        lines.append("| Method | Path | Summary |")
-        lines.append("|--------|------|---------|")
+    if spec.get("components", _EMPTY).get("schemas"):
+        toc.append("- [Models](#models)")
+
+    for tag, endpoints in _group_paths_by_tag(spec).items():
+        anchor = tag.lower().replace(" ", "-")
+        toc.append(f"- [{tag}](#{anchor})")
+
+        endpoints_out.append(f"## {tag}\n")
+        endpoints_out.append("| Method | Path | Summary |")
+        endpoints_out.append("|--------|------|---------|")
 
         for ep in endpoints:
-            summary = ep["op"].get("summary", "")
-            lines.append(
-                f"| `{ep['method']}` | `{ep['path']}` | {summary} |"
-            )
+            method = ep["method"]
+            path = ep["path"]
+            anchor = f"{method.lower()}-{path.strip('/').replace('/', '-')}"
+            toc.append(f"  - `{method} {path}` → [{path}](#{anchor})")
 
-        lines.append("")
+            summary = (ep["op"].get("summary") or "").translate(_MD_CELL_TABLE).strip()
+            endpoints_out.append(f"| `{method}` | `{path}` | {summary} |")
+
+        endpoints_out.append("")
 
         for ep in endpoints:
-            _add_endpoint_detail(lines, ep)
+            _add_endpoint_detail(endpoints_out, ep)
+
+    if spec.get("webhooks") or spec.get("x-webhooks"):
+        toc.append("- [Webhooks](#webhooks)")
+
+    toc.append("\n---\n")
 
 
 # ============================================================
@@ -273,7 +340,7 @@ def _add_endpoint_detail(lines: List[str], ep: Dict[str, Any]):
 
     _add_language_examples(lines, method, path)
 
-    params = op.get("parameters", [])
+    params = op.get("parameters", _EMPTY_SEQ)
     if params:
         lines.append("#### Parameters\n")
         lines.append("| Name | In | Type | Required | Description |")
@@ -282,9 +349,9 @@ def _add_endpoint_detail(lines: List[str], ep: Dict[str, Any]):
             pname = param.get("name", "")
             loc = param.get("in", "")
             required = "yes" if param.get("required") else "no"
-            schema = param.get("schema", {})
+            schema = param.get("schema", _EMPTY)
             ptype = schema.get("type", schema.get("format", "string"))
-            desc = param.get("description", "").replace("\n", " ")
+            desc = (param.get("description") or "").translate(_MD_CELL_TABLE).strip()
             lines.append(
                 f"| `{pname}` | `{loc}` | `{ptype}` | {required} | {desc} |"
             )
@@ -298,38 +365,42 @@ def _add_endpoint_detail(lines: List[str], ep: Dict[str, Any]):
 #  MULTI-LANGUAGE EXAMPLES
 # ============================================================
 
-def _add_language_examples(lines: List[str], method: str, path: str):
-    url = path
-    lines.append("#### Examples\n")
-
-    lines.append("**cURL**")
-    lines.append("```bash")
-    lines.append(f"curl -X {method} \"{url}\"")
-    lines.append("```")
-
-    lines.append("\n**Python**")
-    lines.append("```python")
-    lines.append("import requests")
-    lines.append(f'response = requests.{method.lower()}("{url}")')
-    lines.append("print(response.json())")
-    lines.append("```")
-
-    lines.append("\n**Node.js**")
-    lines.append("```javascript")
-    lines.append("import fetch from 'node-fetch';")
-    lines.append(f"const res = await fetch('{url}', {{ method: '{method}' }});")
-    lines.append("console.log(await res.json());")
-    lines.append("```")
-
-    lines.append("\n**C#**")
-    lines.append("```csharp")
-    lines.append("using var client = new HttpClient();")
-    lines.append(
-        f'var response = await client.SendAsync(new HttpRequestMessage(HttpMethod.{method.capitalize()}, "{url}"));'
-    )
-    lines.append("```")
+_LANG_TEMPLATE = """#### Examples
 
-    lines.append("")
+**cURL**
+```bash
+curl -X {method} "{url}"
+```
+
+**Python**
+```python
+import requests
+response = requests.{method_lower}("{url}")
+print(response.json())
+```
+
+**Node.js**
+```javascript
+import fetch from 'node-fetch';
+const res = await fetch('{url}', {{ method: '{method}' }});
+console.log(await res.json());
+```
+
+**C#**
+```csharp
+using var client = new HttpClient();
+var response = await client.SendAsync(new HttpRequestMessage(HttpMethod.{method_cap}, "{url}"));
+```
+"""
+
+
+def _add_language_examples(lines: List[str], method: str, path: str):
+    lines.append(_LANG_TEMPLATE.format_map({
+        "method": method,
+        "method_lower": method.lower(),
+        "method_cap": method.capitalize(),
+        "url": path,
+    }))
 
 
 # ============================================================
@@ -341,7 +412,7 @@ def _add_request_body(lines: List[str], op: Dict[str, Any]):
     if not request_body:
         return
 
-    content = request_body.get("content", {})
+    content = request_body.get("content")
     if not content:
         return
 
@@ -367,8 +438,12 @@ def _add_request_body(lines: List[str], op: Dict[str, Any]):
         lines.append("")
 
 
+def _pick_media(content: Dict[str, Any]):
+    return content.get("application/json") or next(iter(content.values()), None)
+
+
 def _add_responses(lines: List[str], op: Dict[str, Any]):
-    responses = op.get("responses", {})
+    responses = op.get("responses")
     if not responses:
         return
 
@@ -378,12 +453,17 @@ def _add_responses(lines: List[str], op: Dict[str, Any]):
         desc = detail.get("description", "")
         lines.append(f"- **{status}** – {desc}\n")
 
-        content = detail.get("content", {})
-        media = content.get("application/json") or next(iter(content.values()), None)
+        content = detail.get("content")
+        if not content:
+            # No-content responses (204s etc.) are common; skip the media lookups.
+            lines.append("")
+            continue
+
+        media = _pick_media(content)
 
         if media:
             example = media.get("example")
-            schema = media.get("schema")
+            schema = None if example else media.get("schema")
 
             if example:
                 lines.append("Example:\n")
@@ -428,7 +508,16 @@ def _add_webhooks_section(lines: List[str], spec: Dict[str, Any]):
 # FALLBACK
 # ============================================================
 
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
 def _safe_json(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib have a go.
+            pass
     try:
         return json.dumps(obj, indent=2, ensure_ascii=False)
     except:
@@ -2,10 +2,21 @@ import logging
 from opentelemetry import trace
 from prometheus_client import Counter
 from markdown import Markdown
-from jinja2 import Template
+from markdown.extensions import codehilite, fenced_code, toc
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
 from datetime import datetime, timezone
 from pathlib import Path
+from functools import lru_cache
+from collections import OrderedDict
+from typing import IO
+import hashlib
+import html
 import re
+import threading
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -15,9 +26,272 @@ html_render_counter = Counter(
     "avanamy_markdown_html_render_total",
     "Number of times Markdown was converted to HTML"
 )
+_inc_html_renders = html_render_counter.inc
 
 TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "docs_base.html"
 
+_UTC = timezone.utc
+_TS_FMT = "%B %d, %Y at %H:%M UTC"
+
+# Parse + compile the page template once per process instead of per render.
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_PATH.parent),
+    auto_reload=False,
+    cache_size=400,
+)
+_TEMPLATE = _env.get_template(TEMPLATE_PATH.name)
+
+@lru_cache(maxsize=32)
+def _cached_formatter(options: tuple):
+    return HtmlFormatter(**dict(options))
+
+
+def _cached_html_formatter(lang_str: str = "", **options):
+    """
+    codehilite builds a fresh Pygments HtmlFormatter for every code block, and
+    each one regenerates its whole stylesheet up front. Doc pages have
+    hundreds of blocks sharing a handful of languages, so reuse them.
+    """
+    try:
+        return _cached_formatter(tuple(sorted(options.items())))
+    except TypeError:  # unhashable option value, e.g. hl_lines="1 3"
+        return HtmlFormatter(**options)
+
+
+@lru_cache(maxsize=32)
+def _cached_lexer(alias: str, options: tuple):
+    return get_lexer_by_name(alias, **dict(options))
+
+
+def _get_lexer_by_name(_alias: str, **options):
+    """
+    Same for lexers: codehilite looks one up per code block, and some (C#,
+    VB.NET) compile their whole regex table in __init__. Lexer instances
+    keep no per-document state, so one per (language, options) is enough.
+    """
+    try:
+        return _cached_lexer(_alias, tuple(sorted(options.items())))
+    except TypeError:  # unhashable option value
+        return get_lexer_by_name(_alias, **options)
+
+
+class _CodeHilite(codehilite.CodeHilite):
+    """
+    CodeHilite.hilite() with the lexer lookup going through the cache above.
+    codehilite has no hook for the lexer, so this repeats its Pygments path;
+    anything else (no Pygments, a formatter given by name) is left to it.
+    """
+
+    def hilite(self, shebang: bool = True) -> str:
+        if not (codehilite.pygments and self.use_pygments) or isinstance(self.pygments_formatter, str):
+            return super().hilite(shebang)
+
+        self.src = self.src.strip("\n")
+        if self.lang is None and shebang:
+            self._parseHeader()
+
+        try:
+            lexer = _get_lexer_by_name(self.lang, **self.options)
+        except ValueError:
+            try:
+                if self.guess_lang:
+                    lexer = guess_lexer(self.src, **self.options)
+                else:
+                    lexer = _get_lexer_by_name("text", **self.options)
+            except ValueError:
+                lexer = _get_lexer_by_name("text", **self.options)
+        if not self.lang:
+            self.lang = lexer.aliases[0]
+        formatter = self.pygments_formatter(lang_str=f"{self.lang_prefix}{self.lang}", **self.options)
+        return highlight(self.src, lexer, formatter)
+
+
+class _FencedBlockPreprocessor(fenced_code.FencedBlockPreprocessor):
+    """
+    fenced_code's preprocessor, highlighting plain ```lang fences (all the
+    generator writes) through _CodeHilite. Fences with {attrs}, or when
+    Pygments is off, are left for the stock run() to handle as before.
+    """
+
+    def run(self, lines: list[str]) -> list[str]:
+        if not self.checked_for_deps:
+            for ext in self.md.registeredExtensions:
+                if isinstance(ext, codehilite.CodeHiliteExtension):
+                    self.codehilite_conf = ext.getConfigs()
+        if not (self.codehilite_conf and self.codehilite_conf["use_pygments"]):
+            return super().run(lines)
+
+        text = "\n".join(lines)
+        index = 0
+        while m := self.FENCED_BLOCK_RE.search(text, index):
+            if m.group("attrs"):
+                index = m.end()
+                continue
+            local_config = self.codehilite_conf.copy()
+            if m.group("hl_lines"):
+                local_config["hl_lines"] = codehilite.parse_hl_lines(m.group("hl_lines"))
+            code = _CodeHilite(
+                m.group("code"),
+                lang=m.group("lang") or None,
+                style=local_config.pop("pygments_style", "default"),
+                **local_config,
+            ).hilite(shebang=False)
+            placeholder = self.md.htmlStash.store(code)
+            text = f"{text[:m.start()]}\n{placeholder}\n{text[m.end():]}"
+            index = m.start() + 1 + len(placeholder)
+        return super().run(text.split("\n"))
+
+
+class _FencedCodeExtension(fenced_code.FencedCodeExtension):
+    """fenced_code, with _FencedBlockPreprocessor in place of its own."""
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        md.preprocessors.register(_FencedBlockPreprocessor(md, self.getConfigs()), "fenced_code_block", 25)
+
+
+class _TocTreeprocessor(toc.TocTreeprocessor):
+    """
+    toc's unique() finds a free header id by trying id, id_1, id_2, ... from
+    the start every time, so the n-th "Responses" heading of a page costs n
+    probes. The candidate chain is fixed and the used ids only grow within a
+    document, so resume from where the previous search for the same id ended;
+    the ids come out the same. run() calls unique() directly, so it is
+    repeated here with only that call changed.
+    """
+
+    def run(self, doc) -> None:
+        used_ids = set()
+        for el in doc.iter():
+            if "id" in el.attrib:
+                used_ids.add(el.attrib["id"])
+        last_found: dict = {}
+
+        toc_tokens = []
+        for el in doc.iter():
+            if isinstance(el.tag, str) and self.header_rgx.match(el.tag):
+                self.set_level(el)
+                innerhtml = toc.render_inner_html(toc.remove_fnrefs(el), self.md)
+                name = toc.strip_tags(innerhtml)
+
+                if "id" not in el.attrib:
+                    slug = self.slugify(html.unescape(name), self.sep)
+                    found = toc.unique(last_found.get(slug, slug), used_ids)
+                    el.attrib["id"] = last_found[slug] = found
+
+                data_toc_label = ""
+                if "data-toc-label" in el.attrib:
+                    data_toc_label = toc.run_postprocessors(toc.unescape(el.attrib["data-toc-label"]), self.md)
+                    name = toc.escape_cdata(toc.strip_tags(data_toc_label))
+                    del el.attrib["data-toc-label"]
+
+                if self.toc_top <= int(el.tag[-1]) <= self.toc_bottom:
+                    toc_tokens.append({
+                        "level": int(el.tag[-1]),
+                        "id": toc.unescape(el.attrib["id"]),
+                        "name": name,
+                        "html": innerhtml,
+                        "data-toc-label": data_toc_label,
+                    })
+
+                if self.use_anchors:
+                    self.add_anchor(el, el.attrib["id"])
+                if self.use_permalinks not in [False, None]:
+                    self.add_permalink(el, el.attrib["id"])
+
+        toc_tokens = toc.nest_toc_tokens(toc_tokens)
+        div = self.build_toc_div(toc_tokens)
+        if self.marker:
+            self.replace_marker(doc, div)
+
+        toc_html = self.md.serializer(div)
+        for pp in self.md.postprocessors:
+            toc_html = pp.run(toc_html)
+        self.md.toc_tokens = toc_tokens
+        self.md.toc = toc_html
+
+
+class _TocExtension(toc.TocExtension):
+    TreeProcessorClass = _TocTreeprocessor
+
+
+# Markdown with TOC and fenced code blocks. Building it loads every extension
+# (codehilite pulls in Pygments), so keep one and reset it between documents.
+# A Markdown instance holds per-document state, hence the lock.
+_MD = Markdown(
+    extensions=[
+        # The template places the TOC itself, so skip toc's extra walk over
+        # the whole tree looking for an inline [TOC] marker; headers get
+        # their ids and the TOC is built in the same pass either way.
+        _TocExtension(marker=""),
+        _FencedCodeExtension(),
+        "codehilite",
+        "tables",
+        "admonition",
+    ],
+    extension_configs={
+        "codehilite": {"pygments_formatter": _cached_html_formatter},
+    },
+)
+_md_lock = threading.Lock()
+
+
+# Converted (body_html, toc_html) keyed by a digest of the markdown. Only the
+# page shell (title, version label, timestamp) differs between renders of
+# the same markdown, e.g. after a version bump with an unchanged schema.
+_BODY_CACHE_SIZE = 32
+_body_cache: "OrderedDict[bytes, tuple[str, str]]" = OrderedDict()
+
+
+def _render_body(markdown_text: str) -> tuple[str, str]:
+    """Markdown -> (body_html, toc_html); the expensive part of a render."""
+    key = hashlib.blake2b(markdown_text.encode("utf-8"), digest_size=16).digest()
+
+    with _md_lock:
+        cached = _body_cache.get(key)
+        if cached is not None:
+            _body_cache.move_to_end(key)
+            return cached
+
+        _inc_html_renders()
+        _MD.reset()
+        html_content = _MD.convert(markdown_text)
+        toc_html = _MD.toc
+
+        toc_html = toc_html or "<p><em>No table of contents available</em></p>"
+        toc_html = re.sub(r'<ul>\s*<li><a href="#[^"]*">[^<]*</a>', '<ul>', toc_html, count=1)
+
+        _body_cache[key] = (html_content, toc_html)
+        if len(_body_cache) > _BODY_CACHE_SIZE:
+            _body_cache.popitem(last=False)
+
+    return html_content, toc_html
+
+
+def _build_render_context(
+    markdown_text: str,
+    title: str,
+    provider_name: str = None,
+    product_name: str = None,
+    version_label: str = None,
+    spec_version: str = None,
+):
+    """Assemble the template + context (the cheap page shell) for rendering."""
+    html_content, toc_html = _render_body(markdown_text)
+
+    context = dict(
+        provider_name=provider_name or "Provider",
+        product_name=product_name or "Product",
+        spec_title=title,  # "Test Diff Engineer" from the spec
+        spec_version=spec_version or "1.0.0",  # From spec's info.version
+        version_label=version_label or "v1",  # Our internal version (v9)
+        # Already-rendered HTML: Markup tells Jinja not to touch it again.
+        toc=Markup(toc_html),
+        content=Markup(html_content),
+        now=datetime.now(_UTC).strftime(_TS_FMT),
+    )
+    return _TEMPLATE, context
+
 
 def render_markdown_to_html(
     markdown_text: str, 
@@ -36,43 +310,51 @@ def render_markdown_to_html(
 
     with tracer.start_as_current_span("render_markdown_to_html") as span:
         logger.debug("Rendering Markdown to HTML...")
-
-        html_render_counter.inc()
         span.set_attribute("markdown.length", len(markdown_text))
 
-        # Markdown with TOC and fenced code blocks
-        md = Markdown(
-            extensions=[
-                "toc",
-                "fenced_code",
-                "codehilite",
-                "tables",
-                "admonition",
-            ]
+        template, context = _build_render_context(
+            markdown_text,
+            title,
+            provider_name=provider_name,
+            product_name=product_name,
+            version_label=version_label,
+            spec_version=spec_version,
         )
+        final_html = template.render(**context)
 
-        html_content = md.convert(markdown_text)
+        logger.info("Successfully rendered HTML documentation")
+        return final_html
 
-        toc_html = md.toc or "<p><em>No table of contents available</em></p>"
 
-        toc_html = re.sub(r'<ul>\s*<li><a href="#[^"]*">[^<]*</a>', '<ul>', toc_html, count=1)
+def render_markdown_to_html_stream(
+    out: IO,
+    markdown_text: str,
+    title: str = "API Documentation",
+    provider_name: str = None,
+    product_name: str = None,
+    version_label: str = None,
+    spec_version: str = None,
+    encoding: str = None,
+) -> None:
+    """
+    Same page as render_markdown_to_html, but written to ``out`` chunk by
+    chunk instead of being built up as one string first. ``out`` can be any
+    text stream with a ``write`` method (io.StringIO, a response writer, ...),
+    or a binary one (io.BytesIO) when ``encoding`` is given.
+    """
+
+    with tracer.start_as_current_span("render_markdown_to_html_stream") as span:
+        logger.debug("Streaming Markdown to HTML...")
+        span.set_attribute("markdown.length", len(markdown_text))
 
-        # Load template
-        template_str = TEMPLATE_PATH.read_text(encoding="utf-8")
-        template = Template(template_str)
-        
-        from datetime import datetime
-        
-        final_html = template.render(
-            provider_name=provider_name or "Provider",
-            product_name=product_name or "Product",
-            spec_title=title,  # "Test Diff Engineer" from the spec
-            spec_version=spec_version or "1.0.0",  # From spec's info.version
-            version_label=version_label or "v1",  # Our internal version (v9)
-            toc=toc_html,
-            content=html_content,
-            now=datetime.now(timezone.utc).strftime("%B %d, %Y at %H:%M UTC"),
+        template, context = _build_render_context(
+            markdown_text,
+            title,
+            provider_name=provider_name,
+            product_name=product_name,
+            version_label=version_label,
+            spec_version=spec_version,
         )
+        template.stream(**context).dump(out, encoding=encoding)
 
-        logger.info("Successfully rendered HTML documentation")
-        return final_html
\ No newline at end of file
+        logger.info("Successfully streamed HTML documentation")
@@ -1,16 +1,34 @@
 # src/avanamy/services/documentation_service.py
 
+import asyncio
+import contextvars
+import functools
+import hashlib
+import io
 import json
 import logging
-
+import multiprocessing
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 from opentelemetry import trace
-from prometheus_client import Counter, REGISTRY
 
-from avanamy.models.documentation_artifact import DocumentationArtifact
+from avanamy.db.database import SessionLocal
+from avanamy.metrics import markdown_generation_total
+from avanamy.models.documentation_artifact import (
+    ARTIFACT_TYPE_API_HTML,
+    ARTIFACT_TYPE_API_MARKDOWN,
+    DocumentationArtifact,
+)
 from avanamy.models.provider import Provider
-from avanamy.services.s3 import upload_bytes
-from avanamy.services.documentation_renderer import render_markdown_to_html
+from avanamy.services.s3 import head_object_metadata, upload_bytes
+from avanamy.services.documentation_renderer import render_markdown_to_html_stream
 from avanamy.services.documentation_generator import generate_markdown_from_normalized_spec
 from avanamy.services.ai_documentation_enhancer import AIDocumentationEnhancer
 from avanamy.repositories.documentation_artifact_repository import DocumentationArtifactRepository
@@ -18,83 +36,374 @@ from avanamy.models.api_spec import ApiSpec
 from avanamy.models.api_product import ApiProduct
 from avanamy.models.tenant import Tenant
 from avanamy.models.version_history import VersionHistory
-from avanamy.repositories.version_history_repository import VersionHistoryRepository
+from avanamy.utils import json_utils
 from avanamy.utils.filename_utils import slugify_filename
 from avanamy.utils.s3_paths import (
     build_docs_markdown_path,
     build_docs_html_path,
+    docs_html_path_for_markdown_path,
 )
 
-ARTIFACT_TYPE_API_MARKDOWN = "api_markdown"
-ARTIFACT_TYPE_API_HTML = "api_html"
+try:
+    from blake3 import blake3 as _content_hasher
+except ImportError:  # optional speedup: pip install avanamy-backend[fast]
+    _content_hasher = hashlib.sha256
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# S3 user metadata key holding the content hash an object was rendered from,
+# so a HEAD can validate reuse without downloading the body.
+CONTENT_HASH_METADATA_KEY = "content-hash"
+# Set on objects overwritten by the AI enhancement, so an up-to-date spec
+# whose enhancement never landed can be told apart and enhanced again.
+ENHANCED_METADATA_KEY = "enhanced"
+
+# S3 PUTs get their own bounded pool rather than the loop's default executor,
+# which also runs renders and DB work. Kept under botocore's default of 10
+# pooled connections so a bulk regenerate queues here instead of churning
+# connections on the shared client.
+_upload_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DOCS_UPLOAD_CONCURRENCY", "8")),
+    thread_name_prefix="docs-upload",
+)
 
-def safe_counter(name, documentation, **kwargs):
-    """Avoid duplicate metric registration in pytest."""
-    try:
-        return Counter(name, documentation, **kwargs)
-    except ValueError:
-        return REGISTRY._names_to_collectors[name]
+# Bound once so the hot path skips the attribute lookup on every call.
+_inc_markdown_generations = markdown_generation_total.inc
 
 
-markdown_gen_counter = safe_counter(
-    "avanamy_markdown_generation_total",
-    "Number of markdown documentation generations",
-)
+class _MarkdownCache:
+    """
+    Bounded LRU of generated markdown keyed by the raw parsed_schema text.
+
+    Hashing the stored text is cheaper than the generator's own lookup, which
+    has to re-serialize the parsed dict to build its key. Entries are indexed
+    by a short prefix of the digest and the full digest is checked before a
+    hit is returned, so a prefix collision regenerates instead of serving
+    another spec's markdown.
+    """
+
+    _KEY_BYTES = 8
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, parsed_schema, schema: dict) -> str:
+        raw = parsed_schema.encode("utf-8") if isinstance(parsed_schema, str) else parsed_schema
+        full_hash = hashlib.blake2b(raw, digest_size=32).digest()
+        key = full_hash[: self._KEY_BYTES]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == full_hash:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        markdown = generate_markdown_from_normalized_spec(schema)
+
+        with self._lock:
+            self._entries[key] = (full_hash, markdown)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return markdown
+
+
+# A few hundred KB of markdown per large spec; 256 entries keeps this in the
+# tens of MB while covering every spec touched by a regenerate-all pass.
+_markdown_cache = _MarkdownCache(maxsize=256)
+
+
+def _load_docs_context(db: Session, spec: ApiSpec):
+    """
+    Load the spec's product, tenant, provider and latest VersionHistory in a
+    single round-trip. Missing rows come back as None (outer joins) so callers
+    can still report exactly what is missing.
+    """
+    row = (
+        db.query(ApiProduct, Tenant, Provider, VersionHistory)
+        .outerjoin(Tenant, Tenant.id == ApiProduct.tenant_id)
+        .outerjoin(Provider, Provider.id == ApiProduct.provider_id)
+        .outerjoin(VersionHistory, VersionHistory.api_spec_id == spec.id)
+        .filter(ApiProduct.id == spec.api_product_id)
+        .order_by(VersionHistory.version.desc())
+        .first()
+    )
+    if row is None:
+        return None, None, None, None
+    return tuple(row)
+
+
+def _schema_bytes(spec: ApiSpec) -> bytes:
+    """
+    spec.parsed_schema as UTF-8 bytes. A multi-MB spec is encoded once per
+    call and the bytes shared by the content hash, the markdown cache and the
+    JSON parser, which all take bytes.
+    """
+    raw = spec.parsed_schema
+    if isinstance(raw, str):
+        return raw.encode("utf-8")
+    if isinstance(raw, bytes):
+        return raw
+    return json.dumps(raw, sort_keys=True).encode("utf-8")
+
+
+def _docs_content_hash(
+    schema_bytes: bytes, spec: ApiSpec, provider: Provider, product: ApiProduct
+) -> str:
+    """
+    256-bit digest over everything the rendered docs depend on: the raw
+    parsed_schema (see _schema_bytes) plus the names that end up in the page
+    header.
+
+    BLAKE3 when installed (much faster on multi-MB specs), SHA-256 otherwise.
+    Both are 64 hex chars; switching just means one regeneration per spec.
+    """
+    h = _content_hasher(schema_bytes)
+    for part in (spec.name, provider.name, product.name):
+        h.update(b"\0")
+        h.update((part or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def _artifact_is_current(artifact, *, s3_key: str, version_history_id, content_hash: str) -> bool:
+    return (
+        artifact is not None
+        and artifact.content_hash == content_hash
+        and artifact.s3_path == s3_key
+        and artifact.version_history_id == version_history_id
+    )
+
+
+async def _current_docs_metadata(
+    db: Session,
+    repo: DocumentationArtifactRepository,
+    spec: ApiSpec,
+    *,
+    md_key: str,
+    html_key: str,
+    version_history_id,
+    content_hash: str,
+):
+    """
+    If both doc artifacts match content_hash and the S3 objects are still
+    there, stamped with the same hash, return the objects' metadata
+    (markdown, html). Otherwise None.
+    """
+    for artifact_type, s3_key in (
+        (ARTIFACT_TYPE_API_MARKDOWN, md_key),
+        (ARTIFACT_TYPE_API_HTML, html_key),
+    ):
+        artifact = repo.get_latest(
+            db,
+            api_spec_id=spec.id,
+            tenant_id=spec.tenant_id,
+            artifact_type=artifact_type,
+        )
+        if not _artifact_is_current(
+            artifact,
+            s3_key=s3_key,
+            version_history_id=version_history_id,
+            content_hash=content_hash,
+        ):
+            return None
+
+    heads = await asyncio.gather(
+        asyncio.to_thread(head_object_metadata, md_key),
+        asyncio.to_thread(head_object_metadata, html_key),
+    )
+    if all(
+        meta is not None and meta.get(CONTENT_HASH_METADATA_KEY) == content_hash
+        for meta in heads
+    ):
+        return heads
+    return None
+
+
+def _docs_keys(spec: ApiSpec, tenant: Tenant, provider: Provider, product: ApiProduct, version_label: str):
+    """Return the (markdown, html) S3 keys for a spec's docs at version_label."""
+    # ✅ FIX: Strip extension to prevent double extensions
+    base_spec_name = spec.name.rsplit('.', 1)[0] if '.' in spec.name else spec.name
+    spec_slug = slugify_filename(base_spec_name)
+
+    md_key = build_docs_markdown_path(
+        tenant_slug=tenant.slug,
+        provider_slug=provider.slug,
+        product_slug=product.slug,
+        version=version_label,
+        spec_id=spec.id,
+        spec_slug=spec_slug,
+    )
+
+    html_key = build_docs_html_path(
+        tenant_slug=tenant.slug,
+        provider_slug=provider.slug,
+        product_slug=product.slug,
+        version=version_label,
+        spec_slug=spec_slug,
+        spec_id=str(spec.id),
+    )
+    return md_key, html_key
+
+
+def _render_html_bytes(
+    markdown: str,
+    *,
+    title: str,
+    provider_name: str,
+    product_name: str,
+    version_label: str,
+    spec_version: str,
+) -> bytes:
+    """Render markdown to the UTF-8 encoded HTML page."""
+    # The page is streamed straight into a UTF-8 byte buffer rather than
+    # built as one big str and encoded after.
+    buf = io.BytesIO()
+    render_markdown_to_html_stream(
+        buf,
+        markdown,
+        title=title,
+        provider_name=provider_name,
+        product_name=product_name,
+        version_label=version_label,
+        spec_version=spec_version,
+        encoding="utf-8",
+    )
+    return buf.getvalue()
+
+
+def _render_docs(markdown: str, **page) -> tuple[bytes, bytes]:
+    """Encode markdown and render the HTML page. Returns (md_bytes, html_bytes)."""
+    return markdown.encode("utf-8"), _render_html_bytes(markdown, **page)
+
+
+def _upload(
+    key: str, data: bytes, content_type: str, content_hash: str, enhanced: bool = False
+) -> asyncio.Future:
+    """Start one upload_bytes call on the upload pool; await the result for (key, url)."""
+    metadata = {CONTENT_HASH_METADATA_KEY: content_hash}
+    if enhanced:
+        metadata[ENHANCED_METADATA_KEY] = "true"
+    # Carry the context over like asyncio.to_thread does, so the s3.upload
+    # span still nests under the caller's span.
+    ctx = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(
+        _upload_pool,
+        ctx.run,
+        functools.partial(
+            upload_bytes,
+            key,
+            data,
+            content_type=content_type,
+            metadata=metadata,
+        ),
+    )
 
 
-async def generate_and_store_markdown_for_spec(db: Session, spec: ApiSpec):
+async def _upload_docs(
+    md_key: str,
+    md_bytes: bytes,
+    html_key: str,
+    html_bytes: bytes,
+    *,
+    content_hash: str,
+):
+    """Upload both bodies. Returns (md_url, html_url)."""
+    # Both PUTs are independent; run them side by side off the event loop.
+    (_, md_url), (_, html_url) = await asyncio.gather(
+        _upload(md_key, md_bytes, "text/markdown", content_hash),
+        _upload(html_key, html_bytes, "text/html", content_hash),
+    )
+    return md_url, html_url
+
+
+async def _render_and_upload(
+    markdown: str,
+    *,
+    schema: dict,
+    spec: ApiSpec,
+    provider: Provider,
+    product: ApiProduct,
+    version_label: str,
+    md_key: str,
+    html_key: str,
+    content_hash: str,
+    enhanced: bool = False,
+):
+    """
+    Render markdown to HTML and upload both. Returns (md_url, html_url).
+    enhanced marks the objects as AI-enhanced (see ENHANCED_METADATA_KEY).
+    """
+    # The markdown upload only needs the markdown: start it now and render
+    # the HTML (CPU-bound, in a worker thread) while it is in flight.
+    md_upload = _upload(md_key, markdown.encode("utf-8"), "text/markdown", content_hash, enhanced)
+    try:
+        html_bytes = await asyncio.to_thread(
+            _render_html_bytes,
+            markdown,
+            title=spec.name,
+            provider_name=provider.name,
+            product_name=product.name,
+            version_label=version_label,
+            spec_version=schema.get("info", {}).get("version", "1.0.0"),
+        )
+    except BaseException:
+        await asyncio.gather(md_upload, return_exceptions=True)
+        raise
+
+    (_, md_url), (_, html_url) = await asyncio.gather(
+        md_upload,
+        _upload(html_key, html_bytes, "text/html", content_hash, enhanced),
+    )
+    return md_url, html_url
+
+
+async def generate_and_store_markdown_for_spec(db: Session, spec: ApiSpec, commit: bool = True):
     """
     Generate Markdown + HTML documentation for the *current* version of a spec.
 
-    - Uses VersionHistoryRepository.current_version_label_for_spec to get 'vN'
+    - Takes 'vN' from the latest VersionHistory, loaded by _load_docs_context
     - Uses tenant + product slugs for S3 layout
     - Uploads markdown + HTML to S3
+    - Schedules AI enhancement (enhance_and_replace) to replace them later
     - Upserts documentation_artifacts (no duplicates)
     - Updates spec.documentation_html_s3_path
+
+    With commit=False the artifact rows and spec update are left in the
+    session, so a caller working through many specs can commit once.
     """
     with tracer.start_as_current_span("docs.generate_and_store_markdown_for_spec") as span:
-        span.set_attribute("api_spec.id", spec.id)
-        span.set_attribute("tenant.id", str(getattr(spec, "tenant_id", "")))
+        tenant_id = getattr(spec, "tenant_id", None)
+        # OTel only takes str/bool/int/float; a UUID is dropped with a warning.
+        span.set_attribute("api_spec.id", str(spec.id))
+        span.set_attribute("tenant.id", tenant_id or "")
 
-        markdown_gen_counter.inc()
+        _inc_markdown_generations()
         logger.info("Generating documentation for spec %s", spec.id)
 
         if not spec.parsed_schema:
             logger.warning("No parsed_schema; skipping documentation generation for spec %s", spec.id)
             return None
 
-        # Parse stored JSON
-        try:
-            schema = json.loads(spec.parsed_schema)
-        except Exception:
-            logger.exception("parsed_schema is not valid JSON for spec %s", spec.id)
-            return None
-
         # Tenant safety: requires tenant_id on every generated artifact
-        tenant_id = getattr(spec, "tenant_id", None)
         if not tenant_id:
             logger.error("Cannot generate documentation: spec %s has no tenant_id", spec.id)
             return None
-        logger.info("tenant_id raw value on spec = %s (%s)", tenant_id, type(tenant_id))
-        # Resolve product + tenant slugs
-        product = db.query(ApiProduct).filter(ApiProduct.id == spec.api_product_id).first()
+        # Resolve product + tenant + provider slugs and the current version
+        product, tenant, provider, version_history = _load_docs_context(db, spec)
         if not product:
             logger.error("ApiProduct not found for spec_id=%s", spec.id)
             return None
 
-        tenant = db.query(Tenant).filter(Tenant.id == product.tenant_id).first()
         if not tenant:
             logger.error("Tenant not found for product_id=%s", product.id)
             return None
 
-        # Get the current version history record
-        version_history = db.query(VersionHistory).filter(
-            VersionHistory.api_spec_id == spec.id
-        ).order_by(VersionHistory.version.desc()).first()
+        if not provider:
+            logger.error("Provider not found for product_id=%s", product.id)
+            return None
 
         if not version_history:
             logger.error("No version history found for spec_id=%s", spec.id)
@@ -103,170 +412,432 @@ async def generate_and_store_markdown_for_spec(db: Session, spec: ApiSpec):
         version_label = f"v{version_history.version}"
         version_history_id = version_history.id
 
-        # --------------------------------------------------------------------
-        # 1. Markdown (with AI enhancement)
-        # --------------------------------------------------------------------
-        basic_markdown = generate_markdown_from_normalized_spec(schema)
-        
-        # Enhance with AI if available
-        enhancer = AIDocumentationEnhancer()
-        if enhancer.is_enabled():
-            logger.info("Enhancing documentation with AI for spec %s", spec.id)
-            # Extract the spec's title from the OpenAPI schema
-            spec_title = schema.get("info", {}).get("title", spec.name)
-            # ✅ FIX: Use await instead of asyncio.run()
-            markdown = await enhancer.enhance_markdown(basic_markdown, schema, api_title=spec_title)
-        else:
-            logger.info("AI enhancement disabled, using basic markdown")
-            markdown = basic_markdown
-
-        provider = db.query(Provider).filter(Provider.id == product.provider_id).first()
-        provider_slug = provider.slug
-        # ✅ FIX: Strip extension to prevent double extensions
-        base_spec_name = spec.name.rsplit('.', 1)[0] if '.' in spec.name else spec.name
-        spec_slug = slugify_filename(base_spec_name)
-
-        md_key = build_docs_markdown_path(
-            tenant_slug=tenant.slug,
-            provider_slug=provider_slug,
-            product_slug=product.slug,
-            version=version_label,
-            spec_id=spec.id,
-            spec_slug=spec_slug,
-        )
-        _, md_url = upload_bytes(
-            md_key,
-            markdown.encode("utf-8"),
-            content_type="text/markdown",
-        )
+        md_key, html_key = _docs_keys(spec, tenant, provider, product, version_label)
 
-        # --------------------------------------------------------------------
-        # 2. HTML
-        # --------------------------------------------------------------------
+        # Unchanged inputs and the objects are still in S3: nothing to redo.
+        # The hash on the spec row settles most calls without touching the
+        # artifacts table; only a match is confirmed against artifacts + S3.
+        schema_bytes = _schema_bytes(spec)
+        content_hash = _docs_content_hash(schema_bytes, spec, provider, product)
+        repo = DocumentationArtifactRepository()
+        current = None
+        if spec.last_rendered_schema_hash == content_hash:
+            current = await _current_docs_metadata(
+                db,
+                repo,
+                spec,
+                md_key=md_key,
+                html_key=html_key,
+                version_history_id=version_history_id,
+                content_hash=content_hash,
+            )
+        if current is not None:
+            logger.info("Documentation for spec %s is up to date; skipping regeneration", spec.id)
+            span.set_attribute("docs.cache_hit", True)
+            # Basic docs whose enhancement was cancelled or failed: try again.
+            enhanced = all(meta.get(ENHANCED_METADATA_KEY) == "true" for meta in current)
+            if not enhanced and AIDocumentationEnhancer().is_enabled():
+                _schedule_enhancement(spec.id)
+            return md_key
 
-        spec_version = schema.get("info", {}).get("version", "1.0.0")
+        try:
+            schema = json_utils.load_schema_cached(schema_bytes)
+        except Exception:
+            logger.exception("parsed_schema is not valid JSON for spec %s", spec.id)
+            return None
 
-        html = render_markdown_to_html(
-            markdown, 
-            title=spec.name,
-            provider_name=provider.name,
-            product_name=product.name,
+        # --------------------------------------------------------------------
+        # 1. Basic markdown + HTML, uploaded right away
+        # --------------------------------------------------------------------
+        markdown = _markdown_cache.get_or_render(schema_bytes, schema)
+        _, html_url = await _render_and_upload(
+            markdown,
+            schema=schema,
+            spec=spec,
+            provider=provider,
+            product=product,
             version_label=version_label,
-            spec_version=spec_version,
-        )
-
-        html_key = build_docs_html_path(
-            tenant_slug=tenant.slug,
-            provider_slug=provider_slug,
-            product_slug=product.slug,
-            version=version_label,
-            spec_slug=spec_slug,
-            spec_id=str(spec.id),
-        )
-        _, html_url = upload_bytes(
-            html_key,
-            html.encode("utf-8"),
-            content_type="text/html",
+            md_key=md_key,
+            html_key=html_key,
+            content_hash=content_hash,
         )
 
         # --------------------------------------------------------------------
-        # 3. UPSERT documentation artifacts
+        # 2. UPSERT documentation artifacts
         # --------------------------------------------------------------------
-        repo = DocumentationArtifactRepository()
-
-        repo.create(
-            db=db,
-            tenant_id=tenant_id,
-            api_spec_id=spec.id,
-            artifact_type=ARTIFACT_TYPE_API_MARKDOWN,
-            s3_path=md_key,
-            version_history_id=version_history_id,
-        )
-
-        repo.create(
-            db=db,
-            tenant_id=tenant_id,
-            api_spec_id=spec.id,
-            artifact_type=ARTIFACT_TYPE_API_HTML,
-            s3_path=html_key,
-            version_history_id=version_history_id,
-        )
+        repo.bulk_upsert(db, [
+            dict(
+                tenant_id=tenant_id,
+                api_spec_id=spec.id,
+                artifact_type=artifact_type,
+                s3_path=s3_path,
+                version_history_id=version_history_id,
+                content_hash=content_hash,
+            )
+            for artifact_type, s3_path in (
+                (ARTIFACT_TYPE_API_MARKDOWN, md_key),
+                (ARTIFACT_TYPE_API_HTML, html_key),
+            )
+        ])
 
         # --------------------------------------------------------------------
-        # 4. Update spec with HTML URL and commit
+        # 3. Update spec with HTML URL + rendered hash and commit
         # --------------------------------------------------------------------
         spec.documentation_html_s3_path = html_url
-        db.commit()
+        spec.last_rendered_schema_hash = content_hash
+        if commit:
+            db.commit()
+
+        # --------------------------------------------------------------------
+        # 4. AI enhancement runs after we return and overwrites the same keys
+        # --------------------------------------------------------------------
+        if AIDocumentationEnhancer().is_enabled():
+            _schedule_enhancement(spec.id)
+        else:
+            logger.info("AI enhancement disabled, using basic markdown")
 
         return md_key
 
 
-async def regenerate_all_docs_for_spec(db: Session, spec: ApiSpec):
+# ============================================================================
+# AI enhancement (background)
+# ============================================================================
+
+# Enhancements run as tasks on the event loop that scheduled them, not in a
+# separate worker, so they are not persisted. One that is cancelled or fails
+# leaves the basic docs up; the next generate_and_store_markdown_for_spec for
+# the spec sees the objects lack ENHANCED_METADATA_KEY and schedules it
+# again. Entry points without a long-lived loop (scripts) must await
+# drain_enhancement_tasks() before their loop closes. Each enhancement is an
+# LLM call, and a bulk regenerate schedules one per spec, so only this many
+# run at once.
+ENHANCEMENT_CONCURRENCY = int(os.getenv("DOCS_ENHANCEMENT_CONCURRENCY", "4"))
+# How long app shutdown waits for pending enhancements before cancelling them.
+ENHANCEMENT_DRAIN_SECONDS = float(os.getenv("DOCS_ENHANCEMENT_DRAIN_SECONDS", "30"))
+
+# Strong references so pending enhancement tasks aren't garbage collected.
+_enhancement_tasks: set[asyncio.Task] = set()
+# asyncio.Semaphore belongs to one event loop, so one per loop.
+_enhancement_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _enhancement_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _enhancement_slots.get(loop)
+    if slots is None:
+        slots = _enhancement_slots[loop] = asyncio.Semaphore(ENHANCEMENT_CONCURRENCY)
+    return slots
+
+
+async def _run_enhancement(spec_id) -> bool:
+    async with _enhancement_semaphore():
+        return await enhance_and_replace(spec_id)
+
+
+def _schedule_enhancement(spec_id) -> asyncio.Task:
+    task = asyncio.create_task(_run_enhancement(spec_id))
+    _enhancement_tasks.add(task)
+    task.add_done_callback(_enhancement_tasks.discard)
+    return task
+
+
+async def drain_enhancement_tasks(timeout: float = None) -> None:
+    """
+    Wait for scheduled AI enhancements to finish. With a timeout, the ones
+    still running after it are cancelled (app shutdown); without one, waits
+    for all of them (scripts, before asyncio.run closes the loop).
+    """
+    if not _enhancement_tasks:
+        return
+    _, pending = await asyncio.wait(set(_enhancement_tasks), timeout=timeout)
+    if pending:
+        logger.warning("Cancelling %d unfinished AI enhancements", len(pending))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+@dataclass
+class _EnhancementJob:
+    spec: ApiSpec
+    provider: Provider
+    product: ApiProduct
+    schema: dict
+    version_label: str
+    md_key: str
+    html_key: str
+    content_hash: str
+    basic_markdown: str
+
+
+def _load_enhancement_job(db: Session, spec_id):
+    """
+    Blocking half of enhance_and_replace (DB reads, basic markdown), run in a
+    worker thread. Returns None if there is nothing to enhance.
+    """
+    spec = db.query(ApiSpec).filter(ApiSpec.id == spec_id).first()
+    if not spec or not spec.parsed_schema:
+        logger.warning("Spec %s gone or empty; skipping AI enhancement", spec_id)
+        return None
+
+    product, tenant, provider, version_history = _load_docs_context(db, spec)
+    if not (product and tenant and provider and version_history):
+        logger.warning("Docs context incomplete for spec %s; skipping AI enhancement", spec_id)
+        return None
+
+    schema_bytes = _schema_bytes(spec)
+    schema = json_utils.load_schema_cached(schema_bytes)
+    version_label = f"v{version_history.version}"
+    md_key, html_key = _docs_keys(spec, tenant, provider, product, version_label)
+
+    return _EnhancementJob(
+        spec=spec,
+        provider=provider,
+        product=product,
+        schema=schema,
+        version_label=version_label,
+        md_key=md_key,
+        html_key=html_key,
+        content_hash=_docs_content_hash(schema_bytes, spec, provider, product),
+        basic_markdown=_markdown_cache.get_or_render(schema_bytes, schema),
+    )
+
+
+async def enhance_and_replace(spec_id) -> bool:
+    """
+    Run the AI enhancement for a spec's current docs and overwrite the basic
+    markdown + HTML uploaded by generate_and_store_markdown_for_spec.
+
+    Opens its own session: this runs after the request that scheduled it has
+    finished. Returns True if enhanced docs were uploaded.
+    """
+    with tracer.start_as_current_span("docs.enhance_and_replace") as span:
+        span.set_attribute("api_spec.id", str(spec_id))
+
+        db = SessionLocal()
+        try:
+            job = await asyncio.to_thread(_load_enhancement_job, db, spec_id)
+            if job is None:
+                return False
+
+            spec_title = job.schema.get("info", {}).get("title", job.spec.name)
+            logger.info("Enhancing documentation with AI for spec %s", spec_id)
+            markdown = await AIDocumentationEnhancer().enhance_markdown(
+                job.basic_markdown, job.schema, api_title=spec_title
+            )
+            if markdown == job.basic_markdown:
+                # Enhancement failed or was skipped; the basic docs are already up.
+                return False
+
+            await _render_and_upload(
+                markdown,
+                schema=job.schema,
+                spec=job.spec,
+                provider=job.provider,
+                product=job.product,
+                version_label=job.version_label,
+                md_key=job.md_key,
+                html_key=job.html_key,
+                content_hash=job.content_hash,
+                enhanced=True,
+            )
+            return True
+        except Exception:
+            logger.exception("AI enhancement failed for spec %s", spec_id)
+            return False
+        finally:
+            await asyncio.to_thread(db.close)
+
+
+async def regenerate_all_docs_for_spec(db: Session, spec: ApiSpec, commit: bool = True):
     """
     Regenerate docs for the current version of a spec *without* creating a new
     VersionHistory row. This is essentially an idempotent re-run of
-    generate_and_store_markdown_for_spec.
+    generate_and_store_markdown_for_spec (commit is passed through to it).
     """
     with tracer.start_as_current_span("docs.regenerate_all") as span:
-        span.set_attribute("spec.id", spec.id)
+        span.set_attribute("spec.id", str(spec.id))
         logger.info("Regenerating documentation for spec_id=%s", spec.id)
 
     # ✅ FIX: Await the async function
-    md_key = await generate_and_store_markdown_for_spec(db, spec)
+    md_key = await generate_and_store_markdown_for_spec(db, spec, commit=commit)
 
-    # Derive html_key from the same version/paths used above
     if md_key is None:
         return None, None
 
-    # To compute html_key, we need version + slugs again
-    product = db.query(ApiProduct).filter(ApiProduct.id == spec.api_product_id).first()
-    if not product:
-        logger.error("ApiProduct not found in regenerate_all_docs_for_spec for spec_id=%s", spec.id)
-        return md_key, None
+    # Same tenant/provider/product/version/slug as md_key, so derive it from
+    # the key instead of loading and slugifying all of that again.
+    return md_key, docs_html_path_for_markdown_path(md_key)
 
-    tenant = db.query(Tenant).filter(Tenant.id == product.tenant_id).first()
-    if not tenant:
-        logger.error("Tenant not found in regenerate_all_docs_for_spec for product_id=%s", product.id)
-        return md_key, None
 
-    version_label = VersionHistoryRepository.current_version_label_for_spec(db, spec.id)
+# ============================================================================
+# Bulk re-render
+# ============================================================================
 
-    # -----------------------------
-    # Compute provider + spec slugs
-    # -----------------------------
-    provider = db.query(Provider).filter(Provider.id == product.provider_id).first()
-    if not provider:
-        logger.error("Provider not found in regenerate_all_docs_for_spec for provider_id=%s", product.provider_id)
-        return md_key, None
+@dataclass
+class _BulkRenderJob:
+    spec: ApiSpec
+    version_history_id: int
+    md_key: str
+    html_key: str
+    content_hash: str
+    page: dict  # page header fields passed to _render_docs
 
-    provider_slug = provider.slug
-    # ✅ FIX: Strip extension to prevent double extensions
-    base_spec_name = spec.name.rsplit('.', 1)[0] if '.' in spec.name else spec.name
-    spec_slug = slugify_filename(base_spec_name)
-    spec_id = spec.id
 
-    # -----------------------------
-    # Build HTML docs S3 path
-    # -----------------------------
-    html_key = build_docs_html_path(
-        tenant_slug=tenant.slug,
-        provider_slug=provider_slug,
-        product_slug=product.slug,
-        version=version_label,
-        spec_id=spec_id,
-        spec_slug=spec_slug,
+def _render_one(parsed_schema, page: dict) -> tuple[bytes, bytes]:
+    """
+    Process-pool worker for regenerate_docs_for_specs. Only plain data
+    crosses the process boundary: the raw parsed_schema and the page header
+    fields.
+    """
+    schema = json_utils.load_schema(parsed_schema)
+    markdown = generate_markdown_from_normalized_spec(schema)
+    return _render_docs(
+        markdown,
+        spec_version=schema.get("info", {}).get("version", "1.0.0"),
+        **page,
     )
 
-    # -----------------------------
-    # Build Markdown docs S3 path
-    # -----------------------------
-    md_key_final = build_docs_markdown_path(
-        tenant_slug=tenant.slug,
-        provider_slug=provider_slug,
-        product_slug=product.slug,
-        version=version_label,
-        spec_id=spec_id,
-        spec_slug=spec_slug,
+
+def _load_docs_contexts(db: Session, spec_ids):
+    """
+    Bulk version of _load_docs_context: one query returning
+    (spec, product, tenant, provider, latest VersionHistory) rows. Specs
+    missing any of those are left out.
+    """
+    latest = (
+        db.query(
+            VersionHistory.api_spec_id.label("api_spec_id"),
+            func.max(VersionHistory.version).label("version"),
+        )
+        .filter(VersionHistory.api_spec_id.in_(spec_ids))
+        .group_by(VersionHistory.api_spec_id)
+        .subquery()
     )
+    return (
+        db.query(ApiSpec, ApiProduct, Tenant, Provider, VersionHistory)
+        .join(ApiProduct, ApiProduct.id == ApiSpec.api_product_id)
+        .join(Tenant, Tenant.id == ApiProduct.tenant_id)
+        .join(Provider, Provider.id == ApiProduct.provider_id)
+        .join(latest, latest.c.api_spec_id == ApiSpec.id)
+        .join(
+            VersionHistory,
+            and_(
+                VersionHistory.api_spec_id == latest.c.api_spec_id,
+                VersionHistory.version == latest.c.version,
+            ),
+        )
+        .filter(ApiSpec.id.in_(spec_ids))
+        .all()
+    )
+
+
+async def regenerate_docs_for_specs(db: Session, spec_ids) -> dict:
+    """
+    Re-render docs for many specs at once, e.g. a tenant-wide refresh after a
+    template change. Always renders (no content-hash short-circuit).
 
-    return md_key_final, html_key
+    Markdown + HTML rendering is CPU-bound, so it is fanned out over a
+    process pool; this process does the S3 uploads and DB writes.
+    Returns {spec_id: md_key} for the specs that were regenerated.
+    """
+    spec_ids = list(spec_ids)
+    with tracer.start_as_current_span("docs.regenerate_many") as span:
+        span.set_attribute("spec.count", len(spec_ids))
+        if not spec_ids:
+            return {}
+
+        jobs = []
+        for spec, product, tenant, provider, version_history in _load_docs_contexts(db, spec_ids):
+            if not spec.parsed_schema or not spec.tenant_id:
+                logger.warning("Skipping bulk docs render for spec %s: no schema or tenant", spec.id)
+                continue
+            version_label = f"v{version_history.version}"
+            md_key, html_key = _docs_keys(spec, tenant, provider, product, version_label)
+            jobs.append(_BulkRenderJob(
+                spec=spec,
+                version_history_id=version_history.id,
+                md_key=md_key,
+                html_key=html_key,
+                content_hash=_docs_content_hash(_schema_bytes(spec), spec, provider, product),
+                page=dict(
+                    title=spec.name,
+                    provider_name=provider.name,
+                    product_name=product.name,
+                    version_label=version_label,
+                ),
+            ))
+
+        if len(jobs) < len(spec_ids):
+            logger.warning("Bulk docs render: %d of %d specs skipped", len(spec_ids) - len(jobs), len(spec_ids))
+        if not jobs:
+            return {}
+
+        _inc_markdown_generations(len(jobs))
+
+        loop = asyncio.get_running_loop()
+        workers = min(os.cpu_count() or 1, len(jobs))
+        # forkserver: this process has live threads (to_thread pool, OTel exporters).
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+        ) as pool:
+            rendered = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _render_one, job.spec.parsed_schema, job.page)
+                    for job in jobs
+                ),
+                return_exceptions=True,
+            )
+
+        done = []
+        for job, bodies in zip(jobs, rendered):
+            if isinstance(bodies, BaseException):
+                logger.error("Bulk docs render failed for spec %s", job.spec.id, exc_info=bodies)
+            else:
+                done.append((job, bodies))
+
+        uploaded = await asyncio.gather(
+            *(
+                _upload_docs(job.md_key, md_bytes, job.html_key, html_bytes, content_hash=job.content_hash)
+                for job, (md_bytes, html_bytes) in done
+            ),
+            return_exceptions=True,
+        )
+
+        repo = DocumentationArtifactRepository()
+        enhance = AIDocumentationEnhancer().is_enabled()
+        results = {}
+        rows = []
+        for (job, _), urls in zip(done, uploaded):
+            spec = job.spec
+            if isinstance(urls, BaseException):
+                logger.error("Bulk docs upload failed for spec %s", spec.id, exc_info=urls)
+                continue
+
+            rows.extend(
+                dict(
+                    tenant_id=spec.tenant_id,
+                    api_spec_id=spec.id,
+                    artifact_type=artifact_type,
+                    s3_path=s3_path,
+                    version_history_id=job.version_history_id,
+                    content_hash=job.content_hash,
+                )
+                for artifact_type, s3_path in (
+                    (ARTIFACT_TYPE_API_MARKDOWN, job.md_key),
+                    (ARTIFACT_TYPE_API_HTML, job.html_key),
+                )
+            )
+            spec.documentation_html_s3_path = urls[1]
+            spec.last_rendered_schema_hash = job.content_hash
+            results[spec.id] = job.md_key
+            if enhance:
+                _schedule_enhancement(spec.id)
+
+        repo.bulk_upsert(db, rows)
+        db.commit()
+        span.set_attribute("spec.regenerated", len(results))
+        return results
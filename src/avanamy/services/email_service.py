@@ -6,10 +6,20 @@ Supports multiple providers (Resend, SMTP) with easy switching.
 
 import logging
 import os
+import random
+import smtplib
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
+from email.utils import formataddr
+from functools import lru_cache
+from html import escape
+from uuid import uuid4
 
+import httpx
 from sqlalchemy.orm import Session
 from avanamy.models.alert_history import AlertHistory
 
@@ -41,6 +51,95 @@ class EmailProvider(ABC):
         pass
 
 
+# Transient provider failures (rate limiting, 5xx, dropped connections,
+# SMTP 4xx replies) are retried with exponential backoff + jitter before an
+# email is given up on and recorded as failed.
+EMAIL_SEND_RETRIES = int(os.getenv("EMAIL_SEND_RETRIES", "3"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "1.0"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "30"))
+_RETRY_JITTER = 0.5
+
+
+class _TransientSendError(Exception):
+    """Raised by a provider's single send attempt when it is worth retrying."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+def _send_with_retry(attempt_send, to: str) -> bool:
+    """
+    Run attempt_send() (returns True/False, or raises _TransientSendError)
+    up to EMAIL_SEND_RETRIES more times. The wait is the server's
+    Retry-After when it gave one, else base * 2**attempt with up to 50%
+    jitter, capped at EMAIL_RETRY_MAX_SECONDS.
+    """
+    for attempt in range(EMAIL_SEND_RETRIES + 1):
+        try:
+            return attempt_send()
+        except _TransientSendError as e:
+            if attempt == EMAIL_SEND_RETRIES:
+                logger.error(
+                    "Failed to send email to %s after %d attempts: %s",
+                    to, attempt + 1, e.__cause__,
+                )
+                return False
+            delay = e.retry_after
+            if delay is None:
+                delay = EMAIL_RETRY_BASE_SECONDS * 2 ** attempt * (1 + random.uniform(0, _RETRY_JITTER))
+            delay = min(delay, EMAIL_RETRY_MAX_SECONDS)
+            logger.warning(
+                "Transient failure sending email to %s (attempt %d of %d), retrying in %.1fs: %s",
+                to, attempt + 1, EMAIL_SEND_RETRIES + 1, delay, e.__cause__,
+            )
+            time.sleep(delay)
+    return False
+
+
+def _retry_after_seconds(headers: Optional[Dict[str, str]]) -> Optional[float]:
+    for name, value in (headers or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return max(float(value), 0.0)
+            except ValueError:  # HTTP-date form; fall back to backoff
+                return None
+    return None
+
+
+class _ResendHTTPClient:
+    """
+    Stand-in for resend's default HTTP client, which goes through
+    requests.request(): a throwaway Session per email, so every send pays a
+    new TCP + TLS handshake to the Resend API. This keeps one pooled,
+    keep-alive httpx.Client (safe to share across threads) for the process.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+
+    def request(self, method, url, headers, json=None, files=None, data=None):
+        try:
+            resp = self._client.request(
+                method,
+                url,
+                headers=headers,
+                json=json if data is None else None,
+                data=data,
+                files=files,
+            )
+            return resp.content, resp.status_code, resp.headers
+        except httpx.HTTPError as e:
+            # resend turns this into a ResendError, as with its own client.
+            raise RuntimeError(f"Request failed: {e}") from e
+
+
+_resend_http_client: Optional[_ResendHTTPClient] = None
+
+
 class ResendProvider(EmailProvider):
     """Resend email provider."""
     
@@ -53,26 +152,64 @@ class ResendProvider(EmailProvider):
             self.resend = resend
         except ImportError:
             raise ImportError("Resend package not installed. Run: poetry add resend")
+
+        global _resend_http_client
+        if _resend_http_client is None:
+            _resend_http_client = _ResendHTTPClient()
+        resend.default_http_client = _resend_http_client
     
     def send(self, to: str, subject: str, html_body: str, from_email: str, from_name: str) -> bool:
-        """Send email via Resend."""
+        """Send email via Resend, retrying transient failures."""
+        params = {
+            "from": f"{from_name} <{from_email}>",
+            "to": [to],
+            "subject": subject,
+            "html": html_body,
+        }
+        # Same key on every attempt, so Resend drops a retry of a request
+        # that did go through before the connection failed.
+        options = {"idempotency_key": uuid4().hex}
+        
+        return _send_with_retry(lambda: self._send_once(params, options, to, subject), to)
+    
+    def _send_once(self, params: dict, options: dict, to: str, subject: str) -> bool:
         try:
-            params = {
-                "from": f"{from_name} <{from_email}>",
-                "to": [to],
-                "subject": subject,
-                "html": html_body,
-            }
-            
-            response = self.resend.Emails.send(params)
-            logger.info(f"Sent email via Resend to {to}: {subject} (id: {response.get('id')})")
+            response = self.resend.Emails.send(params, options)
+            logger.info("Sent email via Resend to %s: %s (id: %s)", to, subject, response.get('id'))
             return True
             
+        except self.resend.exceptions.ResendError as e:
+            code = str(e.code)
+            # Daily/monthly quota errors are 429s too, but won't clear in seconds.
+            if (code == "429" and e.error_type == "rate_limit_exceeded") or code.startswith("5"):
+                # Only newer resend releases attach the response headers.
+                raise _TransientSendError(_retry_after_seconds(getattr(e, "headers", None))) from e
+            logger.error("Failed to send email via Resend to %s: %s", to, e, exc_info=True)
+            return False
+            
         except Exception as e:
-            logger.error(f"Failed to send email via Resend to {to}: {e}", exc_info=True)
+            logger.error("Failed to send email via Resend to %s: %s", to, e, exc_info=True)
             return False
 
 
+# SMTP connections are kept open between emails so a batch of alerts pays the
+# connect + STARTTLS + login handshake once. smtplib.SMTP is not thread-safe,
+# so each thread has its own, shared by every SMTPProvider with the same
+# settings (EmailService instances are short-lived).
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+SMTP_MAX_IDLE_SECONDS = float(os.getenv("SMTP_MAX_IDLE_SECONDS", "60"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+_smtp_local = threading.local()
+
+
+class _SMTPConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
 class SMTPProvider(EmailProvider):
     """SMTP email provider (fallback)."""
     
@@ -83,45 +220,145 @@ class SMTPProvider(EmailProvider):
         self.username = username
         self.password = password
         self.use_tls = use_tls
+        self._key = (host, port, username, use_tls)
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT_SECONDS)
+        if self.use_tls:
+            server.starttls()
+        
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        return server
+    
+    def _connection(self) -> _SMTPConnection:
+        """This thread's open connection for these settings, (re)connecting if needed."""
+        conns = getattr(_smtp_local, "conns", None)
+        if conns is None:
+            conns = _smtp_local.conns = {}
+        
+        conn = conns.get(self._key)
+        if conn is not None and (
+            time.monotonic() - conn.last_used > SMTP_MAX_IDLE_SECONDS
+            or conn.sent >= SMTP_MAX_MESSAGES_PER_CONNECTION
+        ):
+            # Likely timed out server-side, or due for rotation: start over
+            # rather than find out with a failed send.
+            self._drop_connection()
+            conn = None
+        
+        if conn is None:
+            conn = conns[self._key] = _SMTPConnection(self._connect())
+        return conn
+    
+    def _drop_connection(self):
+        conns = getattr(_smtp_local, "conns", {})
+        conn = conns.pop(self._key, None)
+        if conn is not None:
+            try:
+                conn.server.quit()
+            except OSError:  # includes SMTPException
+                conn.server.close()
     
     def send(self, to: str, subject: str, html_body: str, from_email: str, from_name: str) -> bool:
-        """Send email via SMTP."""
+        """Send email via SMTP, retrying transient failures."""
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = _smtp_from_header(from_name, from_email)
+        msg['To'] = to
+        
+        # Add HTML body
+        msg.attach(MIMEText(html_body, 'html'))
+        
+        return _send_with_retry(lambda: self._send_once(msg, to, subject), to)
+    
+    def _send_once(self, msg, to: str, subject: str) -> bool:
         try:
-            import smtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{from_name} <{from_email}>"
-            msg['To'] = to
-            
-            # Add HTML body
-            msg.attach(MIMEText(html_body, 'html'))
+            # Send on the kept-alive connection; reconnect once if the server
+            # closed it anyway.
+            conn = self._connection()
+            try:
+                conn.server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._drop_connection()
+                conn = self._connection()
+                conn.server.send_message(msg)
+            conn.sent += 1
+            conn.last_used = time.monotonic()
             
-            # Connect and send
-            with smtplib.SMTP(self.host, self.port) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                if self.username and self.password:
-                    server.login(self.username, self.password)
-                
-                server.send_message(msg)
-            
-            logger.info(f"Sent email via SMTP to {to}: {subject}")
+            logger.info("Sent email via SMTP to %s: %s", to, subject)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email via SMTP to {to}: {e}", exc_info=True)
+            self._drop_connection()
+            if _smtp_error_is_transient(e):
+                raise _TransientSendError() from e
+            logger.error("Failed to send email via SMTP to %s: %s", to, e, exc_info=True)
             return False
 
 
+@lru_cache(maxsize=8)
+def _smtp_from_header(from_name: str, from_email: str) -> str:
+    """
+    From header for the configured sender: display names with commas or
+    quotes get quoted and non-ASCII ones RFC 2047-encoded, rather than
+    being pasted in raw. The sender is fixed per process, so do it once.
+    """
+    return formataddr((from_name, from_email))
+
+
+def _smtp_error_is_transient(e: Exception) -> bool:
+    """4xx replies (greylisting, mailbox busy, 421 closing) and network errors."""
+    if isinstance(e, smtplib.SMTPResponseException):
+        return 400 <= e.smtp_code < 500
+    if isinstance(e, smtplib.SMTPServerDisconnected):
+        return True
+    # Other SMTPExceptions (refused recipients, ...) are permanent; plain
+    # OSErrors are socket timeouts, resets and DNS failures.
+    return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+
+
 # ============================================================================
 # Email Service
 # ============================================================================
 
+# Outbound email is throttled process-wide to the provider's send quota
+# (Resend rejects bursts above the account's requests/second), and alerts to
+# several destinations are sent concurrently on a small pool so their
+# round trips overlap. 0 disables the throttle.
+EMAIL_MAX_SENDS_PER_SECOND = float(os.getenv("EMAIL_MAX_SENDS_PER_SECOND", "10"))
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "8"))
+
+
+class _SendRateLimiter:
+    """Spaces sends at least 1/rate seconds apart, across threads."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_send_limiter = _SendRateLimiter(EMAIL_MAX_SENDS_PER_SECOND)
+_send_pool = ThreadPoolExecutor(
+    max_workers=EMAIL_SEND_CONCURRENCY, thread_name_prefix="email-send"
+)
+
+
 class EmailService:
     """
     Email service for sending notifications.
@@ -143,25 +380,47 @@ class EmailService:
     """
     
     def __init__(self):
-        """Initialize email service with configured provider."""
+        """Initialize email service; the provider is created on first use."""
         self.from_email = os.getenv("EMAIL_FROM", "alerts@avanamy.com")
         self.from_name = os.getenv("EMAIL_FROM_NAME", "Avanamy Alerts")
         self.frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
         
-        # Initialize provider based on EMAIL_PROVIDER
+        # Most instances (one per polling run) never send anything, so don't
+        # pay for the provider - for Resend, importing its SDK - up front.
+        self._provider: Optional[EmailProvider] = None
+        self._provider_ready = False
+        self._provider_lock = threading.Lock()
+    
+    @property
+    def provider(self) -> Optional[EmailProvider]:
+        if not self._provider_ready:
+            with self._provider_lock:
+                if not self._provider_ready:
+                    self._provider = self._create_provider()
+                    self._provider_ready = True
+        return self._provider
+    
+    @provider.setter
+    def provider(self, provider: Optional[EmailProvider]):
+        self._provider = provider
+        self._provider_ready = True
+    
+    @staticmethod
+    def _create_provider() -> Optional[EmailProvider]:
+        """Build the provider selected by EMAIL_PROVIDER (None if unusable)."""
         provider_type = os.getenv("EMAIL_PROVIDER", "resend").lower()
         
         if provider_type == "resend":
             api_key = os.getenv("RESEND_API_KEY")
             if not api_key:
                 logger.warning("RESEND_API_KEY not set, emails will not be sent!")
-                self.provider = None
-            else:
-                self.provider = ResendProvider(api_key)
-                logger.info("Email service initialized with Resend provider")
+                return None
+            provider = ResendProvider(api_key)
+            logger.info("Email service initialized with Resend provider")
+            return provider
         
         elif provider_type == "smtp":
-            self.provider = SMTPProvider(
+            provider = SMTPProvider(
                 host=os.getenv("SMTP_HOST", "localhost"),
                 port=int(os.getenv("SMTP_PORT", "587")),
                 username=os.getenv("SMTP_USERNAME", ""),
@@ -169,10 +428,11 @@ class EmailService:
                 use_tls=os.getenv("SMTP_USE_TLS", "true").lower() == "true"
             )
             logger.info("Email service initialized with SMTP provider")
+            return provider
         
         else:
-            logger.error(f"Unknown EMAIL_PROVIDER: {provider_type}")
-            self.provider = None
+            logger.error("Unknown EMAIL_PROVIDER: %s", provider_type)
+            return None
     
     def send_breaking_change_alert(
         self,
@@ -180,7 +440,8 @@ class EmailService:
         alert_config: Any,  # AlertConfiguration
         watched_api: Any,   # WatchedAPI
         version: Any,       # VersionHistory
-        breaking_changes_count: int
+        breaking_changes_count: int,
+        commit: bool = True
     ) -> bool:
         """
         Send alert for breaking changes detected.
@@ -191,16 +452,42 @@ class EmailService:
             watched_api: The watched API that changed
             version: The new version with changes
             breaking_changes_count: Number of breaking changes
+            commit: Commit the alert history row now. Pass False when
+                sending to several configs and commit once afterwards.
             
         Returns:
             True if sent successfully
         """
-        subject = f"🚨 Breaking Changes Detected - {watched_api.api_spec.name}"
-        
+        return self.send_breaking_change_alerts(
+            db,
+            [alert_config],
+            watched_api,
+            version,
+            breaking_changes_count,
+            commit=commit,
+        ) == 1
+
+    def send_breaking_change_alerts(
+        self,
+        db: Session,
+        alert_configs: list,
+        watched_api: Any,
+        version: Any,
+        breaking_changes_count: int,
+        commit: bool = True
+    ) -> int:
+        """
+        send_breaking_change_alert for several alert configurations: the
+        email is rendered once and sent to every destination concurrently.
+
+        Returns:
+            Number of alerts sent successfully
+        """
         # Get product and provider info
         product = watched_api.api_product
         provider = product.provider if product else None
         
+        spec_url, diff_url = self._spec_urls(watched_api.api_spec_id, version.version)
         body = self._get_breaking_change_template(
             api_name=watched_api.api_spec.name,
             provider_name=provider.name if provider else "Unknown",
@@ -208,21 +495,16 @@ class EmailService:
             version=version.version,
             breaking_changes_count=breaking_changes_count,
             summary=version.summary,
-            spec_url=f"{self.frontend_url}/specs/{watched_api.api_spec_id}",
-            diff_url=f"{self.frontend_url}/specs/{watched_api.api_spec_id}/versions/{version.version}/diff"
+            spec_url=spec_url,
+            diff_url=diff_url
         )
         
-        success = self._send_email(
-            to=alert_config.destination,
-            subject=subject,
-            html_body=body
-        )
-        
-        # Record in alert history
-        self._record_history(
-            db=db,
-            alert_config=alert_config,
-            watched_api=watched_api,
+        return self._send_alerts(
+            db,
+            alert_configs,
+            watched_api,
+            subject=f"🚨 Breaking Changes Detected - {watched_api.api_spec.name}",
+            html_body=body,
             version_history_id=version.id,
             alert_reason="breaking_change",
             severity="critical",
@@ -232,45 +514,51 @@ class EmailService:
                 "breaking_changes_count": breaking_changes_count,
                 "summary": version.summary
             },
-            status="sent" if success else "failed",
-            error_message=None if success else "Failed to send email"
+            commit=commit,
         )
-        
-        return success
     
     def send_non_breaking_change_alert(
         self,
         db: Session,
         alert_config: Any,
         watched_api: Any,
-        version: Any
+        version: Any,
+        commit: bool = True
     ) -> bool:
-        """Send alert for non-breaking changes."""
-        subject = f"ℹ️ API Changes Detected - {watched_api.api_spec.name}"
-        
+        """Send alert for non-breaking changes (see send_breaking_change_alert for commit)."""
+        return self.send_non_breaking_change_alerts(
+            db, [alert_config], watched_api, version, commit=commit
+        ) == 1
+
+    def send_non_breaking_change_alerts(
+        self,
+        db: Session,
+        alert_configs: list,
+        watched_api: Any,
+        version: Any,
+        commit: bool = True
+    ) -> int:
+        """Non-breaking counterpart of send_breaking_change_alerts."""
         product = watched_api.api_product
         provider = product.provider if product else None
         
+        spec_url, diff_url = self._spec_urls(watched_api.api_spec_id, version.version)
         body = self._get_non_breaking_change_template(
             api_name=watched_api.api_spec.name,
             provider_name=provider.name if provider else "Unknown",
             product_name=product.name if product else "Unknown",
             version=version.version,
             summary=version.summary,
-            spec_url=f"{self.frontend_url}/specs/{watched_api.api_spec_id}",
-            diff_url=f"{self.frontend_url}/specs/{watched_api.api_spec_id}/versions/{version.version}/diff"
-        )
-        
-        success = self._send_email(
-            to=alert_config.destination,
-            subject=subject,
-            html_body=body
+            spec_url=spec_url,
+            diff_url=diff_url
         )
         
-        self._record_history(
-            db=db,
-            alert_config=alert_config,
-            watched_api=watched_api,
+        return self._send_alerts(
+            db,
+            alert_configs,
+            watched_api,
+            subject=f"ℹ️ API Changes Detected - {watched_api.api_spec.name}",
+            html_body=body,
             version_history_id=version.id,
             alert_reason="non_breaking_change",
             severity="info",
@@ -279,11 +567,8 @@ class EmailService:
                 "version": version.version,
                 "summary": version.summary
             },
-            status="sent" if success else "failed",
-            error_message=None if success else "Failed to send email"
+            commit=commit,
         )
-        
-        return success
     
     def send_invitation_email(
         self,
@@ -322,6 +607,11 @@ class EmailService:
             html_body=body
         )
     
+    def _spec_urls(self, spec_id: Any, version: int) -> tuple[str, str]:
+        """Frontend (spec dashboard, version diff) URLs linked from alerts."""
+        spec_url = f"{self.frontend_url}/specs/{spec_id}"
+        return spec_url, f"{spec_url}/versions/{version}/diff"
+    
     def _send_email(self, to: str, subject: str, html_body: str) -> bool:
         """
         Send an email using configured provider.
@@ -335,9 +625,10 @@ class EmailService:
             True if sent successfully
         """
         if not self.provider:
-            logger.warning(f"Email provider not configured, skipping email to {to}")
+            logger.warning("Email provider not configured, skipping email to %s", to)
             return False
         
+        _send_limiter.wait()
         return self.provider.send(
             to=to,
             subject=subject,
@@ -346,6 +637,56 @@ class EmailService:
             from_name=self.from_name
         )
     
+    def _send_alerts(
+        self,
+        db: Session,
+        alert_configs: list,
+        watched_api: Any,
+        *,
+        subject: str,
+        html_body: str,
+        version_history_id: Optional[int],
+        alert_reason: str,
+        severity: str,
+        payload: Dict[str, Any],
+        commit: bool
+    ) -> int:
+        """
+        Email the same alert to each config's destination, then record one
+        alert history row per config. Several destinations are sent to
+        concurrently on _send_pool; history is written from this thread
+        since the Session is not thread-safe.
+        """
+        configs = list(alert_configs)
+
+        def send(config) -> bool:
+            return self._send_email(
+                to=config.destination,
+                subject=subject,
+                html_body=html_body
+            )
+
+        if len(configs) > 1:
+            results = list(_send_pool.map(send, configs))
+        else:
+            results = [send(config) for config in configs]
+
+        for config, success in zip(configs, results):
+            self._record_history(
+                db=db,
+                alert_config=config,
+                watched_api=watched_api,
+                version_history_id=version_history_id,
+                alert_reason=alert_reason,
+                severity=severity,
+                payload=payload,
+                status="sent" if success else "failed",
+                error_message=None if success else "Failed to send email",
+                commit=commit
+            )
+
+        return sum(results)
+
     def _record_history(
         self,
         db: Session,
@@ -358,9 +699,10 @@ class EmailService:
         status: str,
         error_message: Optional[str],
         endpoint_path: Optional[str] = None,
-        http_method: Optional[str] = None
+        http_method: Optional[str] = None,
+        commit: bool = True
     ):
-        """Record alert in alert_history table."""
+        """Record alert in alert_history table (left pending in db if not commit)."""
         try:
             history = AlertHistory(
                 tenant_id=watched_api.tenant_id,
@@ -378,55 +720,80 @@ class EmailService:
             )
             
             db.add(history)
-            db.commit()
+            if commit:
+                db.commit()
             
-            logger.debug(f"Recorded alert history: {alert_reason}")
+            logger.debug("Recorded alert history: %s", alert_reason)
             
         except Exception as e:
-            logger.error(f"Failed to record alert history: {e}", exc_info=True)
-            db.rollback()
+            logger.error("Failed to record alert history: %s", e, exc_info=True)
+            # With a deferred commit, a rollback here would also throw away
+            # the rows already pending from the batch's other alerts; leave
+            # that to the caller's single commit/rollback.
+            if commit:
+                db.rollback()
     
     # ========================================================================
     # Email Templates
     # ========================================================================
     
-    def _get_breaking_change_template(
+    def _render_email(
         self,
-        api_name: str,
-        provider_name: str,
-        product_name: str,
-        version: int,
-        breaking_changes_count: int,
-        summary: Optional[str],
-        spec_url: str,
-        diff_url: str
+        *,
+        title: str,
+        gradient: str,
+        emoji: str,
+        subtitle: str,
+        content: str,
+        footer: str,
+        heading: Optional[str] = None
     ) -> str:
-        """Get HTML template for breaking change alert."""
+        """
+        Page chrome shared by every email: banner (gradient, emoji, heading,
+        subtitle), content card and footer. content and footer are inner
+        HTML; anything user-supplied in them must already be escaped.
+        """
         return f"""
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Breaking Changes Detected</title>
+    <title>{title}</title>
 </head>
 <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #334155; background-color: #f8fafc; margin: 0; padding: 0;">
     <div style="max-width: 600px; margin: 40px auto; background-color: #ffffff; border-radius: 8px; box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);">
         <!-- Header -->
-        <div style="background: linear-gradient(135deg, #dc2626 0%, #991b1b 100%); color: white; padding: 32px; border-radius: 8px 8px 0 0;">
-            <div style="font-size: 40px; margin-bottom: 8px;">🚨</div>
-            <h1 style="margin: 0; font-size: 24px; font-weight: 600;">Breaking Changes Detected</h1>
-            <p style="margin: 8px 0 0 0; opacity: 0.9; font-size: 14px;">{api_name}</p>
+        <div style="background: linear-gradient(135deg, {gradient}); color: white; padding: 32px; border-radius: 8px 8px 0 0;">
+            <div style="font-size: 40px; margin-bottom: 8px;">{emoji}</div>
+            <h1 style="margin: 0; font-size: 24px; font-weight: 600;">{heading or title}</h1>
+            <p style="margin: 8px 0 0 0; opacity: 0.9; font-size: 14px;">{subtitle}</p>
         </div>
         
         <!-- Content -->
         <div style="padding: 32px;">
-            <div style="background-color: #fef2f2; border-left: 4px solid #dc2626; padding: 16px; border-radius: 4px; margin-bottom: 24px;">
-                <p style="margin: 0; font-weight: 500; color: #991b1b;">
-                    <strong>{breaking_changes_count}</strong> breaking change{'' if breaking_changes_count == 1 else 's'} detected in <strong>version {version}</strong>
-                </p>
-            </div>
-            
+{content}
+        </div>
+        
+        <!-- Footer -->
+        <div style="background-color: #f8fafc; padding: 24px 32px; border-radius: 0 0 8px 8px; border-top: 1px solid #e2e8f0;">
+{footer}
+        </div>
+    </div>
+</body>
+</html>
+        """
+    
+    def _alert_details(
+        self,
+        api_name: str,
+        provider_name: str,
+        product_name: str,
+        version: int,
+        summary: Optional[str]
+    ) -> str:
+        """API details table and optional summary for the change alerts."""
+        return f"""\
             <div style="margin-bottom: 24px;">
                 <h2 style="font-size: 16px; font-weight: 600; color: #1e293b; margin: 0 0 12px 0;">API Details</h2>
                 <table style="width: 100%; border-collapse: collapse;">
@@ -454,7 +821,42 @@ class EmailService:
                 <h2 style="font-size: 16px; font-weight: 600; color: #1e293b; margin: 0 0 12px 0;">Summary</h2>
                 <p style="margin: 0; color: #475569; font-size: 14px;">{summary}</p>
             </div>
-            ''' if summary else ''}
+            ''' if summary else ''}"""
+    
+    def _alert_footer(self) -> str:
+        return f"""\
+            <p style="margin: 0; font-size: 12px; color: #64748b;">
+                You're receiving this because you configured alerts for this API.
+                <br>
+                Manage your notification settings in <a href="{self.frontend_url}/settings" style="color: #7c3aed; text-decoration: none;">Settings</a>.
+            </p>"""
+    
+    def _get_breaking_change_template(
+        self,
+        api_name: str,
+        provider_name: str,
+        product_name: str,
+        version: int,
+        breaking_changes_count: int,
+        summary: Optional[str],
+        spec_url: str,
+        diff_url: str
+    ) -> str:
+        """Get HTML template for breaking change alert."""
+        # Names and the AI summary come from specs / users: escape them.
+        api_name = escape(api_name)
+        provider_name = escape(provider_name)
+        product_name = escape(product_name)
+        summary = escape(summary) if summary else summary
+        details = self._alert_details(api_name, provider_name, product_name, version, summary)
+        content = f"""\
+            <div style="background-color: #fef2f2; border-left: 4px solid #dc2626; padding: 16px; border-radius: 4px; margin-bottom: 24px;">
+                <p style="margin: 0; font-weight: 500; color: #991b1b;">
+                    <strong>{breaking_changes_count}</strong> breaking change{'' if breaking_changes_count == 1 else 's'} detected in <strong>version {version}</strong>
+                </p>
+            </div>
+            
+{details}
             
             <div style="margin-bottom: 24px;">
                 <a href="{diff_url}" style="display: inline-block; background-color: #7c3aed; color: white; text-decoration: none; padding: 12px 24px; border-radius: 6px; font-weight: 500; font-size: 14px;">
@@ -466,21 +868,15 @@ class EmailService:
                 <p style="margin: 0; font-size: 13px; color: #64748b;">
                     Need help? Check your <a href="{spec_url}" style="color: #7c3aed; text-decoration: none;">API dashboard</a> or view impact analysis to see which code will break.
                 </p>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <div style="background-color: #f8fafc; padding: 24px 32px; border-radius: 0 0 8px 8px; border-top: 1px solid #e2e8f0;">
-            <p style="margin: 0; font-size: 12px; color: #64748b;">
-                You're receiving this because you configured alerts for this API.
-                <br>
-                Manage your notification settings in <a href="{self.frontend_url}/settings" style="color: #7c3aed; text-decoration: none;">Settings</a>.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-        """
+            </div>"""
+        return self._render_email(
+            title="Breaking Changes Detected",
+            gradient="#dc2626 0%, #991b1b 100%",
+            emoji="🚨",
+            subtitle=api_name,
+            content=content,
+            footer=self._alert_footer()
+        )
     
     def _get_non_breaking_change_template(
         self,
@@ -493,59 +889,20 @@ class EmailService:
         diff_url: str
     ) -> str:
         """Get HTML template for non-breaking change alert."""
-        return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>API Changes Detected</title>
-</head>
-<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #334155; background-color: #f8fafc; margin: 0; padding: 0;">
-    <div style="max-width: 600px; margin: 40px auto; background-color: #ffffff; border-radius: 8px; box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);">
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%); color: white; padding: 32px; border-radius: 8px 8px 0 0;">
-            <div style="font-size: 40px; margin-bottom: 8px;">ℹ️</div>
-            <h1 style="margin: 0; font-size: 24px; font-weight: 600;">API Changes Detected</h1>
-            <p style="margin: 8px 0 0 0; opacity: 0.9; font-size: 14px;">{api_name}</p>
-        </div>
-        
-        <!-- Content -->
-        <div style="padding: 32px;">
+        # Names and the AI summary come from specs / users: escape them.
+        api_name = escape(api_name)
+        provider_name = escape(provider_name)
+        product_name = escape(product_name)
+        summary = escape(summary) if summary else summary
+        details = self._alert_details(api_name, provider_name, product_name, version, summary)
+        content = f"""\
             <div style="background-color: #f0f9ff; border-left: 4px solid #0ea5e9; padding: 16px; border-radius: 4px; margin-bottom: 24px;">
                 <p style="margin: 0; font-weight: 500; color: #075985;">
                     Non-breaking changes detected in <strong>version {version}</strong>
                 </p>
             </div>
             
-            <div style="margin-bottom: 24px;">
-                <h2 style="font-size: 16px; font-weight: 600; color: #1e293b; margin: 0 0 12px 0;">API Details</h2>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr style="border-bottom: 1px solid #e2e8f0;">
-                        <td style="padding: 8px 0; color: #64748b; font-size: 14px;">Provider</td>
-                        <td style="padding: 8px 0; font-weight: 500; font-size: 14px;">{provider_name}</td>
-                    </tr>
-                    <tr style="border-bottom: 1px solid #e2e8f0;">
-                        <td style="padding: 8px 0; color: #64748b; font-size: 14px;">Product</td>
-                        <td style="padding: 8px 0; font-weight: 500; font-size: 14px;">{product_name}</td>
-                    </tr>
-                    <tr style="border-bottom: 1px solid #e2e8f0;">
-                        <td style="padding: 8px 0; color: #64748b; font-size: 14px;">API</td>
-                        <td style="padding: 8px 0; font-weight: 500; font-size: 14px;">{api_name}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 8px 0; color: #64748b; font-size: 14px;">Version</td>
-                        <td style="padding: 8px 0; font-weight: 500; font-size: 14px;">v{version}</td>
-                    </tr>
-                </table>
-            </div>
-            
-            {f'''
-            <div style="margin-bottom: 24px;">
-                <h2 style="font-size: 16px; font-weight: 600; color: #1e293b; margin: 0 0 12px 0;">Summary</h2>
-                <p style="margin: 0; color: #475569; font-size: 14px;">{summary}</p>
-            </div>
-            ''' if summary else ''}
+{details}
             
             <div style="margin-bottom: 24px;">
                 <a href="{diff_url}" style="display: inline-block; background-color: #7c3aed; color: white; text-decoration: none; padding: 12px 24px; border-radius: 6px; font-weight: 500; font-size: 14px;">
@@ -557,21 +914,15 @@ class EmailService:
                 <p style="margin: 0; font-size: 13px; color: #64748b;">
                     These changes should not affect your existing code. Review the <a href="{diff_url}" style="color: #7c3aed; text-decoration: none;">detailed diff</a> to see what's new.
                 </p>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <div style="background-color: #f8fafc; padding: 24px 32px; border-radius: 0 0 8px 8px; border-top: 1px solid #e2e8f0;">
-            <p style="margin: 0; font-size: 12px; color: #64748b;">
-                You're receiving this because you configured alerts for this API.
-                <br>
-                Manage your notification settings in <a href="{self.frontend_url}/settings" style="color: #7c3aed; text-decoration: none;">Settings</a>.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-        """
+            </div>"""
+        return self._render_email(
+            title="API Changes Detected",
+            gradient="#0ea5e9 0%, #0284c7 100%",
+            emoji="ℹ️",
+            subtitle=api_name,
+            content=content,
+            footer=self._alert_footer()
+        )
     
     def _get_invitation_template(
         self,
@@ -581,25 +932,9 @@ class EmailService:
         decline_url: str
     ) -> str:
         """Get HTML template for organization invitation."""
-        return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Organization Invitation</title>
-</head>
-<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #334155; background-color: #f8fafc; margin: 0; padding: 0;">
-    <div style="max-width: 600px; margin: 40px auto; background-color: #ffffff; border-radius: 8px; box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);">
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #7c3aed 0%, #6d28d9 100%); color: white; padding: 32px; border-radius: 8px 8px 0 0;">
-            <div style="font-size: 40px; margin-bottom: 8px;">👋</div>
-            <h1 style="margin: 0; font-size: 24px; font-weight: 600;">You've been invited!</h1>
-            <p style="margin: 8px 0 0 0; opacity: 0.9; font-size: 14px;">Join {organization_name} on Avanamy</p>
-        </div>
-        
-        <!-- Content -->
-        <div style="padding: 32px;">
+        inviter_name = escape(inviter_name)
+        organization_name = escape(organization_name)
+        content = f"""\
             <p style="margin: 0 0 16px 0; font-size: 16px; color: #1e293b;">
                 <strong>{inviter_name}</strong> has invited you to join <strong>{organization_name}</strong> on Avanamy.
             </p>
@@ -621,16 +956,17 @@ class EmailService:
                 <p style="margin: 0; font-size: 13px; color: #64748b;">
                     This invitation will expire in 7 days. If you don't want to join this organization, you can safely ignore this email.
                 </p>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <div style="background-color: #f8fafc; padding: 24px 32px; border-radius: 0 0 8px 8px; border-top: 1px solid #e2e8f0;">
+            </div>"""
+        footer = f"""\
             <p style="margin: 0; font-size: 12px; color: #64748b;">
                 If you have questions, visit <a href="{self.frontend_url}/help" style="color: #7c3aed; text-decoration: none;">Avanamy Help Center</a>.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-        """
+            </p>"""
+        return self._render_email(
+            title="Organization Invitation",
+            heading="You've been invited!",
+            gradient="#7c3aed 0%, #6d28d9 100%",
+            emoji="👋",
+            subtitle=f"Join {organization_name} on Avanamy",
+            content=content,
+            footer=footer
+        )
@@ -59,7 +59,7 @@ class EncryptionService:
             decrypted_bytes = self.cipher.decrypt(encrypted.encode())
             return decrypted_bytes.decode()
         except Exception as e:
-            logger.error(f"Failed to decrypt: {e}")
+            logger.error("Failed to decrypt: %s", e)
             raise ValueError("Failed to decrypt data")
 
 
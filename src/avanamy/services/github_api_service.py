@@ -44,7 +44,10 @@ class GitHubAPIService:
         """
         with tracer.start_as_current_span("github.list_repositories"):
             try:
-                from avanamy.services.github_app_service import GitHubAppService
+                from avanamy.services.github_app_service import (
+                    GitHubAppService,
+                    github_http_client,
+                )
                 
                 # Get installation token
                 app_service = GitHubAppService()
@@ -58,27 +61,26 @@ class GitHubAPIService:
                     "Accept": "application/vnd.github.v3+json"
                 }
                 
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(url, headers=headers)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    repos = data.get("repositories", [])
-                    
-                    result = []
-                    for repo in repos:
-                        result.append({
-                            "name": repo["name"],
-                            "full_name": repo["full_name"],
-                            "clone_url": repo["clone_url"],
-                            "default_branch": repo.get("default_branch", "main"),
-                            "private": repo["private"],
-                        })
-                    
-                    logger.info(f"Listed {len(result)} installation repositories")
-                    return result
-                    
+                client = github_http_client()
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                
+                data = response.json()
+                repos = data.get("repositories", [])
+                
+                result = []
+                for repo in repos:
+                    result.append({
+                        "name": repo["name"],
+                        "full_name": repo["full_name"],
+                        "clone_url": repo["clone_url"],
+                        "default_branch": repo.get("default_branch", "main"),
+                        "private": repo["private"],
+                    })
+                
+                logger.info("Listed %s installation repositories", len(result))
+                return result
+                
             except Exception as e:
                 logger.exception("Failed to list repositories")
                 raise ValueError(f"Failed to list repositories: {e}")
@@ -108,7 +110,7 @@ class GitHubAPIService:
                 else:
                     auth_url = repo_url
                 
-                logger.info(f"Cloning repository to {target_dir}")
+                logger.info("Cloning repository to %s", target_dir)
                 
                 # Clone the repository
                 repo = Repo.clone_from(auth_url, target_dir, depth=1)
@@ -116,7 +118,7 @@ class GitHubAPIService:
                 # Get current commit SHA
                 commit_sha = repo.head.commit.hexsha
                 
-                logger.info(f"Successfully cloned repository, commit: {commit_sha}")
+                logger.info("Successfully cloned repository, commit: %s", commit_sha)
                 span.set_attribute("commit_sha", commit_sha)
                 
                 return target_dir, commit_sha
@@ -141,12 +143,9 @@ class GitHubAPIService:
                 repo = self.github.get_repo(repo_full_name)
                 # Try to get repo info to verify access
                 _ = repo.name
-                logger.info(f"Verified access to {repo_full_name}")
+                logger.info("Verified access to %s", repo_full_name)
                 return True
                 
             except GithubException as e:
-                logger.warning(f"No access to {repo_full_name}: {e}")
+                logger.warning("No access to %s: %s", repo_full_name, e)
                 return False
-            
-
-print("github_api_service loaded, globals:", list(globals().keys()))
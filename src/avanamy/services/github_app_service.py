@@ -6,14 +6,80 @@ GitHub App service for installation-based authentication.
 
 import os
 import time
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import httpx
 import jwt
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from opentelemetry import trace
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# One pooled client for every GitHub call (OAuth exchange, installation
+# tokens, API requests) so they reuse keep-alive connections instead of
+# paying a TCP+TLS handshake each. Closed on app shutdown.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def github_http_client() -> httpx.AsyncClient:
+    """Shared AsyncClient for GitHub requests, created on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http_client
+
+
+# GitHub App JWTs are valid for 10 minutes and installation tokens for an
+# hour; reuse them until shortly before they expire rather than minting new
+# ones per call (minting an installation token is a round-trip and counts
+# against the rate limit). Module level, since callers build a new
+# GitHubAppService per request.
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+_app_jwts: Dict[str, Tuple[str, float]] = {}
+_installation_tokens: Dict[Tuple[str, int], Tuple[str, float]] = {}
+_installation_token_locks: Dict[Tuple[str, int], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+# /user lookups keyed by a SHA-256 of the access token (raw tokens are never
+# kept), so repeat lookups for one token within the TTL skip GitHub, and
+# concurrent ones share a single request.
+USER_INFO_TTL_SECONDS = 300
+_USER_INFO_CACHE_SIZE = 1024
+_user_info_cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+_user_info_inflight: Dict[bytes, asyncio.Future] = {}
+
+
+def _still_fresh(cached: Optional[Tuple[str, float]]) -> bool:
+    return cached is not None and cached[1] - time.time() > TOKEN_REFRESH_MARGIN_SECONDS
+
+
+@lru_cache(maxsize=4)
+def _load_private_key(path: str):
+    """
+    Read and parse the App's PEM key once per process. Handing jwt.encode
+    the key object skips re-parsing (and validating) the RSA key on every
+    signature, which costs tens of milliseconds each time.
+    """
+    with open(path, 'rb') as f:
+        return load_pem_private_key(f.read(), password=None)
+
+
+async def close_github_http_client() -> None:
+    """Close the shared client, if one was opened."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class GitHubAppService:
     """
@@ -32,16 +98,20 @@ class GitHubAppService:
             raise ValueError("GitHub App credentials not fully configured")
         
         # Load private key
-        with open(self.private_key_path, 'r') as f:
-            self.private_key = f.read()
+        self.private_key = _load_private_key(self.private_key_path)
     
     def generate_jwt(self) -> str:
         """
         Generate JWT for GitHub App authentication.
+        The last one is reused until it is about to expire.
         
         Returns:
             JWT token
         """
+        cached = _app_jwts.get(self.app_id)
+        if _still_fresh(cached):
+            return cached[0]
+        
         now = int(time.time())
         payload = {
             'iat': now,
@@ -50,6 +120,7 @@ class GitHubAppService:
         }
         
         token = jwt.encode(payload, self.private_key, algorithm='RS256')
+        _app_jwts[self.app_id] = (token, payload['exp'])
         return token
     
     def get_installation_url(self, state: str) -> str:
@@ -94,37 +165,37 @@ class GitHubAppService:
             
             headers = {"Accept": "application/json"}
             
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.post(url, data=data, headers=headers)
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    
-                    if "access_token" not in result:
-                        error = result.get("error_description", "Unknown error")
-                        logger.error(f"GitHub token exchange failed: {error}")
-                        raise ValueError(f"Token exchange failed: {error}")
-                    
-                    access_token = result["access_token"]
-                    
-                    # Get installation ID for this token
-                    installation_id = await self._get_installation_id(access_token)
-                    
-                    logger.info(f"Successfully exchanged code, installation_id: {installation_id}")
-                    span.set_attribute("success", True)
-                    span.set_attribute("installation_id", installation_id)
-                    
-                    return {
-                        "access_token": access_token,
-                        "installation_id": installation_id
-                    }
-                    
-                except httpx.HTTPError as e:
-                    logger.exception("HTTP error during token exchange")
-                    span.set_attribute("error", str(e))
-                    raise ValueError(f"Failed to exchange code for token: {e}")
-    
+            client = github_http_client()
+            try:
+                response = await client.post(url, data=data, headers=headers)
+                response.raise_for_status()
+                
+                result = response.json()
+                
+                if "access_token" not in result:
+                    error = result.get("error_description", "Unknown error")
+                    logger.error("GitHub token exchange failed: %s", error)
+                    raise ValueError(f"Token exchange failed: {error}")
+                
+                access_token = result["access_token"]
+                
+                # Get installation ID for this token
+                installation_id = await self._get_installation_id(access_token)
+                
+                logger.info("Successfully exchanged code, installation_id: %s", installation_id)
+                span.set_attribute("success", True)
+                span.set_attribute("installation_id", installation_id)
+                
+                return {
+                    "access_token": access_token,
+                    "installation_id": installation_id
+                }
+                
+            except httpx.HTTPError as e:
+                logger.exception("HTTP error during token exchange")
+                span.set_attribute("error", str(e))
+                raise ValueError(f"Failed to exchange code for token: {e}")
+
     async def _get_installation_id(self, user_token: str) -> int:
         """
         Get installation ID from user token.
@@ -142,22 +213,24 @@ class GitHubAppService:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
-            installations = data.get("installations", [])
-            
-            if not installations:
-                raise ValueError("No GitHub App installations found")
-            
-            # Return first installation (most users have one)
-            return installations[0]["id"]
-    
+        client = github_http_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        
+        data = response.json()
+        installations = data.get("installations", [])
+        
+        if not installations:
+            raise ValueError("No GitHub App installations found")
+        
+        # Return first installation (most users have one)
+        return installations[0]["id"]
+
     async def get_installation_token(self, installation_id: int) -> str:
         """
         Get installation access token using JWT.
+        Tokens are cached until shortly before their expiry, and concurrent
+        callers for one installation share a single mint.
         
         Args:
             installation_id: GitHub installation ID
@@ -165,6 +238,27 @@ class GitHubAppService:
         Returns:
             Installation access token
         """
+        key = (self.app_id, installation_id)
+        cached = _installation_tokens.get(key)
+        if _still_fresh(cached):
+            return cached[0]
+        
+        async with _installation_token_locks[key]:
+            cached = _installation_tokens.get(key)
+            if _still_fresh(cached):
+                return cached[0]
+            
+            token, expires_at = await self._create_installation_token(installation_id)
+            _installation_tokens[key] = (token, expires_at)
+            return token
+    
+    async def _create_installation_token(self, installation_id: int) -> Tuple[str, float]:
+        """
+        Mint a new installation access token.
+        
+        Returns:
+            (token, expiry as a Unix timestamp)
+        """
         with tracer.start_as_current_span("github.get_installation_token"):
             jwt_token = self.generate_jwt()
             
@@ -175,25 +269,30 @@ class GitHubAppService:
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.post(url, headers=headers)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    token = data["token"]
-                    
-                    logger.info(f"Got installation token for installation_id: {installation_id}")
-                    
-                    return token
-                    
-                except httpx.HTTPError as e:
-                    logger.exception(f"Failed to get installation token")
-                    raise ValueError(f"Failed to get installation token: {e}")
-    
+            client = github_http_client()
+            try:
+                response = await client.post(url, headers=headers)
+                response.raise_for_status()
+                
+                data = response.json()
+                token = data["token"]
+                if data.get("expires_at"):
+                    expires_at = datetime.fromisoformat(data["expires_at"]).timestamp()
+                else:
+                    expires_at = time.time() + 3600
+                
+                logger.info("Got installation token for installation_id: %s", installation_id)
+                
+                return token, expires_at
+                
+            except httpx.HTTPError as e:
+                logger.exception("Failed to get installation token")
+                raise ValueError(f"Failed to get installation token: {e}")
+
     async def get_user_info(self, access_token: str) -> dict:
         """
         Get GitHub user information.
+        Cached per token for USER_INFO_TTL_SECONDS.
         
         Args:
             access_token: GitHub access token
@@ -201,6 +300,28 @@ class GitHubAppService:
         Returns:
             User info dict
         """
+        key = hashlib.sha256(access_token.encode()).digest()
+        cached = _user_info_cache.get(key)
+        if cached is not None and cached[1] > time.time():
+            _user_info_cache.move_to_end(key)
+            return dict(cached[0])
+        
+        fetch = _user_info_inflight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_user_info(access_token))
+            _user_info_inflight[key] = fetch
+            fetch.add_done_callback(lambda _: _user_info_inflight.pop(key, None))
+        # Shielded: one caller going away must not cancel the others' lookup.
+        user_info = await asyncio.shield(fetch)
+        
+        _user_info_cache[key] = (user_info, time.time() + USER_INFO_TTL_SECONDS)
+        _user_info_cache.move_to_end(key)
+        if len(_user_info_cache) > _USER_INFO_CACHE_SIZE:
+            _user_info_cache.popitem(last=False)
+        return dict(user_info)
+    
+    async def _fetch_user_info(self, access_token: str) -> dict:
+        """Request the token's user from GitHub."""
         with tracer.start_as_current_span("github.get_user_info"):
             url = "https://api.github.com/user"
             
@@ -209,22 +330,22 @@ class GitHubAppService:
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(url, headers=headers)
-                    response.raise_for_status()
-                    
-                    user_data = response.json()
-                    
-                    logger.info(f"Retrieved user info for: {user_data.get('login')}")
-                    
-                    return {
-                        "login": user_data.get("login"),
-                        "id": user_data.get("id"),
-                        "name": user_data.get("name"),
-                        "email": user_data.get("email"),
-                    }
-                    
-                except httpx.HTTPError as e:
-                    logger.exception("Failed to get user info")
-                    raise ValueError(f"Failed to get user info: {e}")
\ No newline at end of file
+            client = github_http_client()
+            try:
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                
+                user_data = response.json()
+                
+                logger.info("Retrieved user info for: %s", user_data.get('login'))
+                
+                return {
+                    "login": user_data.get("login"),
+                    "id": user_data.get("id"),
+                    "name": user_data.get("name"),
+                    "email": user_data.get("email"),
+                }
+                
+            except httpx.HTTPError as e:
+                logger.exception("Failed to get user info")
+                raise ValueError(f"Failed to get user info: {e}")
\ No newline at end of file
@@ -10,11 +10,13 @@ Automatically runs when breaking changes are detected.
 from __future__ import annotations
 import logging
 import re
+from functools import lru_cache
 from typing import Dict, Any, List
 from uuid import UUID
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, contains_eager
 from opentelemetry import trace
 from prometheus_client import Counter, Histogram
 
@@ -53,6 +55,18 @@ affected_usages_total = Counter(
 SYSTEM_USER_ID = "system"
 
 
+@lru_cache(maxsize=1024)
+def _spec_path_pattern(spec_path: str) -> re.Pattern:
+    """
+    Compiled matcher for a spec path (query string already removed).
+    /users/{id}/posts/{postId} -> ^/users/[^/]+/posts/[^/]+$
+    Cached: the same paths recur across changes and analyses.
+    """
+    pattern = re.escape(spec_path)
+    pattern = re.sub(r'\\{[^}]+\\}', r'[^/]+', pattern)
+    return re.compile(f'^{pattern}$')
+
+
 class ImpactAnalysisService:
     """
     Service for analyzing the impact of API changes on code repositories.
@@ -250,25 +264,47 @@ class ImpactAnalysisService:
                 logger.warning("Breaking change missing endpoint path: %s", change)
                 return []
             
-            # Query all endpoint usages for this tenant
+            # Only fetch usages that can match: a path can only match if it
+            # starts with the spec path's literal part (everything before the
+            # first {param}); a path without params must match exactly,
+            # ignoring a query string. The repository comes back in the same
+            # query instead of being lazy-loaded per usage.
+            spec_path_clean = endpoint_path.split('?')[0]
+            literal_prefix = spec_path_clean.split('{', 1)[0]
             query = self.db.query(CodeRepoEndpointUsage).join(
                 CodeRepository
+            ).options(
+                contains_eager(CodeRepoEndpointUsage.code_repository)
             ).filter(
                 CodeRepoEndpointUsage.tenant_id == tenant_id
             )
+            if literal_prefix == spec_path_clean:
+                query = query.filter(or_(
+                    CodeRepoEndpointUsage.endpoint_path == spec_path_clean,
+                    CodeRepoEndpointUsage.endpoint_path.startswith(
+                        spec_path_clean + '?', autoescape=True
+                    ),
+                ))
+            else:
+                query = query.filter(
+                    CodeRepoEndpointUsage.endpoint_path.startswith(
+                        literal_prefix, autoescape=True
+                    )
+                )
+            if http_method:
+                query = query.filter(CodeRepoEndpointUsage.http_method == http_method)
             
             all_usages = query.all()
             
             span.set_attribute("total_usages_checked", len(all_usages))
             
-            # Find matching usages (with path parameter matching)
-            matching_usages = []
-            for usage in all_usages:
-                if self._paths_match(endpoint_path, usage.endpoint_path):
-                    # If method specified in change, must match
-                    if http_method and usage.http_method != http_method:
-                        continue
-                    matching_usages.append(usage)
+            # Find matching usages (with path parameter matching), compiling
+            # the spec path once rather than per usage
+            pattern = _spec_path_pattern(spec_path_clean)
+            matching_usages = [
+                usage for usage in all_usages
+                if pattern.match(usage.endpoint_path.split('?')[0])
+            ]
             
             span.set_attribute("matching_usages_found", len(matching_usages))
             
@@ -333,17 +369,8 @@ class ImpactAnalysisService:
         if spec_path_clean == code_path_clean:
             return True
         
-        # Convert spec path with {params} to regex pattern
-        # /users/{id}/posts/{postId} -> ^/users/[^/]+/posts/[^/]+$
-        pattern = re.escape(spec_path_clean)
-        pattern = re.sub(r'\\{[^}]+\\}', r'[^/]+', pattern)
-        pattern = f'^{pattern}$'
-        
-        try:
-            return bool(re.match(pattern, code_path_clean))
-        except re.error as e:
-            logger.warning("Invalid regex pattern %s: %s", pattern, e)
-            return False
+        # Spec path with {params} as a regex
+        return bool(_spec_path_pattern(spec_path_clean).match(code_path_clean))
     
     def _calculate_change_severity(self, change_type: str) -> str:
         """
@@ -157,7 +157,7 @@ class OrganizationService:
         self.db.commit()
         self.db.refresh(invitation)
         
-        logger.info(f"Created invitation for {email} to join {tenant_id}")
+        logger.info("Created invitation for %s to join %s", email, tenant_id)
         return invitation
     
     def get_pending_invitations(self, tenant_id: str) -> List[OrganizationInvitation]:
@@ -233,7 +233,7 @@ class OrganizationService:
         self.db.commit()
         self.db.refresh(member)
         
-        logger.info(f"User {user_id} accepted invitation to join {invitation.tenant_id}")
+        logger.info("User %s accepted invitation to join %s", user_id, invitation.tenant_id)
         return member
     
     def remove_member(self, tenant_id: str, user_id: str, removed_by_user_id: str):
@@ -265,7 +265,7 @@ class OrganizationService:
         member.updated_by_user_id = removed_by_user_id
         
         self.db.commit()
-        logger.info(f"Removed user {user_id} from {tenant_id}")
+        logger.info("Removed user %s from %s", user_id, tenant_id)
     
     def update_member_role(
         self,
@@ -303,7 +303,7 @@ class OrganizationService:
         member.updated_by_user_id = updated_by_user_id
         
         self.db.commit()
-        logger.info(f"Updated role for {user_id} in {tenant_id} to {new_role}")
+        logger.info("Updated role for %s in %s to %s", user_id, tenant_id, new_role)
     
     def revoke_invitation(self, invitation_id: str, revoked_by_user_id: str):
         """
@@ -330,4 +330,4 @@ class OrganizationService:
         invitation.updated_by_user_id = revoked_by_user_id
         
         self.db.commit()
-        logger.info(f"Revoked invitation {invitation_id}")
+        logger.info("Revoked invitation %s", invitation_id)
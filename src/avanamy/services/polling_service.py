@@ -5,6 +5,7 @@ This service fetches specs from external URLs, detects changes,
 and creates new versions automatically.
 """
 
+import asyncio
 import hashlib
 import httpx
 import logging
@@ -56,11 +57,11 @@ class PollingService:
             ).first()
             
             if not watched_api:
-                logger.error(f"WatchedAPI {watched_api_id} not found")
+                logger.error("WatchedAPI %s not found", watched_api_id)
                 return {"status": "error", "error": "WatchedAPI not found"}
             
             if not watched_api.polling_enabled:
-                logger.info(f"Polling disabled for {watched_api.spec_url}")
+                logger.info("Polling disabled for %s", watched_api.spec_url)
                 return {"status": "skipped", "error": "Polling disabled"}
             
             try:
@@ -76,7 +77,7 @@ class PollingService:
                 
                 # Check if spec has changed
                 if spec_hash == watched_api.last_spec_hash:
-                    logger.info(f"No changes detected for {watched_api.spec_url}")
+                    logger.info("No changes detected for %s", watched_api.spec_url)
                     self._update_poll_tracking(watched_api, success=True, error=None)
                     return {
                         "status": "no_change",
@@ -84,14 +85,14 @@ class PollingService:
                     }
                 
                 # Spec has changed! Create new version
-                logger.info(f"Changes detected for {watched_api.spec_url}, creating new version")
+                logger.info("Changes detected for %s, creating new version", watched_api.spec_url)
                 
                 # Parse the spec to determine format
                 try:
                     parsed_spec = parse_api_spec("spec.yaml", spec_content.encode("utf-8"))
                     spec_format = parsed_spec.get("openapi", parsed_spec.get("swagger", "unknown"))
                 except Exception as parse_error:
-                    logger.warning(f"Could not parse spec format: {parse_error}")
+                    logger.warning("Could not parse spec format: %s", parse_error)
                     spec_format = "unknown"
                 
                 # Create new version using existing service
@@ -112,7 +113,7 @@ class PollingService:
                 self._update_poll_tracking(watched_api, success=True, error=None)
                 
                 logger.info(
-                    f"Successfully created version {new_version} for {watched_api.spec_url}"
+                    "Successfully created version %s for %s", new_version, watched_api.spec_url
                 )
                 span.set_attribute("version_created", new_version)
                 
@@ -126,13 +127,13 @@ class PollingService:
                 
             except httpx.HTTPStatusError as e:
                 error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
-                logger.error(f"Failed to fetch {watched_api.spec_url}: {error_msg}")
+                logger.error("Failed to fetch %s: %s", watched_api.spec_url, error_msg)
                 self._update_poll_tracking(watched_api, success=False, error=error_msg)
                 return {"status": "error", "error": error_msg}
             
             except Exception as e:
                 error_msg = str(e)
-                logger.exception(f"Error polling {watched_api.spec_url}")
+                logger.exception("Error polling %s", watched_api.spec_url)
                 self._update_poll_tracking(watched_api, success=False, error=error_msg)
                 return {"status": "error", "error": error_msg}
 
@@ -142,14 +143,14 @@ class PollingService:
         
         For MVP: No authentication, just public URLs.
         """
-        logger.info(f"Fetching spec from {url}")
+        logger.info("Fetching spec from %s", url)
         
         async with httpx.AsyncClient(timeout=30.0) as client:
             response = await client.get(url)
             response.raise_for_status()
             
             content = response.text
-            logger.info(f"Fetched {len(content)} bytes from {url}")
+            logger.info("Fetched %s bytes from %s", len(content), url)
             
             return content
 
@@ -198,7 +199,7 @@ class PollingService:
             watched_api.api_spec_id = api_spec.id
             self.db.commit()
 
-            logger.info(f"Created new ApiSpec {api_spec.id} for WatchedAPI {watched_api.id}")
+            logger.info("Created new ApiSpec %s for WatchedAPI %s", api_spec.id, watched_api.id)
 
             # IMPORTANT: Bootstrap case
             # store_api_spec_file already created VersionHistory v1 and stored artifacts.
@@ -262,7 +263,7 @@ class PollingService:
             # Send alert on 3rd consecutive failure
             if watched_api.consecutive_failures == 3:
                 logger.warning(
-                    f"WatchedAPI {watched_api.id} has failed 3 times, sending alerts"
+                    "WatchedAPI %s has failed 3 times, sending alerts", watched_api.id
                 )
                 
                 # Get alert configurations
@@ -288,14 +289,16 @@ class PollingService:
                         error_message=error
                     )
                 
-                logger.info(f"Sent {len(alert_configs)} poll failure alerts")
+                logger.info("Sent %s poll failure alerts", len(alert_configs))
             
             # After 5 consecutive failures, mark as failed
             if watched_api.consecutive_failures >= 5:
                 watched_api.status = "failed"
                 logger.warning(
-                    f"WatchedAPI {watched_api.id} marked as failed after "
-                    f"{watched_api.consecutive_failures} consecutive failures"
+                    "WatchedAPI %s marked as failed after "
+                    "%s consecutive failures",
+                    watched_api.id,
+                    watched_api.consecutive_failures,
                 )
         
         self.db.commit()
@@ -315,7 +318,7 @@ class PollingService:
         try:
             # Ensure api_spec_id is set
             if not watched_api.api_spec_id:
-                logger.warning(f"WatchedAPI {watched_api.id} has no api_spec_id set")
+                logger.warning("WatchedAPI %s has no api_spec_id set", watched_api.id)
                 return
             
             # Get the version history record
@@ -325,12 +328,12 @@ class PollingService:
             ).first()
             
             if not version_history:
-                logger.warning(f"Version history not found for version {version_number}")
+                logger.warning("Version history not found for version %s", version_number)
                 return
             
             # Check if there's a diff and if it contains breaking changes
             if not version_history.diff:
-                logger.info(f"No diff found for version {version_number}")
+                logger.info("No diff found for version %s", version_number)
                 return
             
             diff = version_history.diff
@@ -341,7 +344,7 @@ class PollingService:
             changes = diff.get("changes", [])
             
             if not is_breaking:
-                logger.info(f"No breaking changes in version {version_number}")
+                logger.info("No breaking changes in version %s", version_number)
                 
                 # Check for non-breaking change alerts (optional)
                 if changes:
@@ -355,20 +358,24 @@ class PollingService:
                         .all()
                     )
                     
-                    for config in alert_configs:
-                        self.email_service.send_non_breaking_change_alert(
-                            db=self.db,
-                            alert_config=config,
-                            watched_api=watched_api,
-                            version=version_history
-                        )
+                    # Provider calls block on the network; keep them off the event loop.
+                    await asyncio.to_thread(
+                        self.email_service.send_non_breaking_change_alerts,
+                        db=self.db,
+                        alert_configs=alert_configs,
+                        watched_api=watched_api,
+                        version=version_history,
+                        commit=False,
+                    )
+                    # One commit for the whole fan-out's alert history rows.
+                    self.db.commit()
                     
-                    logger.info(f"Sent {len(alert_configs)} non-breaking change alerts")
+                    logger.info("Sent %s non-breaking change alerts", len(alert_configs))
                 
                 return
             
             logger.info(
-                f"Breaking changes detected in version {version_number} for spec {watched_api.api_spec_id}"
+                "Breaking changes detected in version %s for spec %s", version_number, watched_api.api_spec_id
             )
             
             # --------------------------------------------------------------------
@@ -397,16 +404,20 @@ class PollingService:
                     span.set_attribute("impact.affected_repos", impact_result.total_affected_repos)
                     
                     logger.info(
-                        f"Impact analysis complete: has_impact={impact_result.has_impact}, "
-                        f"repos={impact_result.total_affected_repos}, "
-                        f"usages={impact_result.total_usages_affected}"
+                        "Impact analysis complete: has_impact=%s, "
+                        "repos=%s, "
+                        "usages=%s",
+                        impact_result.has_impact,
+                        impact_result.total_affected_repos,
+                        impact_result.total_usages_affected,
                     )
 
                     # ✅ Auto-trigger repository scans for affected repos
                     if impact_result.has_impact and impact_result.total_affected_repos > 0:
                         logger.info(
-                            f"Triggering immediate scans for {impact_result.total_affected_repos} "
-                            f"affected repositories"
+                            "Triggering immediate scans for %s "
+                            "affected repositories",
+                            impact_result.total_affected_repos,
                         )
                         
                         try:
@@ -444,12 +455,12 @@ class PollingService:
                             self.db.commit()
                             
                             logger.info(
-                                f"✓ Scheduled {repos_updated} repositories for immediate scanning"
+                                "✓ Scheduled %s repositories for immediate scanning", repos_updated
                             )
                             
                         except Exception as scan_trigger_error:
                             logger.exception(
-                                f"Failed to trigger repository scans: {scan_trigger_error}"
+                                "Failed to trigger repository scans: %s", scan_trigger_error
                             )
                             # Rollback the transaction to recover
                             self.db.rollback()
@@ -474,23 +485,28 @@ class PollingService:
                 )
                 
                 # Send alert for each configuration
-                for config in alert_configs:
-                    self.email_service.send_breaking_change_alert(
-                        db=self.db,
-                        alert_config=config,
-                        watched_api=watched_api,
-                        version=version_history,
-                        breaking_changes_count=len(changes),  # FIXED: Use changes array
-                    )
+                await asyncio.to_thread(
+                    self.email_service.send_breaking_change_alerts,
+                    db=self.db,
+                    alert_configs=alert_configs,
+                    watched_api=watched_api,
+                    version=version_history,
+                    breaking_changes_count=len(changes),  # FIXED: Use changes array
+                    commit=False,
+                )
+                # One commit for the whole fan-out's alert history rows.
+                self.db.commit()
                 
-                logger.info(f"Sent {len(alert_configs)} breaking change alerts")
+                logger.info("Sent %s breaking change alerts", len(alert_configs))
                 
             except Exception:
                 logger.exception("Failed to send breaking change alerts")
+                self.db.rollback()
                 
         except Exception as e:
-            logger.error(f"Error checking/alerting breaking changes: {e}", exc_info=True)
+            logger.error("Error checking/alerting breaking changes: %s", e, exc_info=True)
             # Don't fail the polling if alerting fails
+            self.db.rollback()
 
     async def _run_health_checks(
         self,
@@ -508,20 +524,22 @@ class PollingService:
             Dict with health check results
         """
         try:
-            logger.info(f"Running health checks for {watched_api.spec_url}")
+            logger.info("Running health checks for %s", watched_api.spec_url)
             
             health_service = EndpointHealthService(self.db)
             results = await health_service.check_endpoints(watched_api, spec_content)
             
             logger.info(
-                f"Health checks complete: {results['healthy']} healthy, "
-                f"{results['unhealthy']} unhealthy"
+                "Health checks complete: %s healthy, "
+                "%s unhealthy",
+                results['healthy'],
+                results['unhealthy'],
             )
             
             return results
             
         except Exception as e:
-            logger.error(f"Error running health checks: {e}", exc_info=True)
+            logger.error("Error running health checks: %s", e, exc_info=True)
             return {
                 "total": 0,
                 "healthy": 0,
@@ -573,5 +591,5 @@ async def poll_all_active_apis(db: Session) -> dict:
         elif result["status"] == "error":
             results["errors"] += 1
     
-    logger.info(f"Polling complete: {results}")
+    logger.info("Polling complete: %s", results)
     return results
\ No newline at end of file
@@ -1,26 +1,69 @@
 # src/avanamy/services/s3.py
+import gzip
+import io
 import os
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 import logging
 from opentelemetry import trace
 
 AWS_REGION = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-east-1"
 AWS_BUCKET = os.getenv("AWS_S3_BUCKET")  # must be set
 
+# botocore pools only 10 connections by default; a couple of concurrent
+# multipart uploads would otherwise open and drop connections instead of
+# reusing them.
+MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+
 _s3_client = boto3.client(
     "s3",
     region_name=AWS_REGION,
     # boto3 will pick credentials from env, ~/.aws, or IAM role
+    config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
 )
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
-def upload_bytes(key: str, data: bytes, content_type: str = None) -> Tuple[str, str]:
+# Bodies at or above this size go through the transfer manager as a
+# multipart upload with parts sent concurrently; smaller ones are a single PUT.
+MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+# S3 requires parts of at least 5 MiB (except the last). The transfer manager
+# grows the part size on its own if a body would need more than 10,000 parts,
+# and retries a failed part rather than the whole object.
+MULTIPART_CHUNKSIZE = max(
+    int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(5 * 1024 * 1024))),
+    5 * 1024 * 1024,
+)
+MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "8"))
+
+# Text bodies at least this big (generated docs, normalized specs) are gzipped
+# before upload and stored with Content-Encoding: gzip; download_bytes
+# undoes it. Rendered docs compress 5-10x. 0 turns compression off.
+GZIP_MIN_BYTES = int(os.getenv("S3_GZIP_MIN_BYTES", str(64 * 1024)))
+GZIP_LEVEL = int(os.getenv("S3_GZIP_LEVEL", "6"))
+_GZIP_CONTENT_TYPES = ("text/", "application/json")
+
+_transfer_config = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_CHUNKSIZE,
+    max_concurrency=MULTIPART_CONCURRENCY,
+    use_threads=True,
+)
+
+def upload_bytes(
+    key: str,
+    data: bytes,
+    content_type: str = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> Tuple[str, str]:
     """
     Synchronously upload bytes to S3.
+    ``metadata`` is stored as user metadata (x-amz-meta-*) on the object.
+    Large text bodies are stored gzipped (see GZIP_MIN_BYTES).
     Returns (s3_key, s3_url)
     """
     if not AWS_BUCKET:
@@ -28,15 +71,50 @@ def upload_bytes(key: str, data: bytes, content_type: str = None) -> Tuple[str,
         raise RuntimeError("AWS_S3_BUCKET is not set in environment variables")
     
     try:
-        kwargs = {"Bucket": AWS_BUCKET, "Key": key, "Body": data}
-        if content_type:
-            kwargs["ContentType"] = content_type
-
+        size = len(data) if data is not None else 0
         with tracer.start_as_current_span("s3.upload") as span:
             span.set_attribute("s3.key", key)
-            span.set_attribute("file.size", len(data) if data is not None else 0)
+            span.set_attribute("file.size", size)
             logger.info("Uploading to S3: %s", key)
-            _s3_client.put_object(**kwargs)
+
+            content_encoding = None
+            if (
+                GZIP_MIN_BYTES
+                and size >= GZIP_MIN_BYTES
+                and content_type
+                and content_type.startswith(_GZIP_CONTENT_TYPES)
+            ):
+                # mtime=0 keeps the output deterministic for identical input.
+                data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+                content_encoding = "gzip"
+                size = len(data)
+                span.set_attribute("s3.compressed_size", size)
+
+            if size >= MULTIPART_THRESHOLD:
+                span.set_attribute("s3.multipart", True)
+                extra_args = {}
+                if content_type:
+                    extra_args["ContentType"] = content_type
+                if content_encoding:
+                    extra_args["ContentEncoding"] = content_encoding
+                if metadata:
+                    extra_args["Metadata"] = metadata
+                _s3_client.upload_fileobj(
+                    io.BytesIO(data),
+                    AWS_BUCKET,
+                    key,
+                    ExtraArgs=extra_args or None,
+                    Config=_transfer_config,
+                )
+            else:
+                kwargs = {"Bucket": AWS_BUCKET, "Key": key, "Body": data}
+                if content_type:
+                    kwargs["ContentType"] = content_type
+                if content_encoding:
+                    kwargs["ContentEncoding"] = content_encoding
+                if metadata:
+                    kwargs["Metadata"] = metadata
+                _s3_client.put_object(**kwargs)
 
         s3_url = f"s3://{AWS_BUCKET}/{key}"
         return key, s3_url
@@ -46,7 +124,8 @@ def upload_bytes(key: str, data: bytes, content_type: str = None) -> Tuple[str,
 
 def download_bytes(key: str) -> bytes:
     """
-    Download raw bytes from S3 for the given key.
+    Download raw bytes from S3 for the given key, un-gzipping bodies that
+    upload_bytes stored compressed.
     """
     if not AWS_BUCKET:
         raise RuntimeError("AWS_S3_BUCKET is not set in environment variables")
@@ -59,11 +138,53 @@ def download_bytes(key: str) -> bytes:
             body = resp.get("Body")
             if body is None:
                 return b""
-            return body.read()
+            data = body.read()
+            if resp.get("ContentEncoding") == "gzip":
+                data = gzip.decompress(data)
+            return data
     except ClientError:
         logger.error("S3 download failed for key=%s", key)
         raise
 
+def generate_presigned_get_url(key: str, expires_in: int = 3600) -> str:
+    """
+    Time-limited HTTPS URL for GETting the object straight from S3, so large
+    bodies don't have to be proxied through the API. Signing is local; no
+    request is made.
+    """
+    if not AWS_BUCKET:
+        raise RuntimeError("AWS_S3_BUCKET is not set in environment variables")
+
+    return _s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": AWS_BUCKET, "Key": key},
+        ExpiresIn=expires_in,
+    )
+
+def head_object_metadata(key: str) -> Optional[Dict[str, str]]:
+    """
+    HEAD the object at key and return its user metadata ({} if it has none).
+    Returns None if the object is missing; other S3 errors are raised.
+    """
+    if not AWS_BUCKET:
+        raise RuntimeError("AWS_S3_BUCKET is not set in environment variables")
+
+    try:
+        with tracer.start_as_current_span("s3.head") as span:
+            span.set_attribute("s3.key", key)
+            resp = _s3_client.head_object(Bucket=AWS_BUCKET, Key=key)
+        return resp.get("Metadata") or {}
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return None
+        logger.error("S3 head failed for key=%s", key)
+        raise
+
+def object_exists(key: str) -> bool:
+    """HEAD the object at key. Returns False if it is missing."""
+    return head_object_metadata(key) is not None
+
 def copy_s3_object(source_key: str, dest_key: str):
     bucket = AWS_BUCKET
     _s3_client.copy_object(
@@ -22,7 +22,7 @@ def get_or_create_tenant(
     tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     
     if tenant:
-        logger.debug(f"Found existing tenant: {tenant.id}")
+        logger.debug("Found existing tenant: %s", tenant.id)
         return tenant
     
     # Create new tenant
@@ -37,5 +37,5 @@ def get_or_create_tenant(
     db.commit()
     db.refresh(tenant)
     
-    logger.info(f"Created new {'org' if is_organization else 'personal'} tenant: {tenant.id} ({name})")
+    logger.info("Created new %s tenant: %s (%s)", 'org' if is_organization else 'personal', tenant.id, name)
     return tenant
\ No newline at end of file
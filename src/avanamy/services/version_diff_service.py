@@ -8,7 +8,6 @@ Diffs are stored in VersionHistory.diff column.
 """
 
 from __future__ import annotations
-import json
 import logging
 import asyncio
 from uuid import UUID
@@ -21,6 +20,7 @@ from avanamy.services.s3 import download_bytes
 from avanamy.services.impact_analysis_service import ImpactAnalysisService
 from avanamy.repositories.version_history_repository import VersionHistoryRepository
 from avanamy.repositories.documentation_artifact_repository import DocumentationArtifactRepository
+from avanamy.utils import json_utils
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -304,8 +304,8 @@ def _load_normalized_spec_for_version(
     # Download from S3
     try:
         normalized_bytes = download_bytes(artifact.s3_path)
-        normalized_json = normalized_bytes.decode("utf-8")
-        normalized_spec = json.loads(normalized_json)
+        # orjson parses the UTF-8 bytes directly; no decode to str first.
+        normalized_spec = json_utils.loads(normalized_bytes)
         return normalized_spec
     except Exception:
         logger.exception(
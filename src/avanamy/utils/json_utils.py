@@ -0,0 +1,73 @@
+# src/avanamy/utils/json_utils.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install avanamy-backend[fast]
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text, using orjson when it is installed.
+
+    orjson is stricter than the stdlib (no NaN/Infinity literals), so anything
+    it rejects is retried with json.loads, which raises for truly bad input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_schema(raw: Union[str, bytes, dict, list]) -> Any:
+    """
+    Return a stored schema as Python data. Values that are already decoded
+    (dict/list, e.g. from a JSON column or a freshly built ApiSpec) are
+    returned as-is instead of being serialized and parsed again.
+    """
+    if isinstance(raw, (dict, list)):
+        return raw
+    return loads(raw)
+
+
+# Parsed schemas keyed by a digest of their stored text. Parsed JSON takes
+# several times the memory of the text, so only the last few are kept.
+_SCHEMA_CACHE_SIZE = 16
+_schema_cache: "OrderedDict[bytes, Any]" = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
+def load_schema_cached(raw: Union[str, bytes, dict, list]) -> Any:
+    """
+    load_schema, but a repeat of the same text returns the object parsed
+    last time instead of parsing again.
+
+    The result is shared between callers: treat it as read-only.
+    """
+    if isinstance(raw, (dict, list)):
+        return raw
+
+    data = raw.encode("utf-8") if isinstance(raw, str) else raw
+    key = hashlib.blake2b(data, digest_size=16).digest()
+
+    with _schema_cache_lock:
+        cached = _schema_cache.get(key)
+        if cached is not None:
+            _schema_cache.move_to_end(key)
+            return cached
+
+    schema = loads(data)
+
+    with _schema_cache_lock:
+        _schema_cache[key] = schema
+        if len(_schema_cache) > _SCHEMA_CACHE_SIZE:
+            _schema_cache.popitem(last=False)
+    return schema
@@ -54,6 +54,16 @@ def build_docs_html_path(tenant_slug, provider_slug, product_slug, version, spec
     version_root = build_version_root(tenant_slug, provider_slug, product_slug, version)
     return f"{version_root}/docs/html/{spec_id}-{spec_slug}.html"
 
+def docs_html_path_for_markdown_path(md_key: str) -> str:
+    """
+    The build_docs_html_path key paired with a build_docs_markdown_path key,
+    without re-deriving the slugs and version it was built from.
+    """
+    root, sep, filename = md_key.rpartition("/docs/markdown/")
+    if not sep or not filename.endswith(".md"):
+        raise ValueError(f"Not a docs markdown key: {md_key}")
+    return f"{root}/docs/html/{filename[:-3]}.html"
+
 # ---------------------------------------------------------------------------
 # Embeddings
 # ---------------------------------------------------------------------------
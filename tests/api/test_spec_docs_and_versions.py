@@ -575,3 +575,27 @@ async def test_compare_two_versions_validates_tenant_ownership(monkeypatch):
         )
     assert exc.value.status_code == 404
     assert "API spec not found" in exc.value.detail
+
+
+def test_docs_html_url_returns_presigned_url(monkeypatch):
+    from avanamy.api.routes import docs
+
+    spec_id = uuid.uuid4()
+    repo = MagicMock()
+    repo.get_latest_by_spec_id.return_value = SimpleNamespace(s3_path="tenants/t/docs/html/spec.html")
+    monkeypatch.setattr(docs, "DocumentationArtifactRepository", lambda: repo)
+    monkeypatch.setattr(
+        docs,
+        "generate_presigned_get_url",
+        lambda key, expires_in: f"https://bucket.s3.amazonaws.com/{key}?expires={expires_in}",
+    )
+
+    result = docs.get_docs_html_url(spec_id=spec_id, tenant_id="tenant-1", db=MagicMock())
+
+    assert result["url"].startswith("https://bucket.s3.amazonaws.com/tenants/t/docs/html/spec.html")
+    assert result["expires_in"] == docs.DOCS_URL_TTL_SECONDS
+
+    repo.get_latest_by_spec_id.return_value = None
+    with pytest.raises(HTTPException) as exc:
+        docs.get_docs_html_url(spec_id=spec_id, tenant_id="tenant-1", db=MagicMock())
+    assert exc.value.status_code == 404
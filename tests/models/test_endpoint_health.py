@@ -5,7 +5,7 @@ Tests model creation, relationships, and health tracking.
 """
 import pytest
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from avanamy.models.endpoint_health import EndpointHealth
 from avanamy.models.tenant import Tenant
@@ -191,6 +191,8 @@ def test_endpoint_health_repr_unhealthy(db, watched_api):
 
 def test_multiple_health_checks_same_endpoint(db, watched_api):
     """Test multiple health check records for the same endpoint over time."""
+    now = datetime.now()
+
     # First check - healthy
     check_1 = EndpointHealth(
         watched_api_id=watched_api.id,
@@ -198,7 +200,8 @@ def test_multiple_health_checks_same_endpoint(db, watched_api):
         http_method="GET",
         status_code=200,
         response_time_ms=100,
-        is_healthy=True
+        is_healthy=True,
+        checked_at=now - timedelta(minutes=2)
     )
 
     # Second check - degraded performance
@@ -208,7 +211,8 @@ def test_multiple_health_checks_same_endpoint(db, watched_api):
         http_method="GET",
         status_code=200,
         response_time_ms=3000,
-        is_healthy=True
+        is_healthy=True,
+        checked_at=now - timedelta(minutes=1)
     )
 
     # Third check - failed
@@ -219,7 +223,8 @@ def test_multiple_health_checks_same_endpoint(db, watched_api):
         status_code=500,
         response_time_ms=5000,
         is_healthy=False,
-        error_message="Database connection lost"
+        error_message="Database connection lost",
+        checked_at=now
     )
 
     db.add_all([check_1, check_2, check_3])
@@ -43,3 +43,47 @@ def test_list_and_get_latest_artifacts_for_spec():
         artifact_type="md",
     )
     assert latest.s3_path == "latest"
+
+
+def test_bulk_upsert_updates_existing_docs_artifact(db, tenant_provider_product):
+    import json
+
+    from avanamy.models.api_spec import ApiSpec
+    from avanamy.models.documentation_artifact import DocumentationArtifact
+    from avanamy.models.version_history import VersionHistory
+
+    tenant, provider, product = tenant_provider_product
+    spec = ApiSpec(
+        tenant_id=tenant.id,
+        api_product_id=product.id,
+        provider_id=provider.id,
+        name="Spec",
+        original_file_s3_path="s3://temp",
+        parsed_schema=json.dumps({}),
+    )
+    db.add(spec)
+    db.commit()
+    vh = VersionHistory(api_spec_id=spec.id, version=1)
+    db.add(vh)
+    db.commit()
+
+    def row(artifact_type, s3_path, content_hash):
+        return dict(
+            tenant_id=tenant.id,
+            api_spec_id=spec.id,
+            artifact_type=artifact_type,
+            s3_path=s3_path,
+            version_history_id=vh.id,
+            content_hash=content_hash,
+        )
+
+    repo = DocumentationArtifactRepository()
+    repo.bulk_upsert(db, [row("api_markdown", "a.md", "h1"), row("api_html", "a.html", "h1")])
+    repo.bulk_upsert(db, [row("api_markdown", "b.md", "h2"), row("api_html", "b.html", "h2")])
+    db.commit()
+
+    artifacts = db.query(DocumentationArtifact).order_by(DocumentationArtifact.artifact_type).all()
+    assert [(a.artifact_type, a.s3_path, a.content_hash) for a in artifacts] == [
+        ("api_html", "b.html", "h2"),
+        ("api_markdown", "b.md", "h2"),
+    ]
@@ -325,6 +325,62 @@ class TestSendEndpointFailureAlert:
             mock_email.assert_not_called()
 
 
+class TestSendEndpointFailureDigest:
+    """Tests for send_endpoint_failure_digest method."""
+
+    async def test_digest_sends_one_alert_per_config(
+        self, db, watched_api, email_alert_config
+    ):
+        """Test that several failures go out as a single alert."""
+        service = AlertService(db)
+
+        failures = [
+            {"endpoint_path": "/v1/users", "http_method": "GET", "status_code": 500, "error_message": None},
+            {"endpoint_path": "/v1/orders", "http_method": "POST", "status_code": 0, "error_message": "Request timeout"},
+        ]
+
+        with patch.object(service, "_send_email_alert", new_callable=AsyncMock) as mock_email:
+            await service.send_endpoint_failure_digest(watched_api, failures)
+
+            mock_email.assert_called_once()
+            payload = mock_email.call_args[0][1]
+            assert payload["type"] == "endpoint_failure"
+            assert "2 Endpoints Down" in payload["subject"]
+            assert [e["endpoint"] for e in payload["details"]["endpoints"]] == [
+                "GET /v1/users",
+                "POST /v1/orders",
+            ]
+            assert "Request timeout" in payload["body"]
+
+        history = db.query(AlertHistory).filter(
+            AlertHistory.watched_api_id == watched_api.id,
+            AlertHistory.alert_reason == "endpoint_down"
+        ).all()
+        assert len(history) == 1
+        assert history[0].status == "sent"
+        assert history[0].endpoint_path is None
+
+    async def test_digest_of_one_failure_is_a_regular_alert(
+        self, db, watched_api, email_alert_config
+    ):
+        """Test that a single failure keeps the per-endpoint alert."""
+        service = AlertService(db)
+
+        with patch.object(service, "_send_email_alert", new_callable=AsyncMock) as mock_email:
+            await service.send_endpoint_failure_digest(
+                watched_api,
+                [{"endpoint_path": "/v1/users", "http_method": "GET", "status_code": 503, "error_message": None}],
+            )
+
+            payload = mock_email.call_args[0][1]
+            assert payload["details"]["endpoint"] == "GET /v1/users"
+
+        history = db.query(AlertHistory).filter(
+            AlertHistory.watched_api_id == watched_api.id
+        ).one()
+        assert history.endpoint_path == "/v1/users"
+
+
 class TestSendWebhookAlert:
     """Tests for _send_webhook_alert method."""
 
@@ -446,7 +502,8 @@ class TestSendEmailAlert:
 
             # Verify logging occurred
             mock_logger.info.assert_called_once()
-            log_call = mock_logger.info.call_args[0][0]
+            msg, *args = mock_logger.info.call_args[0]
+            log_call = msg % tuple(args)
             assert "test@example.com" in log_call
             assert "Breaking Change Detected" in log_call
 
@@ -469,7 +526,8 @@ class TestSendSlackAlert:
 
             # Verify logging occurred
             mock_logger.info.assert_called_once()
-            log_call = mock_logger.info.call_args[0][0]
+            msg, *args = mock_logger.info.call_args[0]
+            log_call = msg % tuple(args)
             assert "#api-alerts" in log_call
 
 
@@ -147,3 +147,52 @@ def test_request_body_and_response_sections():
 def test_webhooks_section_optional():
     md = generate_markdown_from_normalized_spec(_sample_spec())
     assert "## Webhooks" not in md
+
+
+def test_table_cells_escape_pipes_and_newlines():
+    spec = _sample_spec()
+    spec["components"]["schemas"]["User"]["properties"]["name"]["description"] = "First | last\nname"
+    md = generate_markdown_from_normalized_spec(spec)
+    assert "| `name` | `string` | yes | First \\| last name |" in md
+
+
+def test_null_summary_and_server_description():
+    spec = _sample_spec()
+    spec["servers"][0]["description"] = None
+    for op in spec["paths"]["/users"].values():
+        op["summary"] = None
+    md = generate_markdown_from_normalized_spec(spec)
+    assert "| Default | `https://api.example.com` |" in md
+    assert "| `GET` | `/users` |  |" in md
+
+
+def test_rendered_markdown_is_reused_until_spec_changes():
+    spec = _sample_spec()
+    first = generate_markdown_from_normalized_spec(spec)
+    assert generate_markdown_from_normalized_spec(_sample_spec()) is first
+
+    spec["info"]["title"] = "Renamed API"
+    changed = generate_markdown_from_normalized_spec(spec)
+    assert changed is not first
+    assert "# Renamed API" in changed
+
+
+def test_markdown_cache_survives_concurrent_eviction(monkeypatch):
+    from collections import OrderedDict
+    from concurrent.futures import ThreadPoolExecutor
+
+    from avanamy.services import documentation_generator
+
+    monkeypatch.setattr(documentation_generator, "_MD_CACHE_SIZE", 2)
+    monkeypatch.setattr(documentation_generator, "_md_cache", OrderedDict())
+    specs = []
+    for i in range(6):
+        spec = _sample_spec()
+        spec["info"]["title"] = f"API {i}"
+        specs.append(spec)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(generate_markdown_from_normalized_spec, specs * 20))
+
+    assert all(f"# API {i % 6}" in md for i, md in enumerate(results))
+    assert len(documentation_generator._md_cache) <= 2
@@ -0,0 +1,89 @@
+from avanamy.services import documentation_renderer
+
+
+def test_same_markdown_is_converted_once(monkeypatch):
+    calls = []
+    convert = documentation_renderer._MD.convert
+
+    def counting_convert(text):
+        calls.append(text)
+        return convert(text)
+
+    monkeypatch.setattr(documentation_renderer._MD, "convert", counting_convert)
+    monkeypatch.setattr(documentation_renderer, "_body_cache", documentation_renderer.OrderedDict())
+
+    markdown = "# API\n\n## Users\n\nList users.\n"
+    v1 = documentation_renderer.render_markdown_to_html(markdown, version_label="v1")
+    v2 = documentation_renderer.render_markdown_to_html(markdown, version_label="v2")
+
+    assert len(calls) == 1
+    assert "List users." in v1 and "List users." in v2
+    assert v1 != v2
+
+    documentation_renderer.render_markdown_to_html(markdown + "\nMore.\n")
+    assert len(calls) == 2
+
+
+def test_code_blocks_share_one_lexer_per_language(monkeypatch):
+    monkeypatch.setattr(documentation_renderer, "_body_cache", documentation_renderer.OrderedDict())
+    documentation_renderer._cached_lexer.cache_clear()
+
+    markdown = "\n\n".join(
+        f"```csharp\nvar x{i} = new Client();\n```" for i in range(5)
+    )
+    html = documentation_renderer.render_markdown_to_html(markdown)
+
+    info = documentation_renderer._cached_lexer.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4
+    assert html.count('class="codehilite"') == 5
+
+
+def test_repeated_headings_get_sequential_ids(monkeypatch):
+    monkeypatch.setattr(documentation_renderer, "_body_cache", documentation_renderer.OrderedDict())
+
+    markdown = "\n\n".join(f"## Endpoint {i}\n\n### Responses" for i in range(4))
+    html = documentation_renderer.render_markdown_to_html(markdown)
+
+    for expected in ('id="responses"', 'id="responses_1"', 'id="responses_2"', 'id="responses_3"'):
+        assert expected in html
+
+    # A fresh document starts numbering again.
+    documentation_renderer._body_cache.clear()
+    again = documentation_renderer.render_markdown_to_html("### Responses\n\n### Responses")
+    assert 'id="responses"' in again and 'id="responses_1"' in again
+    assert 'id="responses_2"' not in again
+
+
+def test_highlighted_lines_render(monkeypatch):
+    monkeypatch.setattr(documentation_renderer, "_body_cache", documentation_renderer.OrderedDict())
+
+    markdown = '```python hl_lines="1"\nx = 1\ny = 2\n```\n\n```python\nz = 3\n```'
+    html = documentation_renderer.render_markdown_to_html(markdown)
+
+    assert html.count('class="hll"') == 1
+    assert html.count('class="codehilite"') == 2
+
+
+def test_other_markdown_instances_keep_library_highlighting():
+    import markdown
+    from markdown.extensions import codehilite
+    from pygments import lexers
+
+    assert codehilite.get_lexer_by_name is lexers.get_lexer_by_name
+
+    documentation_renderer._cached_lexer.cache_clear()
+    html = markdown.markdown("```python\nx = 1\n```", extensions=["fenced_code", "codehilite"])
+    assert 'class="codehilite"' in html
+    assert documentation_renderer._cached_lexer.cache_info().misses == 0
+
+
+def test_other_markdown_instances_keep_library_toc():
+    import markdown
+    from markdown.extensions import toc
+
+    assert documentation_renderer._MD.treeprocessors["toc"].__class__ is documentation_renderer._TocTreeprocessor
+    assert toc.unique.__module__ == "markdown.extensions.toc"
+
+    html = markdown.markdown("## Responses\n\n## Responses", extensions=["toc"])
+    assert 'id="responses"' in html and 'id="responses_1"' in html
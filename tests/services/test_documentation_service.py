@@ -1,4 +1,6 @@
+import asyncio
 import json
+import weakref
 from unittest.mock import MagicMock
 
 import pytest
@@ -51,7 +53,7 @@ async def test_generate_and_store_markdown_for_spec_builds_keys(db, tenant_provi
 
     uploads = []
 
-    def fake_upload(key, data, content_type=None):
+    def fake_upload(key, data, content_type=None, metadata=None):
         uploads.append((key, content_type))
         return key, f"s3://bucket/{key}"
 
@@ -105,7 +107,11 @@ async def test_generate_and_store_markdown_for_spec_builds_keys(db, tenant_provi
     # ---------------------------------------------------------
     # Artifacts created
     # ---------------------------------------------------------
-    created_types = {call.kwargs["artifact_type"] for call in repo.create.call_args_list}
+    created_types = {
+        row["artifact_type"]
+        for call in repo.bulk_upsert.call_args_list
+        for row in call.args[1]
+    }
 
     # Ensure the repository was asked to create the expected artifact types.
     # Use superset check to avoid ordering/duplication flakiness.
@@ -152,17 +158,13 @@ async def test_regenerate_all_docs_for_spec_computes_paths(db, tenant_provider_p
         expected_slug,
     )
 
-    async def _fake_generate(_db, _spec):
+    async def _fake_generate(_db, _spec, commit=True):
         return md_key
 
     monkeypatch.setattr(
         "avanamy.services.documentation_service.generate_and_store_markdown_for_spec",
         _fake_generate,
     )
-    monkeypatch.setattr(
-        "avanamy.services.documentation_service.VersionHistoryRepository.current_version_label_for_spec",
-        lambda _db, _spec_id: "v2",
-    )
     html_key = build_docs_html_path(
         tenant.slug,
         provider.slug,
@@ -175,3 +177,285 @@ async def test_regenerate_all_docs_for_spec_computes_paths(db, tenant_provider_p
     out_md, out_html = await regenerate_all_docs_for_spec(db, spec)
     assert out_md == md_key
     assert out_html == html_key
+
+
+async def test_generate_and_store_markdown_uses_latest_version(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+
+    tenant, provider, product = tenant_provider_product
+    spec = _make_spec(db, tenant, provider, product)
+    db.add_all([
+        VersionHistory(api_spec_id=spec.id, version=3),
+        VersionHistory(api_spec_id=spec.id, version=7),
+        VersionHistory(api_spec_id=spec.id, version=5),
+    ])
+    db.commit()
+
+    monkeypatch.setattr(
+        "avanamy.services.documentation_service.upload_bytes",
+        lambda key, data, content_type=None, metadata=None: (key, f"s3://bucket/{key}"),
+    )
+    monkeypatch.setattr(
+        "avanamy.services.documentation_service.DocumentationArtifactRepository",
+        lambda: MagicMock(),
+    )
+
+    md_key = await generate_and_store_markdown_for_spec(db, spec)
+
+    assert "/v7/" in md_key
+
+
+async def test_generate_and_store_markdown_skips_unchanged_spec(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+
+    tenant, provider, product = tenant_provider_product
+    spec = _make_spec(db, tenant, provider, product)
+    db.add(VersionHistory(api_spec_id=spec.id, version=1))
+    db.commit()
+
+    uploads = []
+    stored_metadata = {}
+
+    def fake_upload(key, data, content_type=None, metadata=None):
+        uploads.append(key)
+        stored_metadata[key] = metadata
+        return key, f"s3://bucket/{key}"
+
+    monkeypatch.setattr("avanamy.services.documentation_service.upload_bytes", fake_upload)
+    monkeypatch.setattr(
+        "avanamy.services.documentation_service.head_object_metadata",
+        stored_metadata.get,
+    )
+
+    first = await generate_and_store_markdown_for_spec(db, spec)
+    assert len(uploads) == 2
+    assert all(
+        meta == {"content-hash": spec.last_rendered_schema_hash}
+        for meta in stored_metadata.values()
+    )
+    assert spec.last_rendered_schema_hash
+
+    second = await generate_and_store_markdown_for_spec(db, spec)
+    assert second == first
+    assert len(uploads) == 2
+
+    spec.parsed_schema = json.dumps({"info": {"title": "Y"}, "paths": {}})
+    db.commit()
+    await generate_and_store_markdown_for_spec(db, spec)
+    assert len(uploads) == 4
+
+
+async def test_ai_enhancement_runs_after_basic_docs_are_uploaded(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+    from avanamy.services import documentation_service
+
+    tenant, provider, product = tenant_provider_product
+    spec = _make_spec(db, tenant, provider, product)
+    db.add(VersionHistory(api_spec_id=spec.id, version=1))
+    db.commit()
+
+    uploads = []
+
+    def fake_upload(key, data, content_type=None, metadata=None):
+        uploads.append((content_type, data))
+        return key, f"s3://bucket/{key}"
+
+    class FakeEnhancer:
+        def is_enabled(self):
+            return True
+
+        async def enhance_markdown(self, basic_markdown, spec, api_title=None):
+            return "# Enhanced\n" + basic_markdown
+
+    monkeypatch.setattr(documentation_service, "upload_bytes", fake_upload)
+    monkeypatch.setattr(documentation_service, "AIDocumentationEnhancer", FakeEnhancer)
+    monkeypatch.setattr(documentation_service, "SessionLocal", lambda: db)
+
+    await generate_and_store_markdown_for_spec(db, spec)
+
+    md_bodies = [data for ct, data in uploads if ct == "text/markdown"]
+    assert len(md_bodies) == 1
+    assert not md_bodies[0].startswith(b"# Enhanced")
+
+    await asyncio.gather(*documentation_service._enhancement_tasks)
+
+    md_bodies = [data for ct, data in uploads if ct == "text/markdown"]
+    assert len(md_bodies) == 2
+    assert md_bodies[1].startswith(b"# Enhanced")
+
+
+async def test_cache_hit_retries_missing_enhancement(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+    from avanamy.services import documentation_service
+
+    tenant, provider, product = tenant_provider_product
+    spec = _make_spec(db, tenant, provider, product)
+    db.add(VersionHistory(api_spec_id=spec.id, version=1))
+    db.commit()
+
+    uploads = []
+    stored_metadata = {}
+
+    def fake_upload(key, data, content_type=None, metadata=None):
+        uploads.append(key)
+        stored_metadata[key] = metadata
+        return key, f"s3://bucket/{key}"
+
+    class FailingEnhancer:
+        def is_enabled(self):
+            return True
+
+        async def enhance_markdown(self, basic_markdown, spec, api_title=None):
+            raise RuntimeError("provider down")
+
+    class FakeEnhancer(FailingEnhancer):
+        async def enhance_markdown(self, basic_markdown, spec, api_title=None):
+            return "# Enhanced\n" + basic_markdown
+
+    monkeypatch.setattr(documentation_service, "upload_bytes", fake_upload)
+    monkeypatch.setattr(documentation_service, "head_object_metadata", stored_metadata.get)
+    monkeypatch.setattr(documentation_service, "AIDocumentationEnhancer", FailingEnhancer)
+    monkeypatch.setattr(documentation_service, "SessionLocal", lambda: db)
+
+    await generate_and_store_markdown_for_spec(db, spec)
+    await documentation_service.drain_enhancement_tasks()
+    assert len(uploads) == 2
+
+    # Unchanged spec, but the docs were never enhanced: try again.
+    monkeypatch.setattr(documentation_service, "AIDocumentationEnhancer", FakeEnhancer)
+    await generate_and_store_markdown_for_spec(db, spec)
+    await documentation_service.drain_enhancement_tasks()
+    assert len(uploads) == 4
+    assert all(
+        meta == {"content-hash": spec.last_rendered_schema_hash, "enhanced": "true"}
+        for meta in stored_metadata.values()
+    )
+
+    # Enhanced docs on a cache hit are left alone.
+    await generate_and_store_markdown_for_spec(db, spec)
+    assert not documentation_service._enhancement_tasks
+    assert len(uploads) == 4
+
+
+async def test_regenerate_docs_for_specs_renders_in_bulk(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+    from avanamy.services import documentation_service
+
+    tenant, provider, product = tenant_provider_product
+    spec_a = _make_spec(db, tenant, provider, product)
+    spec_b = _make_spec(db, tenant, provider, product)
+    no_history = _make_spec(db, tenant, provider, product)
+    db.add_all([
+        VersionHistory(api_spec_id=spec_a.id, version=1),
+        VersionHistory(api_spec_id=spec_a.id, version=2),
+        VersionHistory(api_spec_id=spec_b.id, version=1),
+    ])
+    db.commit()
+
+    uploads = {}
+
+    def fake_upload(key, data, content_type=None, metadata=None):
+        uploads[key] = data
+        return key, f"s3://bucket/{key}"
+
+    class DisabledEnhancer:
+        def is_enabled(self):
+            return False
+
+    monkeypatch.setattr(documentation_service, "upload_bytes", fake_upload)
+    monkeypatch.setattr(documentation_service, "AIDocumentationEnhancer", DisabledEnhancer)
+
+    results = await documentation_service.regenerate_docs_for_specs(
+        db, [spec_a.id, spec_b.id, no_history.id]
+    )
+
+    assert set(results) == {spec_a.id, spec_b.id}
+    assert "/v2/" in results[spec_a.id]
+    assert len(uploads) == 4
+    assert all(uploads.values())
+    assert spec_a.documentation_html_s3_path.endswith(".html")
+
+
+def test_markdown_cache_reuses_markdown_for_identical_schema_text(monkeypatch):
+    from avanamy.services import documentation_service
+
+    calls = []
+
+    def fake_generate(schema):
+        calls.append(schema)
+        return f"# {schema['info']['title']}"
+
+    monkeypatch.setattr(documentation_service, "generate_markdown_from_normalized_spec", fake_generate)
+    cache = documentation_service._MarkdownCache(maxsize=1)
+
+    raw = json.dumps({"info": {"title": "X"}})
+    assert cache.get_or_render(raw, json.loads(raw)) == "# X"
+    assert cache.get_or_render(raw, json.loads(raw)) == "# X"
+    assert len(calls) == 1
+
+    other = json.dumps({"info": {"title": "Y"}})
+    assert cache.get_or_render(other, json.loads(other)) == "# Y"
+    assert cache.get_or_render(raw, json.loads(raw)) == "# X"
+    assert len(calls) == 3
+
+
+async def test_generate_and_store_markdown_can_leave_commit_to_caller(db, tenant_provider_product, monkeypatch):
+    from avanamy.models.version_history import VersionHistory
+    from avanamy.services import documentation_service
+
+    tenant, provider, product = tenant_provider_product
+    spec = _make_spec(db, tenant, provider, product)
+    db.add(VersionHistory(api_spec_id=spec.id, version=1))
+    db.commit()
+
+    monkeypatch.setattr(
+        documentation_service,
+        "upload_bytes",
+        lambda key, data, content_type=None, metadata=None: (key, f"s3://bucket/{key}"),
+    )
+    monkeypatch.setattr(documentation_service, "DocumentationArtifactRepository", lambda: MagicMock())
+    monkeypatch.setattr(documentation_service, "_schedule_enhancement", lambda spec_id: None)
+    commits = []
+    monkeypatch.setattr(db, "commit", lambda: commits.append(True))
+
+    await generate_and_store_markdown_for_spec(db, spec, commit=False)
+
+    assert commits == []
+    assert spec in db.dirty
+
+
+async def test_enhancements_run_with_bounded_concurrency_and_drain(monkeypatch):
+    from avanamy.services import documentation_service
+
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+
+    async def fake_enhance(spec_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await release.wait()
+        finally:
+            running -= 1
+        return True
+
+    monkeypatch.setattr(documentation_service, "enhance_and_replace", fake_enhance)
+    monkeypatch.setattr(documentation_service, "ENHANCEMENT_CONCURRENCY", 2)
+    monkeypatch.setattr(documentation_service, "_enhancement_slots", weakref.WeakKeyDictionary())
+
+    tasks = [documentation_service._schedule_enhancement(i) for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert peak == 2
+
+    # Shutdown waits for what finishes in time and cancels the rest.
+    await documentation_service.drain_enhancement_tasks(timeout=0.01)
+    await asyncio.sleep(0)
+    assert all(t.cancelled() for t in tasks)
+    assert not documentation_service._enhancement_tasks
+
+    finished = documentation_service._schedule_enhancement("s1")
+    release.set()
+    await documentation_service.drain_enhancement_tasks(timeout=1)
+    assert finished.result() is True
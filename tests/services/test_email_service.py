@@ -1,3 +1,5 @@
+import threading
+
 from avanamy.services.email_service import EmailService
 
 
@@ -59,3 +61,446 @@ def test_send_email_returns_false_without_provider(monkeypatch):
     )
 
     assert result is False
+
+
+def test_smtp_provider_reuses_connection_and_reconnects(monkeypatch):
+    import smtplib
+
+    from avanamy.services import email_service
+
+    connections = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            self.sent = []
+            self.disconnected = False
+            connections.append(self)
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            pass
+
+        def send_message(self, msg):
+            if self.disconnected:
+                raise smtplib.SMTPServerDisconnected("idle timeout")
+            self.sent.append(msg["To"])
+
+        def quit(self):
+            raise smtplib.SMTPServerDisconnected("already closed")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_service, "_smtp_local", threading.local())
+    provider = email_service.SMTPProvider("smtp.test", 587, "user", "pass")
+
+    def send(to):
+        return provider.send(to, "Subject", "<p>Body</p>", "from@example.com", "Avanamy")
+
+    assert send("a@example.com") and send("b@example.com")
+    assert len(connections) == 1
+    assert connections[0].sent == ["a@example.com", "b@example.com"]
+
+    connections[0].disconnected = True
+    assert send("c@example.com")
+    assert len(connections) == 2
+    assert connections[1].sent == ["c@example.com"]
+
+
+def test_smtp_connection_is_shared_and_rotated(monkeypatch):
+    from avanamy.services import email_service
+
+    opened = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            opened.append(self)
+
+        def starttls(self):
+            pass
+
+        def send_message(self, msg):
+            pass
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_service, "_smtp_local", threading.local())
+    monkeypatch.setattr(email_service, "SMTP_MAX_MESSAGES_PER_CONNECTION", 2)
+
+    def send(provider):
+        return provider.send("a@example.com", "S", "<p>B</p>", "from@example.com", "Avanamy")
+
+    # A second provider with the same settings reuses the first one's connection.
+    assert send(email_service.SMTPProvider("smtp.test", 587, "", ""))
+    assert send(email_service.SMTPProvider("smtp.test", 587, "", ""))
+    assert len(opened) == 1
+
+    # Rotated once it has carried SMTP_MAX_MESSAGES_PER_CONNECTION emails.
+    assert send(email_service.SMTPProvider("smtp.test", 587, "", ""))
+    assert len(opened) == 2
+
+
+def test_alert_templates_escape_user_text():
+    service = EmailService()
+
+    body = service._get_breaking_change_template(
+        api_name="<script>alert(1)</script>",
+        provider_name="A & B",
+        product_name="Widgets",
+        version=2,
+        breaking_changes_count=1,
+        summary="Removed <b>/users</b>",
+        spec_url="https://frontend.test/specs/1",
+        diff_url="https://frontend.test/specs/1/versions/2/diff",
+    )
+
+    assert "<script>" not in body
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in body
+    assert "A &amp; B" in body
+    assert "Removed &lt;b&gt;/users&lt;/b&gt;" in body
+
+
+def test_breaking_change_alert_can_defer_history_commit():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    service = EmailService()
+    service.provider = DummyProvider()
+    db = MagicMock()
+
+    watched_api = SimpleNamespace(
+        id="w1",
+        tenant_id="t1",
+        api_spec_id="s1",
+        api_spec=SimpleNamespace(name="Pets"),
+        api_product=None,
+    )
+    version = SimpleNamespace(id=7, version=2, summary=None)
+    config = SimpleNamespace(id="c1", destination="ops@example.com")
+
+    for _ in range(3):
+        assert service.send_breaking_change_alert(
+            db=db,
+            alert_config=config,
+            watched_api=watched_api,
+            version=version,
+            breaking_changes_count=1,
+            commit=False,
+        )
+
+    assert db.add.call_count == 3
+    db.commit.assert_not_called()
+
+
+def test_resend_provider_sends_over_shared_http_client(monkeypatch):
+    import httpx
+    import resend
+    from avanamy.services import email_service
+    from avanamy.services.email_service import ResendProvider
+
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return httpx.Response(200, json={"id": "email-1"})
+
+    monkeypatch.setattr(resend, "default_http_client", resend.default_http_client)
+    monkeypatch.setattr(resend, "api_key", resend.api_key)
+    monkeypatch.setattr(email_service, "_resend_http_client", None)
+
+    first = ResendProvider("re_test")
+    second = ResendProvider("re_test")
+    assert resend.default_http_client is email_service._resend_http_client
+    email_service._resend_http_client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert first.send("a@example.com", "One", "<p>1</p>", "alerts@x.com", "Alerts")
+    assert second.send("b@example.com", "Two", "<p>2</p>", "alerts@x.com", "Alerts")
+
+    assert [r.url.path for r in requests_seen] == ["/emails", "/emails"]
+    assert requests_seen[0].headers["authorization"] == "Bearer re_test"
+
+
+def test_deferred_history_failure_keeps_other_pending_rows():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    service = EmailService()
+    db = MagicMock()
+    db.add.side_effect = [None, RuntimeError("bad row"), None]
+
+    watched_api = SimpleNamespace(id="w1", tenant_id="t1")
+    config = SimpleNamespace(id="c1")
+
+    for _ in range(3):
+        service._record_history(
+            db=db,
+            alert_config=config,
+            watched_api=watched_api,
+            version_history_id=7,
+            alert_reason="breaking_change",
+            severity="critical",
+            payload={},
+            status="sent",
+            error_message=None,
+            commit=False,
+        )
+
+    assert db.add.call_count == 3
+    db.rollback.assert_not_called()
+    db.commit.assert_not_called()
+
+
+def test_breaking_change_alerts_fan_out_and_record_in_order(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from avanamy.services import email_service
+
+    monkeypatch.setattr(email_service, "_send_limiter", email_service._SendRateLimiter(rate=0))
+
+    class SlowProvider(DummyProvider):
+        def __init__(self):
+            super().__init__()
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.lock = threading.Lock()
+
+        def send(self, to, subject, html_body, from_email, from_name):
+            import time
+
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight -= 1
+            super().send(to, subject, html_body, from_email, from_name)
+            return to != "bad@example.com"
+
+    service = EmailService()
+    service.provider = SlowProvider()
+    db = MagicMock()
+
+    watched_api = SimpleNamespace(
+        id="w1",
+        tenant_id="t1",
+        api_spec_id="s1",
+        api_spec=SimpleNamespace(name="Pets"),
+        api_product=None,
+    )
+    version = SimpleNamespace(id=7, version=2, summary=None)
+    configs = [
+        SimpleNamespace(id=f"c{i}", destination=dest)
+        for i, dest in enumerate(["a@example.com", "bad@example.com", "c@example.com"])
+    ]
+
+    sent = service.send_breaking_change_alerts(
+        db=db,
+        alert_configs=configs,
+        watched_api=watched_api,
+        version=version,
+        breaking_changes_count=1,
+        commit=False,
+    )
+
+    assert sent == 2
+    assert service.provider.max_in_flight > 1
+    rows = [call.args[0] for call in db.add.call_args_list]
+    assert [r.alert_config_id for r in rows] == ["c0", "c1", "c2"]
+    assert [r.status for r in rows] == ["sent", "failed", "sent"]
+    db.commit.assert_not_called()
+
+
+def test_send_rate_limiter_spaces_sends(monkeypatch):
+    from avanamy.services import email_service
+
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(email_service.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(email_service.time, "sleep", sleeps.append)
+
+    limiter = email_service._SendRateLimiter(rate=4)
+    for _ in range(3):
+        limiter.wait()
+
+    assert sleeps == [0.25, 0.5]
+    email_service._SendRateLimiter(rate=0).wait()
+    assert sleeps == [0.25, 0.5]
+
+
+def test_resend_retries_rate_limit_honoring_retry_after(monkeypatch):
+    import httpx
+    import resend
+    from avanamy.services import email_service
+    from avanamy.services.email_service import ResendProvider
+
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "2"}, json={"name": "rate_limit_exceeded", "message": "slow down"}),
+        httpx.Response(503, json={"name": "application_error", "message": "unavailable"}),
+        httpx.Response(200, json={"id": "email-1"}),
+    ]
+    keys = []
+
+    def handler(request):
+        keys.append(request.headers.get("idempotency-key"))
+        return responses.pop(0)
+
+    sleeps = []
+    monkeypatch.setattr(email_service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(email_service, "EMAIL_RETRY_BASE_SECONDS", 1.0)
+    monkeypatch.setattr(resend, "default_http_client", resend.default_http_client)
+    monkeypatch.setattr(resend, "api_key", resend.api_key)
+    monkeypatch.setattr(email_service, "_resend_http_client", None)
+
+    provider = ResendProvider("re_test")
+    email_service._resend_http_client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert provider.send("a@example.com", "S", "<p>B</p>", "alerts@x.com", "Alerts")
+    assert len(keys) == 3 and len(set(keys)) == 1 and keys[0]
+    # Retry-After is honored; the 503 falls back to backoff (2**1 * [1, 1.5]).
+    assert sleeps[0] == 2.0
+    assert 2.0 <= sleeps[1] <= 3.0
+
+
+def test_resend_retries_errors_without_headers(monkeypatch):
+    import resend
+    from avanamy.services import email_service
+    from avanamy.services.email_service import ResendProvider
+
+    class LegacyResendError(resend.exceptions.ResendError):
+        # resend 2.19's ResendError: no response headers.
+        def __init__(self, code, error_type, message, suggested_action):
+            Exception.__init__(self, message)
+            self.code = code
+            self.message = message
+            self.suggested_action = suggested_action
+            self.error_type = error_type
+
+    outcomes = [
+        LegacyResendError(429, "rate_limit_exceeded", "slow down", ""),
+        LegacyResendError(500, "application_error", "boom", ""),
+        {"id": "email-1"},
+    ]
+
+    def fake_send(params, options):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    sleeps = []
+    monkeypatch.setattr(email_service.time, "sleep", sleeps.append)
+    monkeypatch.setattr(resend, "default_http_client", resend.default_http_client)
+    monkeypatch.setattr(resend, "api_key", resend.api_key)
+    monkeypatch.setattr(resend.Emails, "send", fake_send)
+
+    provider = ResendProvider("re_test")
+
+    assert provider.send("a@example.com", "S", "<p>B</p>", "alerts@x.com", "Alerts")
+    assert len(sleeps) == 2 and not outcomes
+
+
+def test_smtp_retries_transient_replies_but_not_permanent_ones(monkeypatch):
+    import smtplib
+
+    from avanamy.services import email_service
+
+    replies = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            pass
+
+        def starttls(self):
+            pass
+
+        def send_message(self, msg):
+            reply = replies.pop(0)
+            if reply:
+                raise smtplib.SMTPDataError(reply, b"try later")
+
+        def quit(self):
+            pass
+
+    sleeps = []
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_service, "_smtp_local", threading.local())
+    monkeypatch.setattr(email_service.time, "sleep", sleeps.append)
+    provider = email_service.SMTPProvider("smtp.test", 587, "", "")
+
+    def send():
+        return provider.send("a@example.com", "S", "<p>B</p>", "from@example.com", "Avanamy")
+
+    replies[:] = [451, 421, None]
+    assert send()
+    assert len(sleeps) == 2
+
+    replies[:] = [550]
+    assert send() is False
+    assert len(sleeps) == 2
+
+    replies[:] = [451] * (email_service.EMAIL_SEND_RETRIES + 1)
+    assert send() is False
+    assert len(sleeps) == 2 + email_service.EMAIL_SEND_RETRIES
+
+
+def test_provider_is_created_on_first_use(monkeypatch):
+    from avanamy.services import email_service
+
+    created = []
+
+    class CountingProvider(DummyProvider):
+        def __init__(self, **kwargs):
+            super().__init__()
+            created.append(self)
+
+    monkeypatch.setenv("EMAIL_PROVIDER", "smtp")
+    monkeypatch.setattr(email_service, "SMTPProvider", CountingProvider)
+
+    service = EmailService()
+    assert created == []
+
+    threads = [threading.Thread(target=lambda: service.provider) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert service._send_email("a@example.com", "S", "<p>B</p>")
+    assert created[0].calls[0]["to"] == "a@example.com"
+
+
+def test_smtp_from_header_is_quoted_and_encoded(monkeypatch):
+    from avanamy.services import email_service
+
+    sent = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            pass
+
+        def starttls(self):
+            pass
+
+        def send_message(self, msg):
+            sent.append(msg["From"])
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_service, "_smtp_local", threading.local())
+    provider = email_service.SMTPProvider("smtp.test", 587, "", "")
+
+    provider.send("a@example.com", "S", "<p>B</p>", "alerts@example.com", "Avanamy Alerts")
+    provider.send("a@example.com", "S", "<p>B</p>", "alerts@example.com", "Acme, Inc.")
+    provider.send("a@example.com", "S", "<p>B</p>", "alerts@example.com", "Ünïcode Alerts")
+
+    assert sent[0] == "Avanamy Alerts <alerts@example.com>"
+    assert sent[1] == '"Acme, Inc." <alerts@example.com>'
+    assert sent[2].startswith("=?utf-8?") and sent[2].endswith(" <alerts@example.com>")
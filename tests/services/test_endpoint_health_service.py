@@ -4,6 +4,7 @@ Unit tests for EndpointHealthService.
 Tests endpoint health monitoring, spec parsing, HTTP requests,
 and alert triggering for failed endpoints.
 """
+import json
 import pytest
 import uuid
 from unittest.mock import MagicMock, AsyncMock, patch, call
@@ -74,6 +75,64 @@ paths:
         assert {"path": "/users/{id}", "method": "GET", "base_url": "https://api.example.com/v1"} in endpoints
         assert {"path": "/users/{id}", "method": "DELETE", "base_url": "https://api.example.com/v1"} in endpoints
 
+    def test_extract_endpoints_json_spec(self, db, watched_api):
+        """Test that JSON specs are parsed without going through YAML."""
+        service = EndpointHealthService(db)
+
+        spec_content = json.dumps({
+            "openapi": "3.0.0",
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {"/users": {"get": {}, "post": {}}},
+        }, indent=2)
+
+        with patch("avanamy.services.endpoint_health_service.yaml.load") as yaml_load:
+            endpoints = service._extract_endpoints("\n" + spec_content, watched_api.spec_url)
+
+        yaml_load.assert_not_called()
+        assert endpoints == [
+            {"path": "/users", "method": "GET", "base_url": "https://api.example.com"},
+            {"path": "/users", "method": "POST", "base_url": "https://api.example.com"},
+        ]
+
+    def test_extract_endpoints_yaml_flow_mapping(self, db, watched_api):
+        """Test that YAML which only looks like JSON still parses."""
+        service = EndpointHealthService(db)
+
+        spec_content = "{openapi: 3.0.0, servers: [{url: 'https://api.example.com'}], paths: {/users: {get: {}}}}"
+
+        endpoints = service._extract_endpoints(spec_content, watched_api.spec_url)
+
+        assert endpoints == [
+            {"path": "/users", "method": "GET", "base_url": "https://api.example.com"},
+        ]
+
+    def test_extract_endpoints_caches_by_content(self, db, watched_api):
+        """Test that an unchanged spec is not parsed again."""
+        service = EndpointHealthService(db)
+
+        spec_content = """
+openapi: 3.0.0
+servers:
+  - url: https://cached.example.com
+paths:
+  /cached:
+    get: {}
+"""
+
+        first = service._extract_endpoints(spec_content, watched_api.spec_url)
+        first[0]["path"] = "/mutated"
+
+        with patch.object(EndpointHealthService, "_parse_spec") as parse:
+            second = service._extract_endpoints(spec_content, watched_api.spec_url)
+            parse.assert_not_called()
+
+            service._extract_endpoints(spec_content + "\n", watched_api.spec_url)
+            parse.assert_called_once()
+
+        assert second == [
+            {"path": "/cached", "method": "GET", "base_url": "https://cached.example.com"},
+        ]
+
     def test_extract_endpoints_swagger2(self, db, watched_api):
         """Test extracting endpoints from Swagger 2.0 spec."""
         service = EndpointHealthService(db)
@@ -221,7 +280,7 @@ class TestCheckSingleEndpoint:
             mock_client = AsyncMock()
             mock_response = AsyncMock()
             mock_response.status_code = 200
-            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client.head = AsyncMock(return_value=mock_response)
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             result = await service._check_single_endpoint(
@@ -249,6 +308,72 @@ class TestCheckSingleEndpoint:
         assert health_record.status_code == 200
         assert health_record.is_healthy is True
 
+    async def test_check_single_endpoint_metrics_are_labeled_by_method(self, db, watched_api):
+        """Test that metrics carry no per-API or per-path labels."""
+        from prometheus_client import REGISTRY
+
+        service = EndpointHealthService(db)
+        before = REGISTRY.get_sample_value(
+            "endpoint_checks_total", {"http_method": "GET", "status": "healthy"}
+        ) or 0
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = AsyncMock()
+            mock_response.status_code = 200
+            mock_client.head = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            await service._check_single_endpoint(
+                watched_api, "/users/42", "get", "https://api.example.com"
+            )
+
+        assert REGISTRY.get_sample_value(
+            "endpoint_checks_total", {"http_method": "GET", "status": "healthy"}
+        ) == before + 1
+        assert REGISTRY.get_sample_value(
+            "endpoint_health_status", {"http_method": "GET"}
+        ) == 1
+        for metric in REGISTRY.collect():
+            if metric.name.startswith("endpoint_"):
+                for sample in metric.samples:
+                    assert "endpoint_path" not in sample.labels
+                    assert "watched_api_id" not in sample.labels
+
+    async def test_check_single_endpoint_times_with_monotonic_clock(self, db, watched_api):
+        """Test that response time comes from the monotonic perf counter."""
+        service = EndpointHealthService(db)
+
+        with patch("httpx.AsyncClient") as mock_client_class, \
+                patch("avanamy.services.endpoint_health_service.time") as mock_time:
+            mock_client = AsyncMock()
+            mock_response = AsyncMock()
+            mock_response.status_code = 200
+            mock_client.head = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_time.perf_counter_ns.side_effect = [1_000_000_000, 1_250_999_999]
+
+            result = await service._check_single_endpoint(
+                watched_api, "/users", "GET", "https://api.example.com"
+            )
+
+        assert result["response_time_ms"] == 250
+
+    def test_response_time_buckets_resolve_fast_responses(self):
+        """Test that sub-100ms latencies land in distinct buckets."""
+        from avanamy.services.endpoint_health_service import endpoint_response_time_seconds
+
+        endpoint_response_time_seconds.labels(http_method="GET")
+        bounds = sorted({
+            float(sample.labels["le"])
+            for metric in endpoint_response_time_seconds.collect()
+            for sample in metric.samples
+            if sample.name.endswith("_bucket")
+        })
+        assert bounds[0] == 0.005
+        assert len([b for b in bounds if b < 0.1]) >= 4
+        assert bounds[-2] >= 10.0
+
     async def test_check_single_endpoint_4xx_still_healthy(self, db, watched_api):
         """Test that 4xx responses (auth required) are considered healthy."""
         service = EndpointHealthService(db)
@@ -257,7 +382,7 @@ class TestCheckSingleEndpoint:
             mock_client = AsyncMock()
             mock_response = AsyncMock()
             mock_response.status_code = 401
-            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client.head = AsyncMock(return_value=mock_response)
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             result = await service._check_single_endpoint(
@@ -279,7 +404,7 @@ class TestCheckSingleEndpoint:
             mock_client = AsyncMock()
             mock_response = AsyncMock()
             mock_response.status_code = 500
-            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client.head = AsyncMock(return_value=mock_response)
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             with patch.object(service, "_check_and_alert_failure", new_callable=AsyncMock) as mock_alert:
@@ -302,7 +427,7 @@ class TestCheckSingleEndpoint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.get = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
+            mock_client.head = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             with patch.object(service, "_check_and_alert_failure", new_callable=AsyncMock) as mock_alert:
@@ -327,7 +452,7 @@ class TestCheckSingleEndpoint:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.get = AsyncMock(
+            mock_client.head = AsyncMock(
                 side_effect=httpx.ConnectError("Connection refused")
             )
             mock_client_class.return_value.__aenter__.return_value = mock_client
@@ -344,14 +469,14 @@ class TestCheckSingleEndpoint:
                 assert "Connection error" in result["error_message"]
 
     async def test_check_single_endpoint_post_method(self, db, watched_api):
-        """Test POST request handling."""
+        """Test that POST endpoints are probed with HEAD, never POSTed to."""
         service = EndpointHealthService(db)
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_response = AsyncMock()
             mock_response.status_code = 201
-            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.head = AsyncMock(return_value=mock_response)
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             result = await service._check_single_endpoint(
@@ -361,13 +486,45 @@ class TestCheckSingleEndpoint:
                 "https://api.example.com"
             )
 
-            mock_client.post.assert_called_once_with(
+            mock_client.head.assert_called_once_with(
                 "https://api.example.com/users",
-                json={}
+                follow_redirects=True
             )
+            mock_client.post.assert_not_called()
             assert result["http_method"] == "POST"
             assert result["is_healthy"] is True
 
+    async def test_check_single_endpoint_falls_back_to_streamed_get(self, db, watched_api):
+        """Test that a server rejecting HEAD is probed with an unread GET."""
+        service = EndpointHealthService(db)
+
+        head_response = MagicMock(status_code=405)
+        get_response = MagicMock(status_code=200)
+        stream = MagicMock()
+        stream.return_value.__aenter__ = AsyncMock(return_value=get_response)
+        stream.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.head = AsyncMock(return_value=head_response)
+            mock_client.stream = stream
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            result = await service._check_single_endpoint(
+                watched_api,
+                "/users",
+                "DELETE",
+                "https://api.example.com"
+            )
+
+        stream.assert_called_once_with(
+            "GET", "https://api.example.com/users", follow_redirects=True
+        )
+        get_response.aread.assert_not_called()
+        mock_client.delete.assert_not_called()
+        assert result["status_code"] == 200
+        assert result["is_healthy"] is True
+
 
 class TestCheckEndpoints:
     """Tests for check_endpoints method."""
@@ -393,7 +550,7 @@ paths:
             mock_client = AsyncMock()
             mock_response = AsyncMock()
             mock_response.status_code = 200
-            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client.head = AsyncMock(return_value=mock_response)
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             result = await service.check_endpoints(watched_api, spec_content)
@@ -429,7 +586,7 @@ paths:
             mock_response_error = AsyncMock()
             mock_response_error.status_code = 500
 
-            mock_client.get = AsyncMock(side_effect=[mock_response_ok, mock_response_error])
+            mock_client.head = AsyncMock(side_effect=[mock_response_ok, mock_response_error])
             mock_client_class.return_value.__aenter__.return_value = mock_client
 
             with patch.object(service, "_check_and_alert_failure", new_callable=AsyncMock):
@@ -439,6 +596,79 @@ paths:
                 assert result["healthy"] == 1
                 assert result["unhealthy"] == 1
 
+    async def test_check_endpoints_runs_concurrently_on_one_client(self, db, watched_api):
+        """Test that endpoints are checked concurrently over a single shared client."""
+        import asyncio
+
+        service = EndpointHealthService(db)
+
+        spec_content = """
+openapi: 3.0.0
+servers:
+  - url: https://api.example.com
+paths:
+""" + "".join(f"  /e{i}:\n    get:\n      summary: E{i}\n" for i in range(5))
+
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        real_client = httpx.AsyncClient
+        clients = []
+
+        def make_client(**kwargs):
+            client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+            clients.append(client)
+            return client
+
+        with patch("httpx.AsyncClient", side_effect=make_client):
+            result = await service.check_endpoints(watched_api, spec_content)
+
+        assert result["total"] == 5
+        assert result["healthy"] == 5
+        assert [e["endpoint_path"] for e in result["endpoints"]] == [f"/e{i}" for i in range(5)]
+        assert len(clients) == 1
+        assert peak > 1
+
+    async def test_check_endpoints_commits_once(self, db, watched_api):
+        """Test that all health records of a run are committed together."""
+        service = EndpointHealthService(db)
+
+        spec_content = """
+openapi: 3.0.0
+servers:
+  - url: https://api.example.com
+paths:
+  /users:
+    get:
+      summary: List users
+  /products:
+    get:
+      summary: List products
+"""
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = AsyncMock()
+            mock_response.status_code = 200
+            mock_client.head = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            with patch.object(db, "commit", wraps=db.commit) as commit:
+                await service.check_endpoints(watched_api, spec_content)
+
+        assert commit.call_count == 1
+        assert db.query(EndpointHealth).filter(
+            EndpointHealth.watched_api_id == watched_api.id
+        ).count() == 2
+
     async def test_check_endpoints_no_endpoints_found(self, db, watched_api):
         """Test when spec has no endpoints."""
         service = EndpointHealthService(db)
@@ -538,6 +768,110 @@ class TestCheckAndAlertFailure:
             # No alert should be sent (already failing)
             mock_alert_service.send_endpoint_failure_alert.assert_not_called()
 
+    async def test_check_endpoints_looks_up_failing_states_in_one_query(self, db, watched_api):
+        """Test that a run's new failures are found in one lookup and sent as one digest."""
+        service = EndpointHealthService(db)
+
+        old = datetime.now() - timedelta(minutes=5)
+        for path, healthy in (("/was-up", True), ("/was-down", False)):
+            db.add(EndpointHealth(
+                watched_api_id=watched_api.id,
+                endpoint_path=path,
+                http_method="GET",
+                status_code=200 if healthy else 500,
+                is_healthy=healthy,
+                checked_at=old,
+            ))
+        db.commit()
+
+        spec_content = """
+openapi: 3.0.0
+servers:
+  - url: https://api.example.com
+paths:
+  /was-up:
+    get: {}
+  /was-down:
+    get: {}
+  /never-checked:
+    get: {}
+"""
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = AsyncMock()
+            mock_response.status_code = 500
+            mock_client.head = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            with patch("avanamy.services.endpoint_health_service.AlertService") as mock_alert_service_class, \
+                    patch.object(service, "_last_check_states", wraps=service._last_check_states) as lookup:
+                mock_alert_service = AsyncMock()
+                mock_alert_service_class.return_value = mock_alert_service
+
+                result = await service.check_endpoints(watched_api, spec_content)
+
+        assert result["unhealthy"] == 3
+        lookup.assert_called_once()
+        mock_alert_service_class.assert_called_once_with(db)
+        mock_alert_service.send_endpoint_failure_digest.assert_called_once()
+        failures = mock_alert_service.send_endpoint_failure_digest.call_args.kwargs["failures"]
+        assert {f["endpoint_path"] for f in failures} == {"/was-up", "/never-checked"}
+        assert all(f["status_code"] == 500 for f in failures)
+
+    async def test_run_rows_stamped_at_transaction_start_still_alert(self, db, watched_api):
+        """Test that a run's own rows aren't taken as the previous state, however early they are stamped."""
+        from sqlalchemy import event
+
+        service = EndpointHealthService(db)
+
+        for path in ("/slow", "/direct"):
+            db.add(EndpointHealth(
+                watched_api_id=watched_api.id,
+                endpoint_path=path,
+                http_method="GET",
+                status_code=200,
+                is_healthy=True,
+                checked_at=datetime.now() - timedelta(minutes=5),
+            ))
+        db.commit()
+
+        # PostgreSQL's now() is the transaction start, so a long run's rows
+        # can be older than 10s by the time alerts are decided.
+        def stamp_at_transaction_start(mapper, connection, target):
+            target.checked_at = datetime.now() - timedelta(minutes=1)
+
+        spec_content = """
+openapi: 3.0.0
+servers:
+  - url: https://api.example.com
+paths:
+  /slow:
+    get: {}
+"""
+
+        event.listen(EndpointHealth, "before_insert", stamp_at_transaction_start)
+        try:
+            with patch("httpx.AsyncClient") as mock_client_class:
+                mock_client = AsyncMock()
+                mock_client.head = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
+                mock_client_class.return_value.__aenter__.return_value = mock_client
+
+                with patch("avanamy.services.endpoint_health_service.AlertService") as mock_alert_service_class:
+                    mock_alert_service = AsyncMock()
+                    mock_alert_service_class.return_value = mock_alert_service
+
+                    await service.check_endpoints(watched_api, spec_content)
+                    mock_alert_service.send_endpoint_failure_digest.assert_called_once()
+
+                    # The single-endpoint path skips its own row the same way.
+                    await service._check_single_endpoint(
+                        watched_api, "/direct", "GET", "https://api.example.com"
+                    )
+                    mock_alert_service.send_endpoint_failure_alert.assert_called_once()
+        finally:
+            event.remove(EndpointHealth, "before_insert", stamp_at_transaction_start)
+
     async def test_alert_on_first_failure_no_previous_check(self, db, watched_api):
         """Test that alert is sent on first failure (no previous check)."""
         service = EndpointHealthService(db)
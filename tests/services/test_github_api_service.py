@@ -40,7 +40,10 @@ async def test_list_repositories_success(monkeypatch):
         "avanamy.services.github_app_service.GitHubAppService.get_installation_token",
         AsyncMock(return_value="token"),
     )
-    monkeypatch.setattr("httpx.AsyncClient", DummyClient)
+    monkeypatch.setattr(
+        "avanamy.services.github_app_service.github_http_client",
+        DummyClient,
+    )
 
     service = GitHubAPIService("token")
     repos = await service.list_repositories(installation_id=123)
@@ -79,13 +82,30 @@ async def test_list_repositories_error(monkeypatch):
         "avanamy.services.github_app_service.GitHubAppService.get_installation_token",
         AsyncMock(return_value="token"),
     )
-    monkeypatch.setattr("httpx.AsyncClient", DummyClient)
+    monkeypatch.setattr(
+        "avanamy.services.github_app_service.github_http_client",
+        DummyClient,
+    )
 
     service = GitHubAPIService("token")
     with pytest.raises(ValueError):
         await service.list_repositories(installation_id=123)
 
 
+@pytest.mark.anyio
+async def test_github_http_client_is_shared_until_closed():
+    from avanamy.services import github_app_service
+
+    client = github_app_service.github_http_client()
+    try:
+        assert github_app_service.github_http_client() is client
+    finally:
+        await github_app_service.close_github_http_client()
+
+    assert client.is_closed
+    assert github_app_service._http_client is None
+
+
 def test_clone_repository_auth_url(monkeypatch, tmp_path):
     repo_obj = SimpleNamespace(head=SimpleNamespace(commit=SimpleNamespace(hexsha="abc123")))
 
@@ -0,0 +1,141 @@
+import anyio
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from avanamy.services import github_app_service
+from avanamy.services.github_app_service import GitHubAppService
+
+
+def make_service(app_id="1"):
+    service = GitHubAppService.__new__(GitHubAppService)
+    service.app_id = app_id
+    service.generate_jwt = lambda: "jwt"
+    return service
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    github_app_service._installation_tokens.clear()
+    github_app_service._installation_token_locks.clear()
+    github_app_service._user_info_cache.clear()
+    yield
+    github_app_service._installation_tokens.clear()
+    github_app_service._installation_token_locks.clear()
+    github_app_service._user_info_cache.clear()
+
+
+class DummyResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._data
+
+
+class DummyClient:
+    def __init__(self, expires_at):
+        self.expires_at = expires_at
+        self.posts = []
+
+    async def post(self, url, headers=None):
+        self.posts.append(url)
+        await anyio.sleep(0.01)
+        return DummyResponse(
+            {"token": f"token-{len(self.posts)}", "expires_at": self.expires_at}
+        )
+
+
+@pytest.mark.anyio
+async def test_installation_token_is_minted_once_until_expiry(monkeypatch):
+    client = DummyClient("2999-01-01T00:00:00Z")
+    monkeypatch.setattr(github_app_service, "github_http_client", lambda: client)
+
+    service = make_service()
+    tokens = []
+
+    async def fetch():
+        tokens.append(await service.get_installation_token(123))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(fetch)
+
+    assert tokens == ["token-1"] * 5
+    assert await make_service().get_installation_token(123) == "token-1"
+    assert len(client.posts) == 1
+
+    # A different installation gets its own token.
+    assert await service.get_installation_token(456) == "token-2"
+
+
+@pytest.mark.anyio
+async def test_installation_token_near_expiry_is_reminted(monkeypatch):
+    client = DummyClient("2000-01-01T00:00:00Z")
+    monkeypatch.setattr(github_app_service, "github_http_client", lambda: client)
+
+    service = make_service()
+    assert await service.get_installation_token(123) == "token-1"
+    assert await service.get_installation_token(123) == "token-2"
+
+
+def test_private_key_is_read_once_and_signs_jwts(monkeypatch, tmp_path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_path = tmp_path / "app.pem"
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    monkeypatch.setenv("GITHUB_APP_ID", "app-under-test")
+    monkeypatch.setenv("GITHUB_CLIENT_ID", "client")
+    monkeypatch.setenv("GITHUB_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("GITHUB_PRIVATE_KEY_PATH", str(key_path))
+    monkeypatch.setattr(github_app_service, "_app_jwts", {})
+
+    service = GitHubAppService()
+    key_path.unlink()
+    second = GitHubAppService()
+
+    assert second.private_key is service.private_key
+    token = service.generate_jwt()
+    assert jwt.decode(token, key.public_key(), algorithms=["RS256"])["iss"] == "app-under-test"
+
+
+@pytest.mark.anyio
+async def test_user_info_is_fetched_once_per_token(monkeypatch):
+    class UserClient:
+        def __init__(self):
+            self.gets = []
+
+        async def get(self, url, headers=None):
+            self.gets.append(headers["Authorization"])
+            await anyio.sleep(0.01)
+            return DummyResponse({"login": "octocat", "id": 1, "name": None, "email": None})
+
+    client = UserClient()
+    monkeypatch.setattr(github_app_service, "github_http_client", lambda: client)
+
+    service = make_service()
+    results = []
+
+    async def fetch():
+        results.append(await service.get_user_info("gho_secret"))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(fetch)
+
+    results[0]["login"] = "mutated"
+    assert (await service.get_user_info("gho_secret"))["login"] == "octocat"
+    assert client.gets == ["Bearer gho_secret"]
+
+    # Raw tokens are not kept as cache keys.
+    assert all(b"gho_secret" not in key for key in github_app_service._user_info_cache)
+
+    await service.get_user_info("gho_other")
+    assert len(client.gets) == 2
@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import event
+
+from avanamy.models.code_repository import CodeRepository, CodeRepoEndpointUsage
+from avanamy.services.impact_analysis_service import ImpactAnalysisService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def usages(db):
+    repo = CodeRepository(tenant_id="tenant_a", name="web", url="https://github.com/org/web")
+    other_repo = CodeRepository(tenant_id="tenant_b", name="other", url="https://github.com/org/other")
+    db.add_all([repo, other_repo])
+    db.flush()
+
+    def usage(repository, path, method="GET", line=1):
+        return CodeRepoEndpointUsage(
+            code_repository_id=repository.id,
+            tenant_id=repository.tenant_id,
+            endpoint_path=path,
+            http_method=method,
+            file_path="src/api.ts",
+            line_number=line,
+            commit_sha="abc123",
+        )
+
+    db.add_all([
+        usage(repo, "/users/123", line=1),
+        usage(repo, "/users/${userId}", line=2),
+        usage(repo, "/users/123?expand=true", line=3),
+        usage(repo, "/users/123", method="DELETE", line=4),
+        usage(repo, "/users/123/posts", line=5),
+        usage(repo, "/users", line=6),
+        usage(repo, "/users?page=2", line=7),
+        usage(repo, "/usersX", line=8),
+        usage(repo, "/a_b", line=9),
+        usage(repo, "/aXb", line=10),
+        usage(other_repo, "/users/123", line=11),
+    ])
+    db.commit()
+
+
+def lines(affected):
+    return sorted(a.line_number for a in affected)
+
+
+async def test_param_path_matches_only_that_shape(db, usages):
+    service = ImpactAnalysisService(db)
+
+    affected = await service._find_affected_usages(
+        "tenant_a", {"type": "endpoint_removed", "path": "/users/{id}", "method": "GET"}, "user"
+    )
+
+    assert lines(affected) == [1, 2, 3]
+    assert {a.repository_name for a in affected} == {"web"}
+
+
+async def test_any_method_when_change_has_none(db, usages):
+    service = ImpactAnalysisService(db)
+
+    affected = await service._find_affected_usages(
+        "tenant_a", {"type": "endpoint_removed", "path": "/users/{id}"}, "user"
+    )
+
+    assert lines(affected) == [1, 2, 3, 4]
+
+
+async def test_literal_path_matches_exactly_ignoring_query(db, usages):
+    service = ImpactAnalysisService(db)
+
+    affected = await service._find_affected_usages(
+        "tenant_a", {"type": "endpoint_removed", "path": "/users", "method": "GET"}, "user"
+    )
+    assert lines(affected) == [6, 7]
+
+    # LIKE wildcards in the spec path are matched literally.
+    affected = await service._find_affected_usages(
+        "tenant_a", {"type": "endpoint_removed", "path": "/a_b", "method": "GET"}, "user"
+    )
+    assert lines(affected) == [9]
+
+
+async def test_usages_and_repositories_load_in_one_query(db, usages, engine):
+    service = ImpactAnalysisService(db)
+    db.expire_all()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        affected = await service._find_affected_usages(
+            "tenant_a", {"type": "endpoint_removed", "path": "/users/{id}"}, "user"
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(affected) == 4
+    assert len(statements) == 1
+
+
+async def test_spec_path_is_compiled_once(db, usages):
+    from avanamy.services import impact_analysis_service
+
+    impact_analysis_service._spec_path_pattern.cache_clear()
+    service = ImpactAnalysisService(db)
+
+    for _ in range(2):
+        await service._find_affected_usages(
+            "tenant_a", {"type": "endpoint_removed", "path": "/users/{id}"}, "user"
+        )
+
+    info = impact_analysis_service._spec_path_pattern.cache_info()
+    assert info.misses == 1
+    assert service._paths_match("/users/{id}?x=1", "/users/42?expand=true")
+    assert not service._paths_match("/users/{id}", "/users/42/posts")
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from avanamy.services import s3
@@ -29,3 +31,117 @@ def test_upload_bytes_no_bucket_raises(monkeypatch):
     monkeypatch.setattr(s3, "AWS_BUCKET", None)
     with pytest.raises(RuntimeError):
         s3.upload_bytes("k", b"data")
+
+
+def test_object_exists_maps_404_to_false(monkeypatch):
+    from botocore.exceptions import ClientError
+
+    class DummyClient:
+        def head_object(self, Bucket, Key):
+            if Key == "present":
+                return {}
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    monkeypatch.setattr(s3, "_s3_client", DummyClient())
+    monkeypatch.setattr(s3, "AWS_BUCKET", "test-bucket")
+
+    assert s3.object_exists("present") is True
+    assert s3.object_exists("missing") is False
+
+
+def test_upload_bytes_uses_multipart_for_large_bodies(monkeypatch):
+    recorded = {}
+
+    class DummyClient:
+        def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+            recorded.update(body=fileobj.read(), bucket=bucket, key=key, extra=ExtraArgs)
+
+    monkeypatch.setattr(s3, "_s3_client", DummyClient())
+    monkeypatch.setattr(s3, "AWS_BUCKET", "test-bucket")
+    monkeypatch.setattr(s3, "MULTIPART_THRESHOLD", 4)
+
+    key, url = s3.upload_bytes("big.html", b"hello", content_type="text/html")
+
+    assert url == "s3://test-bucket/big.html"
+    assert recorded == {
+        "body": b"hello",
+        "bucket": "test-bucket",
+        "key": "big.html",
+        "extra": {"ContentType": "text/html"},
+    }
+
+
+def test_head_object_metadata_returns_user_metadata(monkeypatch):
+    from botocore.exceptions import ClientError
+
+    recorded = {}
+
+    class DummyClient:
+        def put_object(self, **kwargs):
+            recorded[kwargs["Key"]] = kwargs.get("Metadata")
+
+        def head_object(self, Bucket, Key):
+            if Key not in recorded:
+                raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+            return {"Metadata": recorded[Key]}
+
+    monkeypatch.setattr(s3, "_s3_client", DummyClient())
+    monkeypatch.setattr(s3, "AWS_BUCKET", "test-bucket")
+
+    s3.upload_bytes("doc.md", b"# hi", metadata={"content-hash": "abc"})
+
+    assert s3.head_object_metadata("doc.md") == {"content-hash": "abc"}
+    assert s3.head_object_metadata("missing.md") is None
+
+
+def test_large_text_bodies_are_stored_gzipped_and_read_back(monkeypatch):
+    stored = {}
+
+    class DummyClient:
+        def put_object(self, **kwargs):
+            stored[kwargs["Key"]] = kwargs
+
+        def get_object(self, Bucket, Key):
+            obj = stored[Key]
+            return {
+                "Body": io.BytesIO(obj["Body"]),
+                "ContentEncoding": obj.get("ContentEncoding"),
+            }
+
+    monkeypatch.setattr(s3, "_s3_client", DummyClient())
+    monkeypatch.setattr(s3, "AWS_BUCKET", "test-bucket")
+    monkeypatch.setattr(s3, "GZIP_MIN_BYTES", 1024)
+
+    html = b"<p>Hello docs</p>\n" * 1000
+    s3.upload_bytes("docs.html", html, content_type="text/html")
+    s3.upload_bytes("small.html", b"<p>hi</p>", content_type="text/html")
+    s3.upload_bytes("logo.png", html, content_type="image/png")
+
+    assert stored["docs.html"]["ContentEncoding"] == "gzip"
+    assert len(stored["docs.html"]["Body"]) < len(html) // 5
+    assert "ContentEncoding" not in stored["small.html"]
+    assert "ContentEncoding" not in stored["logo.png"]
+
+    assert s3.download_bytes("docs.html") == html
+    assert s3.download_bytes("small.html") == b"<p>hi</p>"
+
+
+def test_generate_presigned_get_url_signs_bucket_and_key(monkeypatch):
+    recorded = {}
+
+    class DummyClient:
+        def generate_presigned_url(self, operation, Params, ExpiresIn):
+            recorded.update(operation=operation, params=Params, expires_in=ExpiresIn)
+            return "https://test-bucket.s3.amazonaws.com/docs.html?X-Amz-Signature=sig"
+
+    monkeypatch.setattr(s3, "_s3_client", DummyClient())
+    monkeypatch.setattr(s3, "AWS_BUCKET", "test-bucket")
+
+    url = s3.generate_presigned_get_url("docs.html", expires_in=600)
+
+    assert url.startswith("https://test-bucket.s3.amazonaws.com/docs.html")
+    assert recorded == {
+        "operation": "get_object",
+        "params": {"Bucket": "test-bucket", "Key": "docs.html"},
+        "expires_in": 600,
+    }
@@ -0,0 +1,40 @@
+import json
+import math
+
+import pytest
+
+from avanamy.utils.json_utils import load_schema, loads
+
+
+def test_loads_parses_str_and_bytes():
+    doc = {"info": {"title": "Demo"}, "paths": {"/a": {"get": {}}}}
+    assert loads(json.dumps(doc)) == doc
+    assert loads(json.dumps(doc).encode("utf-8")) == doc
+
+
+def test_loads_accepts_stdlib_only_literals():
+    assert math.isnan(loads('{"x": NaN}')["x"])
+
+
+def test_loads_raises_value_error_on_invalid_json():
+    with pytest.raises(ValueError):
+        loads("{not json")
+
+
+def test_load_schema_passes_decoded_values_through():
+    doc = {"paths": {}}
+    assert load_schema(doc) is doc
+    assert load_schema(json.dumps(doc)) == doc
+
+
+def test_load_schema_cached_reuses_parse_for_same_text(monkeypatch):
+    from avanamy.utils import json_utils
+
+    monkeypatch.setattr(json_utils, "_schema_cache", json_utils.OrderedDict())
+    raw = json.dumps({"info": {"title": "Demo"}})
+
+    first = json_utils.load_schema_cached(raw)
+    assert first == {"info": {"title": "Demo"}}
+    assert json_utils.load_schema_cached(raw) is first
+    assert json_utils.load_schema_cached(raw.encode("utf-8")) is first
+    assert json_utils.load_schema_cached(json.dumps({"info": {}})) is not first
@@ -0,0 +1,20 @@
+import pytest
+
+from avanamy.utils.s3_paths import (
+    build_docs_html_path,
+    build_docs_markdown_path,
+    docs_html_path_for_markdown_path,
+)
+
+
+def test_docs_html_path_for_markdown_path_matches_builder():
+    args = ("acme", "stripe", "payments", "v3", "1234", "payments-api")
+
+    md_key = build_docs_markdown_path(*args)
+
+    assert docs_html_path_for_markdown_path(md_key) == build_docs_html_path(*args)
+
+
+def test_docs_html_path_for_markdown_path_rejects_other_keys():
+    with pytest.raises(ValueError):
+        docs_html_path_for_markdown_path("tenants/acme/specs/1234-payments.json")